@@ -0,0 +1,154 @@
+"""
+Cross-request micro-batching of model.encode calls.
+
+Concurrent uploads each score a handful of resumes, so without batching the
+CPU runs many small forward passes side by side. BatchingEncoder has the same
+encode() signature as the model: callers (on the inference threads) enqueue
+their texts and block on a future, while one scheduler thread takes the oldest
+request, gathers whatever else arrives until INFERENCE_MAX_BATCH_SIZE texts are
+waiting or INFERENCE_MAX_WAIT_MS has passed, encodes them together and hands
+every caller its own rows.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Union
+
+import numpy as np
+
+from metrics import INFERENCE_QUEUE_DEPTH, INFERENCE_BATCH_TEXTS, INFERENCE_BATCH_REQUESTS, INFERENCE_WAIT_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+
+class _EncodeRequest:
+    __slots__ = ("sentences", "batch_size", "options", "future", "enqueued_at")
+
+    def __init__(self, sentences: List[str], batch_size: int, options: dict):
+        self.sentences = sentences
+        self.batch_size = batch_size
+        # Requests are only merged with others asking for the same output
+        self.options = tuple(sorted(options.items()))
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchingEncoder:
+    """
+    Drop-in stand-in for the embedding model that merges concurrent encode()
+    calls into shared forward passes. Every other attribute (tokenizer,
+    max_seq_length, token_offsets...) is read from the current model
+    """
+
+    def __init__(self, get_model: Callable, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self._get_model = get_model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Optional[_EncodeRequest]]" = queue.Queue()
+        # A request that did not fit the previous batch opens the next one
+        self._carry: Optional[_EncodeRequest] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self._get_model(), name)
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False,
+               **kwargs) -> np.ndarray:
+        """Embeddings as a numpy array: (dim,) for one string, (n, dim) for a list"""
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+        if not sentences:
+            return self._get_model().encode(
+                sentences, batch_size=batch_size, convert_to_numpy=convert_to_numpy,
+                normalize_embeddings=normalize_embeddings, **kwargs
+            )
+
+        request = _EncodeRequest(sentences, batch_size, dict(
+            convert_to_numpy=convert_to_numpy, normalize_embeddings=normalize_embeddings, **kwargs
+        ))
+        self._ensure_started()
+        INFERENCE_QUEUE_DEPTH.inc()
+        self._queue.put(request)
+        embeddings = request.future.result()
+        return embeddings[0] if single else embeddings
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Finish the queued requests and stop the scheduler thread (called on shutdown)"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout=10)
+
+    def _next_batch(self) -> Optional[List[_EncodeRequest]]:
+        """The oldest request plus compatible ones arriving before the size or time limit; None to stop"""
+        first = self._carry
+        self._carry = None
+        if first is None:
+            first = self._queue.get()
+            if first is None:
+                return None
+            INFERENCE_QUEUE_DEPTH.dec()
+
+        batch = [first]
+        texts = len(first.sentences)
+        deadline = first.enqueued_at + self.max_wait
+        while texts < self.max_batch_size:
+            try:
+                request = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+            except queue.Empty:
+                break
+            if request is None:
+                # Stop after this batch
+                self._queue.put(None)
+                break
+            INFERENCE_QUEUE_DEPTH.dec()
+            if request.options != first.options or texts + len(request.sentences) > self.max_batch_size:
+                self._carry = request
+                break
+            batch.append(request)
+            texts += len(request.sentences)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[_EncodeRequest]):
+        started = time.perf_counter()
+        sentences = [sentence for request in batch for sentence in request.sentences]
+        for request in batch:
+            INFERENCE_WAIT_SECONDS.observe(started - request.enqueued_at)
+        INFERENCE_BATCH_TEXTS.observe(len(sentences))
+        INFERENCE_BATCH_REQUESTS.observe(len(batch))
+
+        try:
+            embeddings = self._get_model().encode(
+                sentences,
+                batch_size=max(request.batch_size for request in batch),
+                **dict(batch[0].options)
+            )
+        except Exception as e:
+            logger.exception("Batched encode failed", extra={"requests": len(batch), "texts": len(sentences)})
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(embeddings[offset:offset + len(request.sentences)])
+            offset += len(request.sentences)
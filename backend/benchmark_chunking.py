@@ -0,0 +1,141 @@
+"""
+Throughput of the truncated vs the chunked resume encoding.
+
+Builds a mix of one-page and multi-page resumes from the Kaggle dataset and
+encodes them three ways with the configured backend (EMBEDDING_BACKEND):
+  - truncate:         one pass per resume, cut at the model's max length (current default)
+  - chunked_unsorted: every window encoded in upload order
+  - chunked_bucketed: every window encoded in length-sorted batches (RESUME_ENCODING=chunked)
+and reports resumes/s, windows, padding share and how much of the text each path sees.
+
+Usage: python benchmark_chunking.py [--resumes 200] [--long-share 0.5] [--repeats 3]
+"""
+import argparse
+import csv
+import json
+import random
+import time
+
+import numpy as np
+
+from config import (
+    MODEL_NAME,
+    MODEL_DIR,
+    MODEL_OFFLINE,
+    EMBEDDING_BACKEND,
+    ONNX_MODEL_DIR,
+    EMBEDDING_BATCH_SIZE,
+    CHUNK_OVERLAP
+)
+from chunking import chunk_texts, encode_bucketed, padding_ratio, token_offsets
+from evaluate_ai_accuracy import create_synthetic_resume
+from model_manager import load_encoder
+
+
+def build_resumes(csv_file, count, long_share, seed=42):
+    """Synthetic resumes; a share of them padded out to 2-4 pages with project sections"""
+    with open(csv_file, 'r', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    rng = random.Random(seed)
+    resumes = []
+    for i in range(count):
+        row = rows[i % len(rows)]
+        resume = create_synthetic_resume({
+            'name': row.get('Name', ''),
+            'skills': row.get('Skills', ''),
+            'experience': row.get('Experience (Years)', '0'),
+            'education': row.get('Education', ''),
+            'certifications': row.get('Certifications', ''),
+            'job_role': row.get('Job Role', '')
+        })
+        if rng.random() < long_share:
+            projects = [
+                f"Project {p + 1}: Built and maintained {row.get('Job Role', 'software')} systems using "
+                f"{row.get('Skills', '')}. Led a team of {rng.randint(2, 9)} engineers, improved "
+                f"reliability by {rng.randint(5, 60)}% and mentored junior colleagues."
+                for p in range(rng.randint(15, 45))
+            ]
+            resume += "\n\nExperience details:\n" + "\n".join(projects)
+        resumes.append(resume)
+    return resumes
+
+
+def timed(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def encode_unsorted(model, chunks, batch_size):
+    for start in range(0, len(chunks), batch_size):
+        batch = chunks[start:start + batch_size]
+        model.encode(batch, batch_size=len(batch), convert_to_numpy=True, normalize_embeddings=True)
+
+
+def run(args):
+    resumes = build_resumes(args.csv, args.resumes, args.long_share)
+    print(f"🤖 Loading model ({EMBEDDING_BACKEND} backend)...")
+    model = load_encoder(EMBEDDING_BACKEND, MODEL_NAME, MODEL_DIR, ONNX_MODEL_DIR, MODEL_OFFLINE)
+    model.encode(resumes[:EMBEDDING_BATCH_SIZE], batch_size=EMBEDDING_BATCH_SIZE, convert_to_numpy=True)
+
+    limit = model.max_seq_length - 2
+    full_tokens = [len(token_offsets(model, text)) for text in resumes]
+    truncated_tokens = [min(count, limit) for count in full_tokens]
+    chunks, chunk_tokens, _ = chunk_texts(model, resumes, CHUNK_OVERLAP)
+
+    print(f"📊 {len(resumes)} resumes, {sum(full_tokens)} tokens, {len(chunks)} windows\n")
+    seconds = {
+        'truncate': timed(lambda: model.encode(
+            resumes, batch_size=EMBEDDING_BATCH_SIZE, convert_to_numpy=True, normalize_embeddings=True
+        ), args.repeats),
+        'chunked_unsorted': timed(lambda: encode_unsorted(model, chunks, EMBEDDING_BATCH_SIZE), args.repeats),
+        'chunked_bucketed': timed(lambda: encode_bucketed(model, chunks, chunk_tokens, EMBEDDING_BATCH_SIZE),
+                                  args.repeats)
+    }
+    padding = {
+        # encode() itself sorts each call by length, so the truncated path is already bucketed
+        'truncate': padding_ratio(truncated_tokens, EMBEDDING_BATCH_SIZE, bucketed=True),
+        'chunked_unsorted': padding_ratio(chunk_tokens, EMBEDDING_BATCH_SIZE, bucketed=False),
+        'chunked_bucketed': padding_ratio(chunk_tokens, EMBEDDING_BATCH_SIZE, bucketed=True)
+    }
+    report = {
+        'backend': EMBEDDING_BACKEND,
+        'resumes': len(resumes),
+        'long_share': args.long_share,
+        'batch_size': EMBEDDING_BATCH_SIZE,
+        'chunk_overlap': CHUNK_OVERLAP,
+        'windows': len(chunks),
+        'text_coverage_truncate': round(sum(truncated_tokens) / sum(full_tokens), 4),
+        'modes': {
+            mode: {
+                'seconds': round(elapsed, 3),
+                'resumes_per_second': round(len(resumes) / elapsed, 1),
+                'padding_share': round(padding[mode], 4)
+            }
+            for mode, elapsed in seconds.items()
+        }
+    }
+
+    print("=" * 70)
+    print(f"Truncated path sees {report['text_coverage_truncate'] * 100:.1f}% of the resume tokens")
+    for mode, result in report['modes'].items():
+        print(f"{mode:>17}: {result['resumes_per_second']:8.1f} resumes/s | "
+              f"{result['padding_share'] * 100:5.1f}% padding | {result['seconds']:.2f}s")
+    print("=" * 70)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark truncated vs chunked resume encoding")
+    parser.add_argument('--csv', default='data/AI_Resume_Screening.csv', help="Source dataset")
+    parser.add_argument('--resumes', type=int, default=200, help="Number of resumes")
+    parser.add_argument('--long-share', type=float, default=0.5, help="Share of multi-page resumes")
+    parser.add_argument('--repeats', type=int, default=3, help="Runs per mode (best is reported)")
+    parser.add_argument('--output', default='chunking_benchmark_results.json', help="JSON report path")
+    run(parser.parse_args())
@@ -0,0 +1,152 @@
+"""
+Compare PDF text extraction backends on a corpus of generated resumes.
+
+PDFs are written by a small pure-Python generator (no extra dependencies),
+from one to many pages. Every installed backend (pypdf2, pdfium, pdfminer)
+extracts the whole corpus sequentially; long documents are also extracted
+page-range-parallel through workers.run_extraction, as the API does.
+
+Usage: python benchmark_pdf_extraction.py [--pages 1,2,5,10,20,40] [--copies 5]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from pdf_extract import BACKENDS, extract_pdf_text
+
+
+WORDS = (
+    "python java sql docker kubernetes aws machine learning data analysis react api "
+    "designed implemented led delivered improved reduced automated migrated mentored "
+    "team platform service pipeline customers reliability latency cost production"
+).split()
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(pages) -> bytes:
+    """Minimal valid PDF: one Helvetica text page per list of lines in pages"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        stream = ["BT /F1 10 Tf 12 TL 50 780 Td"]
+        stream += [f"({_escape(line)}) '" for line in lines]
+        stream.append("ET")
+        content = "\n".join(stream).encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+def make_resume_pdf(page_count: int, rng: random.Random) -> bytes:
+    pages = []
+    for page in range(page_count):
+        lines = [f"Candidate {rng.randint(1, 9999)} - page {page + 1}"]
+        lines += [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(55)]
+        pages.append(lines)
+    return make_pdf(pages)
+
+
+def installed_backends():
+    available = []
+    for name, backend in BACKENDS.items():
+        try:
+            backend(make_pdf([["probe"]])).close()
+            available.append(name)
+        except ImportError:
+            print(f"⏭️  Skipping {name}: not installed")
+    return available
+
+
+def bench_backend(backend, corpus):
+    timings = {}
+    for page_count, documents in corpus.items():
+        started = time.perf_counter()
+        chars = sum(len(extract_pdf_text(document, backend=backend)) for document in documents)
+        elapsed = time.perf_counter() - started
+        timings[page_count] = {
+            'ms_per_document': round(elapsed / len(documents) * 1000, 2),
+            'pages_per_second': round(page_count * len(documents) / elapsed, 1),
+            'chars_per_document': chars // len(documents)
+        }
+    return timings
+
+
+async def bench_parallel(corpus):
+    # Imported here so the pool and its config are only set up when this part runs
+    import workers
+
+    timings = {}
+    try:
+        # Start the worker processes before timing
+        await workers.run_extraction(make_pdf([["warm up"]]))
+        for page_count, documents in corpus.items():
+            started = time.perf_counter()
+            for document in documents:
+                await workers.run_extraction(document)
+            elapsed = time.perf_counter() - started
+            timings[page_count] = {'ms_per_document': round(elapsed / len(documents) * 1000, 2)}
+    finally:
+        workers.shutdown()
+    return timings
+
+
+def run(args):
+    rng = random.Random(42)
+    page_counts = [int(count) for count in args.pages.split(',')]
+    corpus = {count: [make_resume_pdf(count, rng) for _ in range(args.copies)] for count in page_counts}
+    print(f"📄 Corpus: {args.copies} PDFs each of {page_counts} pages\n")
+
+    report = {'copies': args.copies, 'sequential': {}, 'page_parallel': None}
+    for backend in installed_backends():
+        report['sequential'][backend] = bench_backend(backend, corpus)
+    if not args.skip_parallel:
+        report['page_parallel'] = asyncio.run(bench_parallel(corpus))
+
+    print("=" * 70)
+    print(f"{'pages':>6} | " + " | ".join(f"{name:>12}" for name in report['sequential'])
+          + (" | parallel (PDF_BACKEND)" if report['page_parallel'] else ""))
+    for count in page_counts:
+        row = [f"{report['sequential'][name][count]['ms_per_document']:>9.1f} ms" for name in report['sequential']]
+        if report['page_parallel']:
+            row.append(f"{report['page_parallel'][count]['ms_per_document']:>9.1f} ms")
+        print(f"{count:>6} | " + " | ".join(row))
+    print("=" * 70)
+    print("Note: PDF_MAX_PAGES / PDF_MAX_CHARS apply, so long documents stop early")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction backends")
+    parser.add_argument('--pages', default='1,2,5,10,20,40', help="Comma-separated page counts")
+    parser.add_argument('--copies', type=int, default=5, help="Documents per page count")
+    parser.add_argument('--skip-parallel', action='store_true', help="Only time the sequential backends")
+    parser.add_argument('--output', default='pdf_extraction_benchmark_results.json', help="JSON report path")
+    run(parser.parse_args())
@@ -0,0 +1,283 @@
+"""
+Micro-benchmarks for the screening hot path.
+
+Cases:
+- extract_text_from_pdf on generated PDFs of 1 to 20 pages
+- calculate_ai_match_scores at several batch sizes and resume lengths (needs the model)
+- get_matched_and_missing_skills
+- POST /api/v1/screening/upload end to end through FastAPI's TestClient, on an
+  in-memory SQLite database and a throwaway candidate index, sequentially and
+  as 50 concurrent single-file uploads (what the inference batcher is for)
+
+Every case reports p50/p95/mean latency, throughput, the spread of its timings
+and the process peak RSS after it ran. Results are saved as JSON; pass
+--baseline to compare against an earlier run and exit with status 1 when a case
+got slower than --tolerance, or than its measured noise when that is larger.
+Comparisons involving a --quick run (5 iterations) are reported but never fail.
+
+Usage: python benchmark_suite.py [--quick] [--output bench.json] [--baseline baseline.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# The upload case must never touch the real database, index or caches:
+# point the API at throwaway storage before main (and config) are imported
+_scratch = tempfile.mkdtemp(prefix='screening-bench-')
+os.environ['DB_BACKEND'] = 'sqlite'
+os.environ['SQLITE_PATH'] = ':memory:'
+os.environ['CANDIDATE_INDEX_DIR'] = os.path.join(_scratch, 'candidate_index')
+os.environ['JOB_SPOOL_DIR'] = os.path.join(_scratch, 'job_spool')
+os.environ.pop('CACHE_DIR', None)
+# Per-batch API logs would interleave with the report
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+
+import numpy as np
+
+from benchmark_pdf_extraction import make_resume_pdf
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(function, iterations, items_per_call=1, warmup=1):
+    """Latency percentiles (ms) and throughput of repeated calls of function(i)"""
+    quiet = io.StringIO()
+    with contextlib.redirect_stdout(quiet):
+        for i in range(warmup):
+            function(-1 - i)
+        timings = []
+        for i in range(iterations):
+            started = time.perf_counter()
+            function(i)
+            timings.append(time.perf_counter() - started)
+    timings = np.array(timings) * 1000
+    median = float(np.median(timings))
+    return {
+        'iterations': iterations,
+        'p50_ms': round(float(np.percentile(timings, 50)), 3),
+        'p95_ms': round(float(np.percentile(timings, 95)), 3),
+        'mean_ms': round(float(timings.mean()), 3),
+        'throughput_per_s': round(items_per_call * iterations / (timings.sum() / 1000), 2),
+        # Relative median absolute deviation of the timings (robust to the odd slow call)
+        'spread': round(float(np.median(np.abs(timings - median))) / median, 4) if median else 0.0,
+        'peak_rss_mb': round(peak_rss_mb(), 1)
+    }
+
+
+WORDS = (
+    "python java sql docker aws react machine learning data analysis api backend "
+    "led built designed improved reduced automated delivered mentored team platform service"
+).split()
+
+
+def make_text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+# Simultaneous single-file uploads in the concurrent upload case
+CONCURRENT_UPLOADS = 50
+
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer with Python, FastAPI, SQL, Docker and AWS experience. "
+    "Machine learning and data analysis are a plus."
+)
+
+
+# ==================== CASES ====================
+
+
+def bench_extraction(main, iterations, rng):
+    results = {}
+    for pages in (1, 2, 5, 10, 20):
+        documents = [make_resume_pdf(pages, rng) for _ in range(4)]
+        results[f"extract_text_from_pdf[pages={pages}]"] = measure(
+            lambda i: main.extract_text_from_pdf(documents[i % len(documents)]), iterations
+        )
+    return results
+
+
+def bench_scoring(main, iterations, rng):
+    results = {}
+    for words in (150, 1500):
+        for batch_size in (1, 8, 32):
+            # Distinct texts per call, so the embedding cache never answers
+            def score(i, words=words, batch_size=batch_size):
+                texts = [f"{i} {j} " + make_text(rng, words) for j in range(batch_size)]
+                main.calculate_ai_match_scores(texts, JOB_DESCRIPTION)
+            results[f"calculate_ai_match_scores[batch={batch_size},words={words}]"] = measure(
+                score, iterations, items_per_call=batch_size
+            )
+    return results
+
+
+def bench_skills(main, iterations, rng):
+    resume = make_text(rng, 800)
+    return {
+        "get_matched_and_missing_skills[words=800]": measure(
+            lambda i: main.get_matched_and_missing_skills(resume, JOB_DESCRIPTION), iterations * 10
+        )
+    }
+
+
+def bench_upload(main, iterations, rng):
+    from fastapi.testclient import TestClient
+
+    results = {}
+    with TestClient(main.app) as client:
+        for file_count in (1, 5):
+            def upload(i, file_count=file_count):
+                # Fresh PDFs every call: measures extraction and encoding, not the caches
+                files = [
+                    ('files', (f"resume_{i}_{j}.pdf", make_resume_pdf(2, rng), 'application/pdf'))
+                    for j in range(file_count)
+                ]
+                response = client.post(
+                    "/api/v1/screening/upload", files=files, data={'job_description': JOB_DESCRIPTION}
+                )
+                response.raise_for_status()
+            results[f"upload[files={file_count}]"] = measure(upload, iterations, items_per_call=file_count)
+
+        def upload_concurrently(i, clients=CONCURRENT_UPLOADS):
+            documents = [make_resume_pdf(2, rng) for _ in range(clients)]
+
+            def upload(j):
+                response = client.post(
+                    "/api/v1/screening/upload",
+                    files=[('files', (f"resume_{i}_{j}.pdf", documents[j], 'application/pdf'))],
+                    data={'job_description': JOB_DESCRIPTION}
+                )
+                response.raise_for_status()
+
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                list(pool.map(upload, range(clients)))
+        results[f"upload_concurrent[clients={CONCURRENT_UPLOADS}]"] = measure(
+            upload_concurrently, iterations, items_per_call=CONCURRENT_UPLOADS
+        )
+    return results
+
+
+# ==================== BASELINE ====================
+
+
+def noise_threshold(previous, current) -> float:
+    """
+    Relative change two runs of the same code can show by chance: three standard
+    errors of the difference of their medians, estimated from each run's spread
+    (standard error of a median ~ 1.253 * 1.4826 * MAD / sqrt(n))
+    """
+    variance = sum(
+        (1.86 * run.get('spread', 0.0)) ** 2 / run['iterations'] for run in (previous, current)
+    )
+    return 3 * variance ** 0.5
+
+
+def compare(results, baseline, metric, tolerance):
+    """Cases whose metric got worse than baseline by more than tolerance and than their noise"""
+    regressions = []
+    print(f"\n{'case':<52} {'baseline':>10} {'current':>10} {'change':>8} {'allowed':>8}")
+    for case, current in results['cases'].items():
+        previous = baseline['cases'].get(case)
+        if previous is None:
+            continue
+        before, after = previous[metric], current[metric]
+        change = (after - before) / before if before else 0.0
+        # Higher is better for throughput, lower for latencies
+        worse = -change if metric == 'throughput_per_s' else change
+        allowed = max(tolerance, noise_threshold(previous, current))
+        flag = " ❌" if worse > allowed else ""
+        print(f"{case:<52} {before:>10.2f} {after:>10.2f} {change * 100:>+7.1f}% {allowed * 100:>7.1f}%{flag}")
+        if worse > allowed:
+            regressions.append(case)
+    return regressions
+
+
+def run(args):
+    import main
+
+    rng = random.Random(42)
+    iterations = 5 if args.quick else args.iterations
+
+    model_loaded = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            main.model_manager.load()
+            model_loaded = True
+        except Exception:
+            pass
+    print(f"🤖 AI model {'loaded' if model_loaded else 'not available: scoring cases skipped, uploads use keyword matching'}")
+
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'model_loaded': model_loaded,
+        'quick': args.quick,
+        'cases': {}
+    }
+    suites = [('extraction', bench_extraction), ('skills', bench_skills), ('upload', bench_upload)]
+    if model_loaded:
+        suites.insert(1, ('scoring', bench_scoring))
+    for name, suite in suites:
+        if args.only and name not in args.only:
+            continue
+        print(f"⏱️  {name}...")
+        results['cases'].update(suite(main, iterations, rng))
+
+    main.workers.shutdown()
+
+    print("\n" + "=" * 100)
+    print(f"{'case':<52} {'p50 ms':>9} {'p95 ms':>9} {'items/s':>10} {'peak RSS MB':>12}")
+    for case, stats in results['cases'].items():
+        print(f"{case:<52} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['throughput_per_s']:>10.1f} {stats['peak_rss_mb']:>12.1f}")
+    print("=" * 100)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results saved to: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.metric, args.tolerance)
+        if regressions and (args.quick or baseline.get('quick')):
+            print(f"\n⚠️  {len(regressions)} case(s) slower than allowed, not failing: "
+                  f"5 iterations are too few to tell a regression from noise (rerun without --quick)")
+        elif regressions:
+            print(f"\n❌ {len(regressions)} case(s) regressed by more than the allowed change")
+            return 1
+        else:
+            print("\n✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the screening hot path")
+    parser.add_argument('--iterations', type=int, default=30, help="Timed calls per case")
+    parser.add_argument('--quick', action='store_true', help="5 iterations per case")
+    parser.add_argument('--only', nargs='+', choices=['extraction', 'scoring', 'skills', 'upload'],
+                        help="Run only these suites")
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON results path")
+    parser.add_argument('--baseline', help="Earlier results to compare against")
+    parser.add_argument('--metric', default='p50_ms', choices=['p50_ms', 'p95_ms', 'mean_ms', 'throughput_per_s'],
+                        help="Metric compared against the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.20,
+                        help="Allowed slowdown before a case counts as a regression (0.20 = 20%%); "
+                             "raised per case to its measured noise when that is larger")
+    sys.exit(run(parser.parse_args()))
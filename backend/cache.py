@@ -0,0 +1,184 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from metrics import CACHE_REQUESTS
+
+
+# ==================== KEYS ====================
+
+
+def hash_bytes(data: bytes) -> str:
+    """Content address of raw bytes (e.g. an uploaded PDF)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different copies of a text share a cache entry"""
+    return " ".join(text.split())
+
+
+def hash_text(text: str) -> str:
+    """Content address of a text after normalization"""
+    return hash_bytes(normalize_text(text).encode('utf-8'))
+
+
+# ==================== CACHE TIERS ====================
+
+
+class LRUCache:
+    """Bounded in-memory cache that evicts the least recently used entry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: str, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    Directory of one file per entry, sharded by the first two characters of the key.
+    Text values are stored as .txt and embeddings as .npy. Writes go to a temporary
+    file first and are renamed into place, so readers never see a partial entry.
+    """
+
+    def __init__(self, directory: str, kind: str):
+        if kind not in ('text', 'embedding'):
+            raise ValueError(f"Unknown cache kind: {kind}")
+        self.directory = directory
+        self.kind = kind
+        self.extension = '.txt' if kind == 'text' else '.npy'
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + self.extension)
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            if self.kind == 'text':
+                with open(path, 'r', encoding='utf-8') as f:
+                    return f.read()
+            return np.load(path)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if self.kind == 'text':
+                    f.write(value.encode('utf-8'))
+                else:
+                    np.save(f, np.asarray(value))
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+# Lookup outcome label of each stats counter, for the cache_requests metric
+_RESULTS = {'memory_hits': 'memory_hit', 'disk_hits': 'disk_hit', 'misses': 'miss'}
+
+
+class ContentCache:
+    """
+    Two-tier content-addressed cache: a bounded LRU in memory in front of an
+    optional directory on disk that survives restarts.
+
+    Entries can be scoped to a namespace (the model name for embeddings), so
+    changing the model makes every entry computed by the old model unreachable.
+    """
+
+    def __init__(self, name: str, kind: str, max_entries: int,
+                 disk_dir: Optional[str] = None, namespace: Optional[str] = None):
+        self.name = name
+        self.kind = kind
+        self.namespace = namespace
+        self.memory = LRUCache(max_entries)
+
+        self.disk = None
+        if disk_dir:
+            directory = os.path.join(disk_dir, name)
+            if namespace:
+                directory = os.path.join(directory, _slugify(namespace))
+            self.disk = DiskCache(directory, kind)
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None:
+            self._count('memory_hits')
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.put(key, value)
+                self._count('disk_hits')
+                return value
+
+        self._count('misses')
+        return None
+
+    def put(self, key: str, value):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def _count(self, counter: str):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+        CACHE_REQUESTS.inc(cache=self.name, result=_RESULTS[counter])
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self.memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "disk_enabled": self.disk is not None
+        }
+
+
+def _slugify(value: str) -> str:
+    """Filesystem-safe directory name for a namespace such as a model name"""
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', value)
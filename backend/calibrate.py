@@ -0,0 +1,311 @@
+"""
+Calibrate the decision thresholds and the semantic weight on the Kaggle set.
+
+The raw score components (semantic similarity, experience bonus, education
+bonus, recruiter decision) are computed once with the model and cached in an
+.npz file; every later run only sweeps. The sweep scores every
+(semantic weight, hire threshold) pair of the grid in one vectorized pass,
+then reports ROC/PR curves and the accuracy- and F1-optimal operating points.
+With --write-config it also writes the recommended scoring config; written to
+SCORING_CONFIG_FILE, it is what the API loads for its PASS/REVIEW/FAIL thresholds.
+
+Usage: python calibrate.py [--objective f1_score|accuracy] [--recompute] [--plot curves.png]
+                           [--write-config data/scoring_config.json]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from config import MODEL_NAME, EMBEDDING_BACKEND, EMBEDDING_NAMESPACE, EMBEDDING_STORE_DIR, SCORING_CONFIG_FILE
+
+
+# np.trapz was renamed in numpy 2
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+# Hand-picked values the API and evaluation used before calibration
+DEFAULT_SCORING = {
+    'semantic_weight': 0.60,
+    'hire_threshold': 55.0,
+    'recommendation': {'pass': 80.0, 'review': 60.0}
+}
+
+
+def load_scoring_config(path):
+    """Scoring config written by this tool, or the defaults when there is none"""
+    if not path or not os.path.exists(path):
+        return DEFAULT_SCORING
+    with open(path, 'r') as f:
+        loaded = json.load(f)
+    return {
+        **DEFAULT_SCORING,
+        **loaded,
+        'recommendation': {**DEFAULT_SCORING['recommendation'], **loaded.get('recommendation', {})}
+    }
+
+
+# ==================== COMPONENTS ====================
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compute_components(csv_file, batch_size):
+    """Model pass over the dataset: the per-row inputs of calculate_ai_score"""
+    from embedding_store import EmbeddingStore
+    from evaluate_ai_accuracy import (
+        load_candidates,
+        create_synthetic_resume,
+        create_job_description,
+        semantic_similarities,
+        experience_bonuses,
+        education_bonuses
+    )
+
+    candidates, hr_decisions = load_candidates(csv_file)
+    resumes = [create_synthetic_resume(c) for c in candidates]
+    job_descriptions = [create_job_description(c['job_role'], c['skills']) for c in candidates]
+    store = EmbeddingStore(EMBEDDING_STORE_DIR, EMBEDDING_NAMESPACE)
+    semantic, _ = semantic_similarities(resumes, job_descriptions, batch_size, store)
+    return {
+        'semantic': semantic.astype(np.float64),
+        'experience_bonus': experience_bonuses([c['experience'] for c in candidates]).astype(np.float64),
+        'education_bonus': education_bonuses([c['education'] for c in candidates]).astype(np.float64),
+        'hire': np.array(hr_decisions) == 'Hire'
+    }
+
+
+def load_components(path, csv_file, batch_size=256, recompute=False):
+    """Cached components, recomputed when the dataset, model or backend changed"""
+    key = {'csv_sha256': _file_sha256(csv_file), 'model': MODEL_NAME, 'backend': EMBEDDING_BACKEND}
+    if not recompute and os.path.exists(path):
+        with np.load(path) as cached:
+            if json.loads(str(cached['key'])) == key:
+                print(f"📦 Using cached components from {path}")
+                return {name: cached[name] for name in ('semantic', 'experience_bonus', 'education_bonus', 'hire')}
+
+    print("🤖 Computing score components with the model...")
+    components = compute_components(csv_file, batch_size)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    np.savez(path, key=json.dumps(key), **components)
+    print(f"💾 Components cached to {path}")
+    return components
+
+
+# ==================== SWEEP ====================
+
+
+def sweep(semantic, bonus, hire, weights, thresholds):
+    """
+    Confusion counts of every (weight, threshold) pair, as (W, T) arrays.
+
+    Score = weight * semantic + bonus, predicted Hire when score >= threshold.
+    Each weight's scores are sorted once; the number of predicted hires (and
+    of true hires among them) at every threshold is then one searchsorted on
+    all rows at once plus a lookup in suffix sums, so the cost grows with
+    W * (N log N + T log N) instead of W * T * N
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    n = len(semantic)
+    positives = int(hire.sum())
+
+    scores = weights[:, None] * semantic[None, :] + bonus[None, :]
+    order = np.argsort(scores, axis=1, kind='stable')
+    sorted_scores = np.take_along_axis(scores, order, axis=1)
+    sorted_hire = hire[order]
+
+    # True hires at sorted position i and above (extra column: none above the top)
+    hires_from = np.zeros((len(weights), n + 1), dtype=np.int64)
+    hires_from[:, :n] = np.cumsum(sorted_hire[:, ::-1], axis=1)[:, ::-1]
+
+    # Shift each row into its own disjoint range so one searchsorted covers every row
+    low = min(sorted_scores.min(), thresholds.min())
+    span = max(sorted_scores.max(), thresholds.max()) - low + 1
+    offsets = np.arange(len(weights))[:, None] * span
+    flat = (sorted_scores - low + offsets).ravel()
+    first = np.searchsorted(flat, (thresholds[None, :] - low + offsets).ravel(), side='left')
+    first = first.reshape(len(weights), len(thresholds)) - np.arange(len(weights))[:, None] * n
+
+    predicted = n - first
+    tp = np.take_along_axis(hires_from, first, axis=1)
+    fp = predicted - tp
+    fn = positives - tp
+    tn = n - positives - fp
+    return {'tp': tp, 'fp': fp, 'tn': tn, 'fn': fn}
+
+
+def metrics_from_counts(counts):
+    """Accuracy, precision, recall, F1 (percentages) and FPR for arrays of confusion counts"""
+    tp, fp, tn, fn = (counts[k].astype(np.float64) for k in ('tp', 'fp', 'tn', 'fn'))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accuracy = (tp + tn) / (tp + fp + tn + fn) * 100
+        precision = np.where(tp + fp > 0, tp / (tp + fp) * 100, 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn) * 100, 0.0)
+        f1_score = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+        fpr = np.where(fp + tn > 0, fp / (fp + tn) * 100, 0.0)
+    return {'accuracy': accuracy, 'precision': precision, 'recall': recall, 'f1_score': f1_score, 'fpr': fpr}
+
+
+def curves(metrics, row, thresholds):
+    """ROC and PR curve of one weight (row), with trapezoidal AUCs"""
+    fpr, tpr = metrics['fpr'][row] / 100, metrics['recall'][row] / 100
+    precision = metrics['precision'][row] / 100
+    roc_order = np.argsort(fpr, kind='stable')
+    pr_order = np.argsort(tpr, kind='stable')
+    return {
+        'thresholds': np.round(thresholds, 4).tolist(),
+        'fpr': np.round(fpr, 4).tolist(),
+        'tpr': np.round(tpr, 4).tolist(),
+        'precision': np.round(precision, 4).tolist(),
+        'roc_auc': round(float(_trapezoid(tpr[roc_order], fpr[roc_order])), 4),
+        'pr_auc': round(float(_trapezoid(precision[pr_order], tpr[pr_order])), 4)
+    }
+
+
+def operating_point(metrics, weights, thresholds, objective):
+    """Best (weight, threshold) for the objective; ties go to the smallest threshold"""
+    row, column = np.unravel_index(np.argmax(metrics[objective]), metrics[objective].shape)
+    return {
+        'semantic_weight': round(float(weights[row]), 4),
+        'hire_threshold': round(float(thresholds[column]), 4),
+        **{name: round(float(values[row, column]), 4) for name, values in metrics.items()}
+    }
+
+
+def recommendation_thresholds(metrics, thresholds, objective, pass_precision):
+    """
+    PASS/REVIEW thresholds for the API's score (semantic similarity x 100):
+    REVIEW from the objective-optimal Hire/Reject boundary, PASS from the
+    lowest threshold above it whose predicted hires reach pass_precision
+    (the most precise one when none does)
+    """
+    review_column = int(np.argmax(metrics[objective][0]))
+    precision = metrics['precision'][0][review_column:]
+    precise = np.nonzero(precision >= pass_precision * 100)[0]
+    pass_column = review_column + (int(precise[0]) if len(precise) else int(np.argmax(precision)))
+    return {'pass': round(float(thresholds[pass_column]), 2), 'review': round(float(thresholds[review_column]), 2)}
+
+
+def plot_curves(path, evaluation_curves, api_curves):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    figure, (roc, pr) = plt.subplots(1, 2, figsize=(12, 5))
+    for label, curve in (('evaluation score', evaluation_curves), ('API score', api_curves)):
+        roc.plot(curve['fpr'], curve['tpr'], label=f"{label} (AUC {curve['roc_auc']:.3f})")
+        pr.plot(curve['tpr'], curve['precision'], label=f"{label} (AUC {curve['pr_auc']:.3f})")
+    roc.set(xlabel='False positive rate', ylabel='True positive rate', title='ROC')
+    pr.set(xlabel='Recall', ylabel='Precision', title='Precision-Recall')
+    roc.legend()
+    pr.legend()
+    figure.savefig(path, dpi=120, bbox_inches='tight')
+    print(f"📈 Curves plotted to {path}")
+
+
+# ==================== CLI ====================
+
+
+def run(args):
+    components = load_components(args.components, args.csv, args.batch_size, args.recompute)
+    semantic, hire = components['semantic'], components['hire']
+    bonus = components['experience_bonus'] + components['education_bonus']
+
+    weights = np.round(np.arange(args.min_weight, args.max_weight + 1e-9, args.weight_step), 6)
+    thresholds = np.round(np.arange(0, 100 + 1e-9, args.threshold_step), 6)
+
+    started = time.perf_counter()
+    metrics = metrics_from_counts(sweep(semantic, bonus, hire, weights, thresholds))
+    api_metrics = metrics_from_counts(sweep(semantic, np.zeros_like(semantic), hire, np.ones(1), thresholds))
+    sweep_seconds = time.perf_counter() - started
+    configurations = len(weights) * len(thresholds) + len(thresholds)
+    print(f"⚡ Swept {configurations:,} configurations in {sweep_seconds * 1000:.1f} ms")
+
+    best = {objective: operating_point(metrics, weights, thresholds, objective) for objective in ('accuracy', 'f1_score')}
+    chosen = best[args.objective]
+    chosen_row = int(np.argmin(np.abs(weights - chosen['semantic_weight'])))
+    current = metrics_from_counts(sweep(
+        semantic, bonus, hire, np.array([DEFAULT_SCORING['semantic_weight']]),
+        np.array([DEFAULT_SCORING['hire_threshold']])
+    ))
+
+    scoring = {
+        'semantic_weight': chosen['semantic_weight'],
+        'hire_threshold': chosen['hire_threshold'],
+        'recommendation': recommendation_thresholds(api_metrics, thresholds, args.objective, args.pass_precision),
+        'objective': args.objective,
+        'model': MODEL_NAME,
+        'backend': EMBEDDING_BACKEND,
+        'generated_at': datetime.now().isoformat(timespec='seconds')
+    }
+    evaluation_curves = curves(metrics, chosen_row, thresholds)
+    api_curves = curves(api_metrics, 0, thresholds)
+    report = {
+        'rows': len(semantic),
+        'grid': {'weights': len(weights), 'thresholds': len(thresholds), 'configurations': configurations},
+        'sweep_seconds': round(sweep_seconds, 4),
+        'current': {
+            'semantic_weight': DEFAULT_SCORING['semantic_weight'],
+            'hire_threshold': DEFAULT_SCORING['hire_threshold'],
+            **{name: round(float(values[0, 0]), 4) for name, values in current.items()}
+        },
+        'best_accuracy': best['accuracy'],
+        'best_f1': best['f1_score'],
+        'recommended': scoring,
+        'curves': {'evaluation_score': evaluation_curves, 'api_score': api_curves}
+    }
+
+    print("=" * 70)
+    for label, point in (('Current', report['current']), ('Best accuracy', best['accuracy']), ('Best F1', best['f1_score'])):
+        print(f"{label:>14}: weight {point['semantic_weight']:.2f}, threshold {point['hire_threshold']:.1f} -> "
+              f"accuracy {point['accuracy']:.2f}% | F1 {point['f1_score']:.2f}%")
+    print(f"ROC AUC {evaluation_curves['roc_auc']:.3f} (evaluation score), {api_curves['roc_auc']:.3f} (API score)")
+    print(f"API thresholds: PASS >= {scoring['recommendation']['pass']}, REVIEW >= {scoring['recommendation']['review']}")
+    print("=" * 70)
+
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Report saved to: {args.report}")
+    if args.write_config:
+        os.makedirs(os.path.dirname(args.write_config) or '.', exist_ok=True)
+        with open(args.write_config, 'w') as f:
+            json.dump(scoring, f, indent=2)
+        loaded = os.path.abspath(args.write_config) == os.path.abspath(SCORING_CONFIG_FILE)
+        print(f"💾 Scoring config saved to: {args.write_config}"
+              + (" (loaded by the API on start)" if loaded else ""))
+    else:
+        print(f"ℹ️  Scoring config not written; pass --write-config {SCORING_CONFIG_FILE} to apply it to the API")
+    if args.plot:
+        plot_curves(args.plot, evaluation_curves, api_curves)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate decision thresholds and the semantic weight")
+    parser.add_argument('--csv', default='data/AI_Resume_Screening.csv', help="Kaggle evaluation dataset")
+    parser.add_argument('--components', default='data/calibration_components.npz', help="Cached score components")
+    parser.add_argument('--recompute', action='store_true', help="Ignore the cached components")
+    parser.add_argument('--batch-size', type=int, default=256, help="Texts per model forward pass")
+    parser.add_argument('--objective', choices=['f1_score', 'accuracy'], default='f1_score',
+                        help="Metric the recommended config optimizes")
+    parser.add_argument('--min-weight', type=float, default=0.0)
+    parser.add_argument('--max-weight', type=float, default=1.5)
+    parser.add_argument('--weight-step', type=float, default=0.01)
+    parser.add_argument('--threshold-step', type=float, default=0.1)
+    parser.add_argument('--pass-precision', type=float, default=0.95,
+                        help="Share of real hires required among the API's PASS results")
+    parser.add_argument('--report', default='calibration_report.json', help="JSON report path")
+    parser.add_argument('--write-config',
+                        help=f"Write the recommended scoring config to this path "
+                             f"(the API loads {SCORING_CONFIG_FILE} at startup)")
+    parser.add_argument('--plot', help="Also plot the ROC/PR curves to this image (needs matplotlib)")
+    run(parser.parse_args())
@@ -0,0 +1,203 @@
+import json
+import os
+import re
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+from file_lock import exclusive_lock
+
+
+# Stored recommendation labels, kept as one byte per candidate
+RECOMMENDATIONS = ["PASS", "REVIEW", "FAIL"]
+
+# One record per indexed resume, row-aligned with the embedding matrix
+RECORD_DTYPE = np.dtype([
+    ('id', '<i8'),
+    ('match_score', '<f4'),
+    ('recommendation', 'u1')
+])
+
+# Rows converted to float32 and scored per step, bounding temporary memory
+SEARCH_CHUNK_ROWS = 65536
+
+
+class CandidateIndex:
+    """
+    Append-only, memory-mapped store of resume embeddings keyed by screening_results id.
+
+    Layout of the index directory (one directory per model name):
+    - meta.json       model name, embedding dimension and storage dtype
+    - embeddings.bin  raw (n, dim) matrix of unit-length embeddings
+    - records.bin     n RECORD_DTYPE rows: id, original match score, recommendation
+
+    Appends only ever add bytes to the end of both files, so readers keep working
+    while new candidates arrive and nothing has to be rebuilt. A torn append
+    (crash between the two writes) is ignored by only reading complete row pairs.
+    """
+
+    def __init__(self, directory: str, model_name: str, dtype: str = 'float32'):
+        self.directory = os.path.join(directory, re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name))
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        self.dim = None
+
+        self.meta_path = os.path.join(self.directory, 'meta.json')
+        self.embeddings_path = os.path.join(self.directory, 'embeddings.bin')
+        self.records_path = os.path.join(self.directory, 'records.bin')
+        self.lock_path = os.path.join(self.directory, '.lock')
+
+        self._embeddings = None
+        self._records = None
+        self._rows = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_meta()
+
+    def __len__(self):
+        return self._refresh()[2]
+
+    def append(self, ids: List[int], embeddings: np.ndarray,
+               match_scores: List[float], recommendations: List[str]):
+        """Add screened resumes to the end of the index"""
+        if len(ids) == 0:
+            return
+
+        embeddings = np.asarray(embeddings)
+        records = np.zeros(len(ids), dtype=RECORD_DTYPE)
+        records['id'] = ids
+        records['match_score'] = match_scores
+        records['recommendation'] = [RECOMMENDATIONS.index(r) for r in recommendations]
+
+        with exclusive_lock(self.lock_path):
+            self._load_meta()
+            if self.dim is None:
+                self._write_meta(embeddings.shape[1])
+            if embeddings.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension {embeddings.shape[1]} does not match index dimension {self.dim}"
+                )
+
+            # Drop any torn tail first so both files stay row-aligned
+            rows = self._complete_rows()
+            self._truncate(rows)
+
+            with open(self.embeddings_path, 'ab') as f:
+                f.write(np.ascontiguousarray(embeddings, dtype=self.dtype).tobytes())
+            with open(self.records_path, 'ab') as f:
+                f.write(records.tobytes())
+
+    def search(self, query_embedding: np.ndarray, top_k: int = 10,
+               recommendation: Optional[str] = None,
+               min_score: Optional[float] = None,
+               max_score: Optional[float] = None) -> List[dict]:
+        """
+        Top-K stored candidates by cosine similarity to query_embedding (unit length),
+        optionally restricted by original recommendation and match score range
+        """
+        embeddings, records, rows = self._refresh()
+        if rows == 0 or top_k <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+
+        # Matrix-vector product over the memory-mapped matrix, one chunk at a time
+        similarities = np.empty(rows, dtype=np.float32)
+        for start in range(0, rows, SEARCH_CHUNK_ROWS):
+            chunk = embeddings[start:start + SEARCH_CHUNK_ROWS]
+            if chunk.dtype != np.float32:
+                chunk = chunk.astype(np.float32)
+            np.dot(chunk, query, out=similarities[start:start + len(chunk)])
+
+        # Filters become a boolean mask; excluded rows can never rank
+        mask = np.ones(rows, dtype=bool)
+        if recommendation is not None:
+            mask &= records['recommendation'] == RECOMMENDATIONS.index(recommendation)
+        if min_score is not None:
+            mask &= records['match_score'] >= min_score
+        if max_score is not None:
+            mask &= records['match_score'] <= max_score
+        candidates = np.flatnonzero(mask)
+        if len(candidates) == 0:
+            return []
+
+        candidate_similarities = similarities[candidates]
+        k = min(top_k, len(candidates))
+        top = np.argpartition(-candidate_similarities, k - 1)[:k]
+        top = top[np.argsort(-candidate_similarities[top])]
+
+        results = []
+        for position in top:
+            row = candidates[position]
+            results.append({
+                "id": int(records['id'][row]),
+                "match_score": round(float(similarities[row]) * 100, 2),
+                "original_match_score": round(float(records['match_score'][row]), 2),
+                "original_recommendation": RECOMMENDATIONS[records['recommendation'][row]]
+            })
+        return results
+
+    # ==================== INTERNALS ====================
+
+    def _load_meta(self):
+        """Pick up dimension and dtype once the first append (maybe by another process) wrote them"""
+        if self.dim is None and os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r') as f:
+                meta = json.load(f)
+            self.dim = meta['dim']
+            self.dtype = np.dtype(meta['dtype'])
+
+    def _write_meta(self, dim: int):
+        self.dim = dim
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({"model_name": self.model_name, "dim": dim, "dtype": self.dtype.name}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _row_bytes(self) -> int:
+        return self.dim * self.dtype.itemsize
+
+    def _complete_rows(self) -> int:
+        if self.dim is None:
+            return 0
+        embedding_rows = _file_size(self.embeddings_path) // self._row_bytes()
+        record_rows = _file_size(self.records_path) // RECORD_DTYPE.itemsize
+        return min(embedding_rows, record_rows)
+
+    def _truncate(self, rows: int):
+        for path, row_bytes in ((self.embeddings_path, self._row_bytes()),
+                                (self.records_path, RECORD_DTYPE.itemsize)):
+            if _file_size(path) > rows * row_bytes:
+                with open(path, 'r+b') as f:
+                    f.truncate(rows * row_bytes)
+
+    def _refresh(self):
+        """
+        Re-map the files if other writers have appended since the last read.
+        Returns a consistent (embeddings, records, rows) snapshot
+        """
+        self._load_meta()
+        rows = self._complete_rows()
+        with self._lock:
+            if rows == self._rows:
+                return self._embeddings, self._records, self._rows
+            if rows == 0:
+                self._embeddings, self._records = None, None
+            else:
+                self._embeddings = np.memmap(
+                    self.embeddings_path, dtype=self.dtype, mode='r', shape=(rows, self.dim)
+                )
+                self._records = np.memmap(
+                    self.records_path, dtype=RECORD_DTYPE, mode='r', shape=(rows,)
+                )
+            self._rows = rows
+            return self._embeddings, self._records, self._rows
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
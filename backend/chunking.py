@@ -0,0 +1,113 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+# Long resumes are split into overlapping windows of word pieces that each fit
+# the model's max sequence length, instead of being silently truncated after
+# the first ~256 tokens. All windows of a batch are then sorted by token count
+# and encoded in consecutive batches, so each forward pass pads to a similar
+# length rather than every short text padding up to the longest resume.
+
+
+def token_offsets(model, text: str) -> List[Tuple[int, int]]:
+    """(start, end) character span of every word piece of text, without special tokens"""
+    if hasattr(model, 'token_offsets'):
+        # OnnxSentenceEncoder
+        return model.token_offsets(text)
+    encoding = model.tokenizer(
+        text, add_special_tokens=False, return_offsets_mapping=True, truncation=False, verbose=False
+    )
+    return encoding['offset_mapping']
+
+
+def split_into_windows(text: str, offsets: Sequence[Tuple[int, int]], window: int,
+                       overlap: int) -> Tuple[List[str], List[int]]:
+    """
+    Overlapping chunks of at most `window` tokens, cut on token boundaries of
+    the original text. Returns (chunks, token count per chunk)
+    """
+    if len(offsets) <= window:
+        return [text], [len(offsets)]
+
+    step = max(window - overlap, 1)
+    chunks, token_counts = [], []
+    for start in range(0, len(offsets), step):
+        end = min(start + window, len(offsets))
+        chunks.append(text[offsets[start][0]:offsets[end - 1][1]])
+        token_counts.append(end - start)
+        if end == len(offsets):
+            break
+    return chunks, token_counts
+
+
+def chunk_texts(model, texts: List[str], overlap: int) -> Tuple[List[str], List[int], List[int]]:
+    """
+    Windows of every text sized for the model (its max length minus [CLS]/[SEP]).
+    Returns (chunks, token counts, owner), where owner[i] is the text index of chunk i
+    """
+    window = model.max_seq_length - 2
+    chunks, token_counts, owner = [], [], []
+    for i, text in enumerate(texts):
+        text_chunks, text_counts = split_into_windows(text, token_offsets(model, text), window, overlap)
+        chunks.extend(text_chunks)
+        token_counts.extend(text_counts)
+        owner.extend([i] * len(text_chunks))
+    return chunks, token_counts, owner
+
+
+def encode_bucketed(model, chunks: List[str], token_counts: List[int], batch_size: int) -> np.ndarray:
+    """
+    Normalized embeddings of chunks in input order, encoded longest-first in
+    batches of similar token length to keep padding to a minimum
+    """
+    order = np.argsort(-np.asarray(token_counts), kind='stable')
+    embeddings = None
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        encoded = model.encode(
+            [chunks[i] for i in batch],
+            batch_size=len(batch),
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        if embeddings is None:
+            embeddings = np.empty((len(chunks), encoded.shape[1]), dtype=np.float32)
+        embeddings[batch] = encoded
+    return embeddings
+
+
+def padding_ratio(token_counts: Sequence[int], batch_size: int, bucketed: bool = True) -> float:
+    """Share of the encoded positions that are padding, for the given batching"""
+    counts = np.asarray(token_counts) + 2  # [CLS] and [SEP]
+    if bucketed:
+        counts = np.sort(counts)[::-1]
+    padded = sum(int(counts[i:i + batch_size].max()) * len(counts[i:i + batch_size])
+                 for i in range(0, len(counts), batch_size))
+    return 1 - int(counts.sum()) / padded if padded else 0.0
+
+
+def aggregate_similarities(similarities: np.ndarray, method: str = 'max', top_k: int = 3) -> float:
+    """One score from the similarities of a resume's chunks: their max, or the mean of the top k"""
+    if method == 'max' or len(similarities) == 1:
+        return float(similarities.max())
+    if method == 'mean_top_k':
+        k = min(top_k, len(similarities))
+        return float(np.partition(similarities, -k)[-k:].mean())
+    raise ValueError(f"Unknown chunk aggregation: {method}")
+
+
+def aggregate_similarity_columns(similarities: np.ndarray, method: str = 'max', top_k: int = 3) -> np.ndarray:
+    """aggregate_similarities for every column of a (chunks, job descriptions) matrix at once"""
+    if method == 'max' or len(similarities) == 1:
+        return similarities.max(axis=0)
+    if method == 'mean_top_k':
+        k = min(top_k, len(similarities))
+        return np.partition(similarities, -k, axis=0)[-k:].mean(axis=0)
+    raise ValueError(f"Unknown chunk aggregation: {method}")
+
+
+def document_embedding(chunk_embeddings: np.ndarray) -> np.ndarray:
+    """Single normalized vector for a chunked text (mean of its chunk embeddings)"""
+    mean = chunk_embeddings.mean(axis=0)
+    return mean / max(np.linalg.norm(mean), 1e-12)
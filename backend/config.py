@@ -0,0 +1,121 @@
+import os
+
+# Settings for the screening API, overridable through environment variables
+
+
+# AI model used for semantic matching
+MODEL_NAME = os.getenv('MODEL_NAME', 'sentence-transformers/all-MiniLM-L6-v2')
+
+# How many resumes go through the model in a single forward pass
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '32'))
+
+# Entries kept in each in-memory cache (extracted text, resume and JD embeddings)
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '1024'))
+
+# Directory for the on-disk cache tier; leave unset to keep the cache in memory only
+CACHE_DIR = os.getenv('CACHE_DIR') or None
+
+# Memory-mapped store of screened resume embeddings used for candidate search
+CANDIDATE_INDEX_DIR = os.getenv('CANDIDATE_INDEX_DIR', 'data/candidate_index')
+
+# Storage dtype of the candidate index: float32, or float16 to halve disk and page cache use
+CANDIDATE_INDEX_DTYPE = os.getenv('CANDIDATE_INDEX_DTYPE', 'float32')
+
+# Database backend: 'mysql' (production) or 'sqlite' (local tests and benchmarks)
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+
+# Connections kept in the pool, and threads running database calls for async handlers
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+
+MYSQL_HOST = os.getenv('MYSQL_HOST', 'localhost')
+MYSQL_DATABASE = os.getenv('MYSQL_DATABASE', 'resume_screening_system')
+MYSQL_USER = os.getenv('MYSQL_USER', 'root')
+MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD', 'root')
+
+# SQLite database file, or ':memory:' for a throwaway database
+SQLITE_PATH = os.getenv('SQLITE_PATH', 'data/resume_screening.db')
+
+# Processes extracting PDF text in parallel
+EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', str(os.cpu_count() or 1)))
+
+# PDF text extraction backend: 'pypdf2', 'pdfium' (pypdfium2) or 'pdfminer' (pdfminer.six)
+PDF_BACKEND = os.getenv('PDF_BACKEND', 'pypdf2')
+
+# Uploads larger than this many bytes are rejected (0 disables the limit)
+PDF_MAX_BYTES = int(os.getenv('PDF_MAX_BYTES', str(10 * 1024 * 1024)))
+
+# Only the first pages are read, and extraction stops once this much text is gathered (0 disables either)
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '20'))
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', '50000'))
+
+# Pages per extraction task; longer documents are split into page ranges extracted in parallel
+PDF_PAGES_PER_TASK = int(os.getenv('PDF_PAGES_PER_TASK', '4'))
+
+# Cross-request micro-batching: concurrent encode calls are queued and run as one
+# forward pass once INFERENCE_MAX_BATCH_SIZE texts are waiting or the oldest has
+# waited INFERENCE_MAX_WAIT_MS
+INFERENCE_BATCHING = os.getenv('INFERENCE_BATCHING', '1') == '1'
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv('INFERENCE_MAX_BATCH_SIZE', '64'))
+INFERENCE_MAX_WAIT_MS = float(os.getenv('INFERENCE_MAX_WAIT_MS', '5'))
+
+# Threads scoring requests off the event loop. Without batching each one runs the
+# model itself; with batching they only wait on the batcher, so allow one per concurrent request
+INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', '64' if INFERENCE_BATCHING else '1'))
+
+# Torch intra-op threads; leave unset to keep torch's default (all cores)
+TORCH_THREADS = int(os.getenv('TORCH_THREADS', '0')) or None
+
+# Background screening jobs: concurrent worker tasks, files per pipeline chunk, spool directory
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+JOB_CHUNK_SIZE = int(os.getenv('JOB_CHUNK_SIZE', '10'))
+JOB_SPOOL_DIR = os.getenv('JOB_SPOOL_DIR', 'data/job_spool')
+# How long a server process's claim on job files outlives it; live processes renew it every third of this
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '300'))
+
+# Skill taxonomy: the built-in list plus every skill in this CSV's Skills column (if present)
+SKILLS_CSV = os.getenv('SKILLS_CSV', 'data/AI_Resume_Screening.csv')
+
+# Optional JSON taxonomy file: {"skill": ["alias", ...]} or a list of skills
+SKILLS_FILE = os.getenv('SKILLS_FILE') or None
+
+# Local directory holding the model (e.g. a saved copy of MODEL_NAME); loaded instead of the hub id
+MODEL_DIR = os.getenv('MODEL_DIR') or None
+
+# Never contact the Hugging Face hub when loading (defaults to on when MODEL_DIR is set)
+MODEL_OFFLINE = os.getenv('MODEL_OFFLINE', '1' if MODEL_DIR else '0') == '1'
+
+# Embedding backend: 'torch' (sentence-transformers) or 'onnx' (int8 ONNX model on onnxruntime, CPU)
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'torch')
+
+# Directory written by export_onnx.py, loaded when EMBEDDING_BACKEND is 'onnx'
+ONNX_MODEL_DIR = os.getenv('ONNX_MODEL_DIR', 'models/all-MiniLM-L6-v2-onnx')
+
+# Scope of stored/cached embeddings: the model, plus the backend when it is the quantized export
+EMBEDDING_NAMESPACE = MODEL_NAME if EMBEDDING_BACKEND == 'torch' else f"{MODEL_NAME}-{EMBEDDING_BACKEND}-int8"
+
+# Persistent embedding store used by the evaluation and calibration scripts
+EMBEDDING_STORE_DIR = os.getenv('EMBEDDING_STORE_DIR', 'data/embedding_store')
+
+# How resumes are encoded: 'truncate' (first max-length tokens only) or 'chunked'
+# (overlapping windows over the whole text, similarities aggregated into one score)
+RESUME_ENCODING = os.getenv('RESUME_ENCODING', 'truncate')
+
+# Chunked encoding: tokens shared by consecutive windows, and how chunk similarities combine ('max' or 'mean_top_k')
+CHUNK_OVERLAP = int(os.getenv('CHUNK_OVERLAP', '64'))
+CHUNK_AGGREGATION = os.getenv('CHUNK_AGGREGATION', 'max')
+CHUNK_TOP_K = int(os.getenv('CHUNK_TOP_K', '3'))
+
+# Scoring config written by calibrate.py (PASS/REVIEW thresholds); the built-in 80/60 apply when missing
+SCORING_CONFIG_FILE = os.getenv('SCORING_CONFIG_FILE', 'data/scoring_config.json')
+
+# Log verbosity (DEBUG logs every resume; INFO logs batches and lifecycle events) and line format ('json' or 'text')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+
+# Server bind address, and worker processes of the production server (gunicorn.conf.py)
+SERVER_HOST = os.getenv('SERVER_HOST', '0.0.0.0')
+SERVER_PORT = int(os.getenv('SERVER_PORT', '8000'))
+SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', '2'))
+
+# Load the torch model once in the gunicorn master so workers share its memory copy-on-write
+PRELOAD_MODEL = os.getenv('PRELOAD_MODEL', '1') == '1'
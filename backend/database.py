@@ -1,22 +1,1108 @@
-import mysql.connector
-from mysql.connector import Error
-from typing import Optional, List, Dict
+import asyncio
+import base64
+import functools
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple, Iterator
 
-def get_db_connection():
-    """Create database connection"""
-    try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            database='resume_screening_system',
-            user='root',
-            password='root'  # Your password
+from config import (
+    DB_BACKEND,
+    DB_POOL_SIZE,
+    MYSQL_HOST,
+    MYSQL_DATABASE,
+    MYSQL_USER,
+    MYSQL_PASSWORD,
+    SQLITE_PATH
+)
+from metrics import ERRORS
+
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== STORAGE BACKENDS ====================
+
+
+class Storage:
+    """
+    Screening persistence on top of a pool of DB-API connections.
+    Backends only provide the connections, the placeholder style and how
+    to recover the ids of a bulk insert; every query is shared.
+    """
+
+    placeholder = '%s'
+    errors = ()
+
+    # Tables this backend creates if missing
+    SCHEMA = []
+
+    # Secondary indexes the queries rely on: (name, table, columns)
+    INDEXES = [
+        # History pages: keyset on (screened_at, id), optionally narrowed by recommendation or job
+        ("idx_screening_screened_at_id", "screening_results", "screened_at, id"),
+        ("idx_screening_recommendation", "screening_results", "recommendation, screened_at, id"),
+        ("idx_screening_job", "screening_results", "job_id, screened_at, id"),
+        # Background screening jobs: a job's files, and unfinished work after a restart
+        ("idx_job_files_job", "screening_job_files", "screening_job_id, position"),
+        ("idx_jobs_status", "screening_jobs", "status"),
+        ("idx_job_files_owner", "screening_job_files", "owner, status"),
+    ]
+
+    # Columns added after their table first shipped: (table, column, definition)
+    COLUMNS = [
+        ("screening_jobs", "owner", "VARCHAR(64)"),
+        ("screening_jobs", "lease_expires_at", "DATETIME NULL"),
+        ("screening_job_files", "owner", "VARCHAR(64)"),
+        ("screening_job_files", "lease_expires_at", "DATETIME NULL"),
+    ]
+
+    def __init__(self, pool_size: int):
+        self.pool_size = pool_size
+        # Callers wait for a free connection instead of failing when the pool is exhausted
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def ensure_schema(self):
+        """Create any missing table and secondary index (safe to run on every start)"""
+        with self.connection() as connection:
+            self._apply_schema(connection)
+
+    def _apply_schema(self, connection):
+        cursor = connection.cursor()
+        try:
+            for statement in self.SCHEMA:
+                cursor.execute(statement)
+            for table, column, definition in self.COLUMNS:
+                self._add_column(cursor, table, column, definition)
+            for name, table, columns in self.INDEXES:
+                self._create_index(cursor, name, table, columns)
+            connection.commit()
+        finally:
+            cursor.close()
+
+    def _create_index(self, cursor, name: str, table: str, columns: str, unique: bool = False):
+        raise NotImplementedError
+
+    def _add_column(self, cursor, table: str, column: str, definition: str):
+        raise NotImplementedError
+
+    # ---------- connection handling (backend specific) ----------
+
+    def _acquire(self):
+        raise NotImplementedError
+
+    def _release(self, connection):
+        raise NotImplementedError
+
+    def _insert_ids(self, cursor, query: str, rows: List[tuple]) -> List[int]:
+        """Insert rows inside the caller's transaction and return their ids, in order"""
+        ids = []
+        for row in rows:
+            cursor.execute(query, row)
+            ids.append(cursor.lastrowid)
+        return ids
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the duration of the block"""
+        with self._slots:
+            connection = self._acquire()
+            try:
+                yield connection
+            finally:
+                self._release(connection)
+
+    def _sql(self, query: str) -> str:
+        return query.replace('%s', self.placeholder)
+
+    @staticmethod
+    def _rows_as_dicts(cursor) -> List[Dict]:
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    # ---------- queries ----------
+
+    def check_connection(self) -> bool:
+        try:
+            with self.connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+                cursor.close()
+            return True
+        except self.errors as e:
+            logger.error("Error connecting to database", extra={"error": str(e)})
+            return False
+
+    def save_screening_result(
+        self,
+        job_id: int,
+        candidate_name: str,
+        file_name: str,
+        match_score: float,
+        matched_skills: str,
+        missing_skills: str,
+        recommendation: str
+    ) -> Optional[int]:
+        """Save a screening result to database"""
+        return self.save_screening_results([{
+            "job_id": job_id,
+            "candidate_name": candidate_name,
+            "file_name": file_name,
+            "match_score": match_score,
+            "matched_skills": matched_skills,
+            "missing_skills": missing_skills,
+            "recommendation": recommendation
+        }])[0]
+
+    def save_screening_results(self, results: List[Dict]) -> List[Optional[int]]:
+        """
+        Save several screening results in a single transaction.
+        Returns the new ids in input order (all None if the transaction failed)
+        """
+        if not results:
+            return []
+        rows = [(
+            r["job_id"],
+            r["candidate_name"],
+            r["file_name"],
+            r["match_score"],
+            r["matched_skills"],
+            r["missing_skills"],
+            r["recommendation"]
+        ) for r in results]
+        query = self._sql("""
+            INSERT INTO screening_results
+            (job_id, candidate_name, file_name, match_score,
+             matched_skills, missing_skills, recommendation)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """)
+        try:
+            with self.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    self._begin(cursor)
+                    result_ids = self._insert_ids(cursor, query, rows)
+                    connection.commit()
+                except self.errors:
+                    connection.rollback()
+                    raise
+                finally:
+                    cursor.close()
+            logger.debug("Saved screening results", extra={"count": len(result_ids), "first_id": result_ids[0], "last_id": result_ids[-1]})
+            return result_ids
+        except self.errors as e:
+            logger.error("Error saving results", extra={"count": len(results), "error": str(e)})
+            ERRORS.inc(stage="db_write")
+            return [None] * len(results)
+
+    def _begin(self, cursor):
+        """Start the write transaction (SQLite takes its write lock here)"""
+
+    def get_all_screenings(self) -> List[Dict]:
+        """Get all screening results with job titles"""
+        try:
+            with self.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute("""
+                        SELECT
+                            s.id,
+                            s.candidate_name,
+                            s.file_name,
+                            s.match_score,
+                            s.matched_skills,
+                            s.missing_skills,
+                            s.recommendation,
+                            s.screened_at,
+                            j.title as job_title,
+                            j.description as job_description
+                        FROM screening_results s
+                        LEFT JOIN job_descriptions j ON s.job_id = j.id
+                        ORDER BY s.screened_at DESC
+                    """)
+                    results = self._rows_as_dicts(cursor)
+                finally:
+                    cursor.close()
+            logger.debug("Retrieved screening results", extra={"count": len(results)})
+            return results
+        except self.errors as e:
+            logger.error("Error fetching results", extra={"error": str(e)})
+            return []
+
+    def get_screening(self, screening_id: int) -> Optional[Dict]:
+        """Get one screening result (with its job) by primary key"""
+        try:
+            with self.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(self._sql("""
+                        SELECT
+                            s.id,
+                            s.candidate_name,
+                            s.file_name,
+                            s.match_score,
+                            s.matched_skills,
+                            s.missing_skills,
+                            s.recommendation,
+                            s.screened_at,
+                            j.title as job_title,
+                            j.description as job_description
+                        FROM screening_results s
+                        LEFT JOIN job_descriptions j ON s.job_id = j.id
+                        WHERE s.id = %s
+                    """), (screening_id,))
+                    rows = self._rows_as_dicts(cursor)
+                finally:
+                    cursor.close()
+            return rows[0] if rows else None
+        except self.errors as e:
+            logger.error("Error fetching result", extra={"error": str(e)})
+            return None
+
+    def get_screenings_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+        recommendation: Optional[str] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        job_id: Optional[int] = None,
+        include_description: bool = False,
+        since_id: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        One page of screening results, newest first, using keyset pagination:
+        `after` is the (screened_at, id) of the last row of the previous page, so
+        every page is an index range scan no matter how deep it is.
+        With since_id, only rows with a larger id, oldest first (a primary key range scan)
+        """
+        conditions, params = [], []
+        if after is not None:
+            conditions.append("(s.screened_at < %s OR (s.screened_at = %s AND s.id < %s))")
+            params += [after[0], after[0], after[1]]
+        if since_id is not None:
+            conditions.append("s.id > %s")
+            params.append(since_id)
+        if recommendation is not None:
+            conditions.append("s.recommendation = %s")
+            params.append(recommendation)
+        if min_score is not None:
+            conditions.append("s.match_score >= %s")
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append("s.match_score <= %s")
+            params.append(max_score)
+        if job_id is not None:
+            conditions.append("s.job_id = %s")
+            params.append(job_id)
+
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        description = ",\n                            j.description as job_description" if include_description else ""
+        query = self._sql(f"""
+                        SELECT
+                            s.id,
+                            s.candidate_name,
+                            s.file_name,
+                            s.match_score,
+                            s.matched_skills,
+                            s.missing_skills,
+                            s.recommendation,
+                            s.screened_at,
+                            s.job_id,
+                            j.title as job_title{description}
+                        FROM screening_results s
+                        LEFT JOIN job_descriptions j ON s.job_id = j.id
+                        {where}
+                        ORDER BY {"s.id" if since_id is not None else "s.screened_at DESC, s.id DESC"}
+                        LIMIT %s
+        """)
+        params.append(limit)
+        try:
+            with self.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(query, tuple(params))
+                    return self._rows_as_dicts(cursor)
+                finally:
+                    cursor.close()
+        except self.errors as e:
+            logger.error("Error fetching results", extra={"error": str(e)})
+            return []
+
+    def get_history_marker(self) -> Optional[str]:
+        """
+        Value that changes whenever the history does: the largest screening result id
+        (results are only ever inserted) plus the count and latest updated_at of the
+        job descriptions whose titles and text the history joins in. Read from the
+        primary key and one small table. None when the database cannot be reached
+        """
+        try:
+            with self.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute("""
+                        SELECT (SELECT MAX(id) FROM screening_results),
+                               (SELECT COUNT(*) FROM job_descriptions),
+                               (SELECT MAX(updated_at) FROM job_descriptions)
+                    """)
+                    latest_id, job_count, jobs_updated_at = cursor.fetchone()
+                    return f"{latest_id or 0}-{job_count}-{jobs_updated_at or ''}"
+                finally:
+                    cursor.close()
+        except self.errors as e:
+            logger.error("Error fetching history marker", extra={"error": str(e)})
+            return None
+
+    # Columns of an export row, in order
+    EXPORT_COLUMNS = [
+        "id", "job_id", "job_title", "candidate_name", "file_name", "match_score",
+        "matched_skills", "missing_skills", "recommendation", "screened_at"
+    ]
+
+    @contextmanager
+    def _stream_connection(self):
+        """Connection held open while a long export streams out"""
+        with self.connection() as connection:
+            yield connection
+
+    def iter_screenings(
+        self,
+        since: Optional[datetime] = None,
+        include_description: bool = False,
+        batch_size: int = 1000
+    ) -> Iterator[Dict]:
+        """
+        Stream screening results oldest first, batch_size rows at a time, without
+        materializing the table. `since` only returns rows screened at or after it
+        """
+        description = ", j.description as job_description" if include_description else ""
+        where, params = "", ()
+        if since is not None:
+            where, params = "WHERE s.screened_at >= %s", (since,)
+        query = self._sql(f"""
+            SELECT
+                s.id, s.job_id, j.title as job_title, s.candidate_name, s.file_name,
+                s.match_score, s.matched_skills, s.missing_skills, s.recommendation,
+                s.screened_at{description}
+            FROM screening_results s
+            LEFT JOIN job_descriptions j ON s.job_id = j.id
+            {where}
+            ORDER BY s.screened_at, s.id
+        """)
+
+        with self._stream_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params)
+                columns = [column[0] for column in cursor.description]
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(zip(columns, row))
+            finally:
+                try:
+                    cursor.close()
+                except self.errors:
+                    pass
+
+    # ---------- background screening jobs ----------
+    # Job and file states: 'submitting' -> 'queued' -> 'running' -> 'completed'
+    # ('failed' if submission never finished); files go 'queued' -> 'done' / 'error'.
+    # A submitting job and its queued files belong to the server process (owner)
+    # handling them until lease_expires_at; live owners keep renewing their leases,
+    # so only the work of a process that went away is ever taken over.
+    # These raise on database errors: job bookkeeping must not fail silently.
+
+    def create_screening_job(self, job_description: str, total_files: int,
+                             owner: Optional[str] = None, lease_expires_at: Optional[datetime] = None) -> int:
+        """Create a job in 'submitting' state, leased to owner; its files are added once spooled"""
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self._sql("""
+                    INSERT INTO screening_jobs (job_description, status, total_files, owner, lease_expires_at)
+                    VALUES (%s, 'submitting', %s, %s, %s)
+                """), (job_description, total_files, owner, lease_expires_at))
+                connection.commit()
+                return cursor.lastrowid
+            finally:
+                cursor.close()
+
+    def add_screening_job_files(self, screening_job_id: int, files: List[Tuple[int, str, str]],
+                                owner: Optional[str] = None,
+                                lease_expires_at: Optional[datetime] = None) -> List[int]:
+        """
+        Register a job's spooled files, (position, file_name, spool_path) each, leased
+        to owner, and mark the job 'queued' in the same transaction. Returns the file row ids
+        """
+        rows = [
+            (screening_job_id, position, file_name, spool_path, owner, lease_expires_at)
+            for position, file_name, spool_path in files
+        ]
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                self._begin(cursor)
+                file_ids = self._insert_ids(cursor, self._sql("""
+                    INSERT INTO screening_job_files
+                    (screening_job_id, position, file_name, spool_path, status, owner, lease_expires_at)
+                    VALUES (%s, %s, %s, %s, 'queued', %s, %s)
+                """), rows)
+                cursor.execute(self._sql("""
+                    UPDATE screening_jobs SET status = 'queued', updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """), (screening_job_id,))
+                connection.commit()
+                return file_ids
+            except self.errors:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    RECORD_JOB_PROGRESS = """
+        UPDATE screening_jobs
+        SET status = CASE WHEN processed_files + %s >= total_files
+                          THEN 'completed' ELSE 'running' END,
+            processed_files = processed_files + %s,
+            failed_files = failed_files + %s,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = %s
+    """
+
+    def record_screening_job_results(self, screening_job_id: int, updates: List[Tuple[int, str, str]]):
+        """
+        Store finished files, (file_row_id, status, result_json) each, and advance the
+        job's counters in one transaction; the job completes with its last file
+        """
+        failed = sum(1 for _, status, _ in updates if status == 'error')
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                self._begin(cursor)
+                cursor.executemany(self._sql("""
+                    UPDATE screening_job_files SET status = %s, result = %s WHERE id = %s
+                """), [(status, result, file_id) for file_id, status, result in updates])
+                # status comes first: MySQL applies the assignments left to right, so
+                # later ones already see the incremented processed_files (SQLite never does)
+                cursor.execute(self._sql(self.RECORD_JOB_PROGRESS),
+                               (len(updates), len(updates), failed, screening_job_id))
+                connection.commit()
+            except self.errors:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def get_screening_job(self, screening_job_id: int) -> Optional[Dict]:
+        """Status and counters of one job"""
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self._sql("""
+                    SELECT id, status, total_files, processed_files, failed_files, created_at, updated_at
+                    FROM screening_jobs WHERE id = %s
+                """), (screening_job_id,))
+                rows = self._rows_as_dicts(cursor)
+            finally:
+                cursor.close()
+        return rows[0] if rows else None
+
+    def get_screening_job_files(self, screening_job_id: int) -> List[Dict]:
+        """Every file of a job in upload order, with its stored result once finished"""
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self._sql("""
+                    SELECT id, position, file_name, status, result
+                    FROM screening_job_files WHERE screening_job_id = %s
+                    ORDER BY position
+                """), (screening_job_id,))
+                return self._rows_as_dicts(cursor)
+            finally:
+                cursor.close()
+
+    def renew_job_leases(self, owner: str, lease_expires_at: datetime):
+        """Extend the lease on every submitting job and queued file owner still holds"""
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self._sql("""
+                    UPDATE screening_jobs SET lease_expires_at = %s
+                    WHERE owner = %s AND status = 'submitting'
+                """), (lease_expires_at, owner))
+                cursor.execute(self._sql("""
+                    UPDATE screening_job_files SET lease_expires_at = %s
+                    WHERE owner = %s AND status = 'queued'
+                """), (lease_expires_at, owner))
+                connection.commit()
+            finally:
+                cursor.close()
+
+    def claim_unfinished_job_files(self, owner: str, now: datetime, lease_expires_at: datetime) -> List[Dict]:
+        """
+        Take over the work of server processes that went away: submissions whose
+        lease expired are marked 'failed', and queued files of unfinished jobs whose
+        lease expired are leased to owner. Returns every queued file owner now holds
+        """
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self._sql("""
+                    UPDATE screening_jobs SET status = 'failed', updated_at = CURRENT_TIMESTAMP
+                    WHERE status = 'submitting' AND (lease_expires_at IS NULL OR lease_expires_at < %s)
+                """), (now,))
+                # One statement: rows are re-checked under their lock, so two
+                # processes claiming at once never both get the same file
+                cursor.execute(self._sql("""
+                    UPDATE screening_job_files SET owner = %s, lease_expires_at = %s
+                    WHERE status = 'queued'
+                      AND (lease_expires_at IS NULL OR lease_expires_at < %s)
+                      AND screening_job_id IN (
+                          SELECT id FROM screening_jobs WHERE status IN ('queued', 'running')
+                      )
+                """), (owner, lease_expires_at, now))
+                connection.commit()
+                cursor.execute(self._sql("""
+                    SELECT f.id, f.screening_job_id, f.position, f.file_name, f.spool_path,
+                           j.job_description
+                    FROM screening_job_files f
+                    JOIN screening_jobs j ON f.screening_job_id = j.id
+                    WHERE f.owner = %s AND f.status = 'queued' AND j.status IN ('queued', 'running')
+                    ORDER BY j.id, f.position
+                """), (owner,))
+                return self._rows_as_dicts(cursor)
+            finally:
+                cursor.close()
+
+    # ---------- job descriptions (bulk loading) ----------
+
+    # Insert one (title, description, required_skills) row, or update the row with that title
+    UPSERT_JOB_DESCRIPTION = ""
+
+    def ensure_job_title_index(self):
+        """
+        Unique index on job_descriptions.title, which upsert_job_descriptions relies on.
+        Fails if the table already holds duplicate titles
+        """
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                self._create_index(cursor, "uq_job_descriptions_title", "job_descriptions", "title", unique=True)
+                connection.commit()
+            finally:
+                cursor.close()
+
+    def get_job_description_texts(self, titles: List[str]) -> Dict[str, Tuple[str, str]]:
+        """(description, required_skills) of the stored job descriptions among titles"""
+        if not titles:
+            return {}
+        placeholders = ", ".join(["%s"] * len(titles))
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self._sql(f"""
+                    SELECT title, description, required_skills
+                    FROM job_descriptions WHERE title IN ({placeholders})
+                """), tuple(titles))
+                return {title: (description, skills) for title, description, skills in cursor.fetchall()}
+            finally:
+                cursor.close()
+
+    def upsert_job_descriptions(self, rows: List[Tuple[str, str, str]]):
+        """Insert or update (title, description, required_skills) rows in one transaction"""
+        if not rows:
+            return
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                self._begin(cursor)
+                cursor.executemany(self._sql(self.UPSERT_JOB_DESCRIPTION), rows)
+                connection.commit()
+            except self.errors:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def get_job_descriptions(self, job_ids: Optional[List[int]] = None,
+                             after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        id, title, description and required_skills of the given job descriptions
+        (all if None), by id; after_id and limit page through the table
+        """
+        query = "SELECT id, title, description, required_skills FROM job_descriptions WHERE id > %s"
+        params = (after_id,)
+        if job_ids is not None:
+            if not job_ids:
+                return []
+            query += f" AND id IN ({', '.join(['%s'] * len(job_ids))})"
+            params += tuple(job_ids)
+        query += " ORDER BY id"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self._sql(query), params)
+                return self._rows_as_dicts(cursor)
+            finally:
+                cursor.close()
+
+    # ---------- job description embeddings ----------
+
+    # Insert a (job_id, model, text_hash, embedding) row, or replace that job's vector for that model
+    UPSERT_JOB_EMBEDDING = ""
+
+    def get_job_embeddings(self, job_ids: List[int], model: str) -> Dict[int, Tuple[str, bytes]]:
+        """(text_hash, float32 bytes) of the stored embeddings of job_ids for one model"""
+        if not job_ids:
+            return {}
+        placeholders = ", ".join(["%s"] * len(job_ids))
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self._sql(f"""
+                    SELECT job_id, text_hash, embedding FROM job_embeddings
+                    WHERE model = %s AND job_id IN ({placeholders})
+                """), (model, *job_ids))
+                return {job_id: (text_hash, bytes(embedding)) for job_id, text_hash, embedding in cursor.fetchall()}
+            finally:
+                cursor.close()
+
+    def save_job_embeddings(self, rows: List[Tuple[int, str, str, bytes]]):
+        """Store (job_id, model, text_hash, float32 bytes) rows in one transaction"""
+        if not rows:
+            return
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                self._begin(cursor)
+                cursor.executemany(self._sql(self.UPSERT_JOB_EMBEDDING), rows)
+                connection.commit()
+            except self.errors:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def delete_job_embeddings(self, keep_model: str) -> int:
+        """Drop the embeddings of every model but keep_model (after a model upgrade)"""
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self._sql("DELETE FROM job_embeddings WHERE model <> %s"), (keep_model,))
+                connection.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
+    def get_job_description(self, job_id: int) -> Optional[Dict]:
+        """Get a specific job description by ID"""
+        try:
+            with self.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(self._sql("""
+                        SELECT * FROM job_descriptions WHERE id = %s
+                    """), (job_id,))
+                    rows = self._rows_as_dicts(cursor)
+                finally:
+                    cursor.close()
+            return rows[0] if rows else None
+        except self.errors as e:
+            logger.error("Error fetching job", extra={"error": str(e)})
+            return None
+
+    def save_chat_message(self, user_message: str, bot_response: str) -> Optional[int]:
+        """Save a chat conversation to database"""
+        try:
+            with self.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(self._sql("""
+                        INSERT INTO chat_messages (user_message, bot_response)
+                        VALUES (%s, %s)
+                    """), (user_message, bot_response))
+                    connection.commit()
+                    message_id = cursor.lastrowid
+                finally:
+                    cursor.close()
+            logger.debug("Saved chat message", extra={"message_id": message_id})
+            return message_id
+        except self.errors as e:
+            logger.error("Error saving chat", extra={"error": str(e)})
+            return None
+
+
+class MySQLStorage(Storage):
+    """MySQL backend using mysql-connector's built-in connection pool"""
+
+    # job_descriptions, screening_results and chat_messages come from the existing
+    # database; only tables added since are created here
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS screening_jobs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            job_description TEXT NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            total_files INT NOT NULL DEFAULT 0,
+            processed_files INT NOT NULL DEFAULT 0,
+            failed_files INT NOT NULL DEFAULT 0,
+            owner VARCHAR(64),
+            lease_expires_at DATETIME NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS screening_job_files (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            screening_job_id INT NOT NULL,
+            position INT NOT NULL,
+            file_name VARCHAR(255) NOT NULL,
+            spool_path VARCHAR(1024) NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            result LONGTEXT,
+            owner VARCHAR(64),
+            lease_expires_at DATETIME NULL,
+            FOREIGN KEY (screening_job_id) REFERENCES screening_jobs(id)
         )
-        if connection.is_connected():
-            print("✅ Successfully connected to MySQL database")
-            return connection
-    except Error as e:
-        print(f"❌ Error connecting to MySQL: {e}")
-        return None
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS job_embeddings (
+            job_id INT NOT NULL,
+            model VARCHAR(255) NOT NULL,
+            text_hash CHAR(64) NOT NULL,
+            embedding BLOB NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (job_id, model)
+        )
+        """
+    ]
+
+    # The existing job_descriptions table gets a change time, kept current by the
+    # server on every update (the history ETag reads it)
+    COLUMNS = Storage.COLUMNS + [
+        ("job_descriptions", "updated_at",
+         "TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"),
+    ]
+
+    # executemany turns this into one multi-row INSERT per batch
+    UPSERT_JOB_DESCRIPTION = """
+        INSERT INTO job_descriptions (title, description, required_skills)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE description = VALUES(description), required_skills = VALUES(required_skills),
+                                updated_at = CURRENT_TIMESTAMP(6)
+    """
+
+    UPSERT_JOB_EMBEDDING = """
+        INSERT INTO job_embeddings (job_id, model, text_hash, embedding)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE text_hash = VALUES(text_hash), embedding = VALUES(embedding),
+                                updated_at = CURRENT_TIMESTAMP
+    """
+
+    # Rows per multi-row INSERT in _insert_ids, well under max_allowed_packet
+    MULTI_ROW_INSERT_LIMIT = 500
+
+    def __init__(self, pool_size: int, **connect_args):
+        super().__init__(pool_size)
+        from mysql.connector import Error, pooling
+
+        self.errors = (Error,)
+        self._connect_args = connect_args
+        self._pooling = pooling
+        # Created on first use and retried until the server is reachable, so an
+        # outage surfaces as the usual database errors (handled by every caller)
+        # instead of breaking get_storage()
+        self._pool = None
+        self._schema_ready = False
+        self._setup_lock = threading.Lock()
+        # Gap between the ids of one multi-row INSERT, 0 when they may not be
+        # consecutive; read from the server on the first insert
+        self._id_step = None
+
+    def _acquire(self):
+        if self._pool is None or not self._schema_ready:
+            with self._setup_lock:
+                if self._pool is None:
+                    self._pool = self._pooling.MySQLConnectionPool(
+                        pool_name="resume_screening",
+                        pool_size=self.pool_size,
+                        **self._connect_args
+                    )
+                    logger.info("MySQL connection pool ready", extra={"connections": self.pool_size})
+                if not self._schema_ready:
+                    connection = self._pool.get_connection()
+                    try:
+                        self._apply_schema(connection)
+                    except self.errors:
+                        connection.close()
+                        raise
+                    self._schema_ready = True
+                    return connection
+        return self._pool.get_connection()
+
+    @contextmanager
+    def _stream_connection(self):
+        # Exports get their own unbuffered connection: rows are read from the server
+        # as they are consumed, a long export does not hold a pool slot, and a client
+        # hanging up mid-stream just drops the connection with its unread rows
+        import mysql.connector
+
+        connection = mysql.connector.connect(buffered=False, **self._connect_args)
+        try:
+            yield connection
+        finally:
+            try:
+                connection.close()
+            except self.errors:
+                pass
+
+    def _create_index(self, cursor, name: str, table: str, columns: str, unique: bool = False):
+        from mysql.connector import errorcode
+
+        try:
+            cursor.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({columns})")
+        except self.errors as e:
+            if e.errno != errorcode.ER_DUP_KEYNAME:
+                raise
+
+    def _add_column(self, cursor, table: str, column: str, definition: str):
+        from mysql.connector import errorcode
+
+        try:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        except self.errors as e:
+            if e.errno != errorcode.ER_DUP_FIELDNAME:
+                raise
+
+    def _release(self, connection):
+        # Closing a pooled connection hands it back to the pool
+        connection.close()
+
+    def _insert_ids(self, cursor, query: str, rows: List[tuple]) -> List[int]:
+        # One multi-row INSERT per MULTI_ROW_INSERT_LIMIT rows. InnoDB hands such a
+        # statement one block of ids only with innodb_autoinc_lock_mode 0 or 1; then
+        # they run from LAST_INSERT_ID() (the first row) in auto_increment_increment
+        # steps. With mode 2 (interleaved, the MySQL 8 default) another session's
+        # insert can take ids in between, so rows go one round trip each
+        if self._id_step is None:
+            cursor.execute("SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment")
+            lock_mode, increment = cursor.fetchone()
+            self._id_step = int(increment) if int(lock_mode) <= 1 else 0
+            logger.info("MySQL auto-increment settings", extra={"lock_mode": lock_mode, "increment": increment})
+        if not self._id_step:
+            return super()._insert_ids(cursor, query, rows)
+
+        head, _, values = query.rpartition("VALUES")
+        ids = []
+        for start in range(0, len(rows), self.MULTI_ROW_INSERT_LIMIT):
+            chunk = rows[start:start + self.MULTI_ROW_INSERT_LIMIT]
+            cursor.execute(
+                f"{head}VALUES {', '.join([values.strip()] * len(chunk))}",
+                [value for row in chunk for value in row]
+            )
+            ids += range(cursor.lastrowid, cursor.lastrowid + len(chunk) * self._id_step, self._id_step)
+        return ids
+
+
+class SQLiteStorage(Storage):
+    """
+    Local SQLite backend with the same interface, for tests and benchmarks
+    without a MySQL server. Use ':memory:' for a throwaway in-memory database.
+    """
+
+    placeholder = '?'
+    errors = (sqlite3.Error,)
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS job_descriptions (
+            id INTEGER PRIMARY KEY,
+            title VARCHAR(255) NOT NULL,
+            description TEXT,
+            required_skills TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS screening_results (
+            id INTEGER PRIMARY KEY,
+            job_id INTEGER,
+            candidate_name VARCHAR(255),
+            file_name VARCHAR(255),
+            match_score FLOAT,
+            matched_skills TEXT,
+            missing_skills TEXT,
+            recommendation VARCHAR(20),
+            screened_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS chat_messages (
+            id INTEGER PRIMARY KEY,
+            user_message TEXT,
+            bot_response TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS screening_jobs (
+            id INTEGER PRIMARY KEY,
+            job_description TEXT NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            total_files INTEGER NOT NULL DEFAULT 0,
+            processed_files INTEGER NOT NULL DEFAULT 0,
+            failed_files INTEGER NOT NULL DEFAULT 0,
+            owner VARCHAR(64),
+            lease_expires_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS screening_job_files (
+            id INTEGER PRIMARY KEY,
+            screening_job_id INTEGER NOT NULL REFERENCES screening_jobs(id),
+            position INTEGER NOT NULL,
+            file_name VARCHAR(255) NOT NULL,
+            spool_path VARCHAR(1024) NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            result TEXT,
+            owner VARCHAR(64),
+            lease_expires_at TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS job_embeddings (
+            job_id INTEGER NOT NULL,
+            model VARCHAR(255) NOT NULL,
+            text_hash CHAR(64) NOT NULL,
+            embedding BLOB NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (job_id, model)
+        )
+        """
+    ]
+
+    # ALTER TABLE cannot add a column with a non-constant default: rows of older
+    # databases keep a NULL updated_at, which MAX() skips. SQLite's clock has
+    # millisecond resolution (MySQL's CURRENT_TIMESTAMP(6) microseconds)
+    COLUMNS = Storage.COLUMNS + [
+        ("job_descriptions", "updated_at", "TIMESTAMP"),
+    ]
+
+    UPSERT_JOB_DESCRIPTION = """
+        INSERT INTO job_descriptions (title, description, required_skills)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (title) DO UPDATE SET description = excluded.description, required_skills = excluded.required_skills,
+                                          updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+    """
+
+    UPSERT_JOB_EMBEDDING = """
+        INSERT INTO job_embeddings (job_id, model, text_hash, embedding)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (job_id, model) DO UPDATE SET text_hash = excluded.text_hash, embedding = excluded.embedding,
+                                                  updated_at = CURRENT_TIMESTAMP
+    """
+
+    def __init__(self, pool_size: int, path: str):
+        super().__init__(pool_size)
+        if path == ':memory:':
+            # Shared cache so every pooled connection sees the same in-memory database;
+            # a unique name, as a database lives on while any connection to it is open
+            self._target, self._uri = f"file:resume_screening_{uuid.uuid4().hex}?mode=memory&cache=shared", True
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._target, self._uri = path, False
+
+        self._pool = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+
+        self.ensure_schema()
+
+    def _connect(self):
+        connection = sqlite3.connect(
+            self._target,
+            uri=self._uri,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        if not self._uri:
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        return connection
+
+    def _acquire(self):
+        return self._pool.get()
+
+    def _create_index(self, cursor, name: str, table: str, columns: str, unique: bool = False):
+        cursor.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+    def _add_column(self, cursor, table: str, column: str, definition: str):
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _release(self, connection):
+        self._pool.put(connection)
+
+    def _begin(self, cursor):
+        cursor.execute("BEGIN IMMEDIATE")
+
+    def _insert_ids(self, cursor, query: str, rows: List[tuple]) -> List[int]:
+        # One executemany: new rowids are max(rowid) + 1, and the write lock taken
+        # by BEGIN IMMEDIATE keeps them one consecutive block
+        cursor.executemany(query, rows)
+        if not rows:
+            return []
+        cursor.execute("SELECT last_insert_rowid()")
+        last_id = cursor.fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> Storage:
+    """Shared storage backend selected by DB_BACKEND, created on first use"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                if DB_BACKEND == 'sqlite':
+                    _storage = SQLiteStorage(DB_POOL_SIZE, SQLITE_PATH)
+                elif DB_BACKEND == 'mysql':
+                    _storage = MySQLStorage(
+                        DB_POOL_SIZE,
+                        host=MYSQL_HOST,
+                        database=MYSQL_DATABASE,
+                        user=MYSQL_USER,
+                        password=MYSQL_PASSWORD
+                    )
+                else:
+                    raise ValueError(f"Unknown DB_BACKEND: {DB_BACKEND}")
+    return _storage
+
+
+# ==================== SYNC API ====================
+
 
 def save_screening_result(
     job_id: int,
@@ -28,115 +1114,199 @@ def save_screening_result(
     recommendation: str
 ) -> Optional[int]:
     """Save a screening result to database"""
-    connection = get_db_connection()
-    if connection:
-        try:
-            cursor = connection.cursor()
-            query = """
-                INSERT INTO screening_results 
-                (job_id, candidate_name, file_name, match_score, 
-                 matched_skills, missing_skills, recommendation)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(query, (
-                job_id, 
-                candidate_name, 
-                file_name, 
-                match_score, 
-                matched_skills, 
-                missing_skills, 
-                recommendation
-            ))
-            connection.commit()
-            result_id = cursor.lastrowid
-            print(f"✅ Saved screening result with ID: {result_id}")
-            return result_id
-        except Error as e:
-            print(f"❌ Error saving result: {e}")
-            return None
-        finally:
-            cursor.close()
-            connection.close()
+    return get_storage().save_screening_result(
+        job_id, candidate_name, file_name, match_score,
+        matched_skills, missing_skills, recommendation
+    )
+
+
+def save_screening_results(results: List[Dict]) -> List[Optional[int]]:
+    """Save several screening results in one transaction"""
+    return get_storage().save_screening_results(results)
+
 
 def get_all_screenings() -> List[Dict]:
     """Get all screening results with job titles"""
-    connection = get_db_connection()
-    if connection:
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT 
-                    s.id,
-                    s.candidate_name,
-                    s.file_name,
-                    s.match_score,
-                    s.matched_skills,
-                    s.missing_skills,
-                    s.recommendation,
-                    s.screened_at,
-                    j.title as job_title,
-                    j.description as job_description
-                FROM screening_results s
-                LEFT JOIN job_descriptions j ON s.job_id = j.id
-                ORDER BY s.screened_at DESC
-            """)
-            results = cursor.fetchall()
-            print(f"✅ Retrieved {len(results)} screening results")
-            return results
-        except Error as e:
-            print(f"❌ Error fetching results: {e}")
-            return []
-        finally:
-            cursor.close()
-            connection.close()
-    return []
+    return get_storage().get_all_screenings()
+
+
+def get_screening(screening_id: int) -> Optional[Dict]:
+    """Get one screening result by ID"""
+    return get_storage().get_screening(screening_id)
+
+
+def get_screenings_page(limit: int, cursor: Optional[str] = None, **filters) -> Tuple[List[Dict], Optional[str]]:
+    """
+    One page of screening history, newest first.
+    Returns (rows, next_cursor); next_cursor is None on the last page
+    """
+    after = decode_cursor(cursor) if cursor else None
+    # Fetch one extra row to know whether another page follows
+    rows = get_storage().get_screenings_page(limit + 1, after, **filters)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]["screened_at"], rows[-1]["id"])
+
+
+def get_screenings_since(since_id: int, limit: int, **filters) -> Tuple[List[Dict], bool]:
+    """
+    Screening results added after since_id, oldest first.
+    Returns (rows, has_more); poll again with the last row's id
+    """
+    rows = get_storage().get_screenings_page(limit + 1, None, since_id=since_id, **filters)
+    return rows[:limit], len(rows) > limit
+
+
+def get_history_marker() -> Optional[str]:
+    """Change marker of the screening history (None when the database cannot be reached)"""
+    return get_storage().get_history_marker()
+
+
+def encode_cursor(screened_at: datetime, screening_id: int) -> str:
+    """Opaque page cursor from the (screened_at, id) of the last row returned"""
+    raw = f"{screened_at.isoformat()}|{screening_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        screened_at, screening_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(screened_at), int(screening_id)
+    except (UnicodeError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def iter_screenings(since: Optional[datetime] = None, include_description: bool = False) -> Iterator[Dict]:
+    """Stream all screening results (optionally only those since a timestamp), oldest first"""
+    return get_storage().iter_screenings(since, include_description)
+
 
 def get_job_description(job_id: int) -> Optional[Dict]:
     """Get a specific job description by ID"""
-    connection = get_db_connection()
-    if connection:
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT * FROM job_descriptions WHERE id = %s
-            """, (job_id,))
-            result = cursor.fetchone()
-            return result
-        except Error as e:
-            print(f"❌ Error fetching job: {e}")
-            return None
-        finally:
-            cursor.close()
-            connection.close()
+    return get_storage().get_job_description(job_id)
+
+
+def get_job_descriptions(job_ids: Optional[List[int]] = None,
+                         after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+    """Several job descriptions by id, or all of them (optionally one page at a time)"""
+    return get_storage().get_job_descriptions(job_ids, after_id, limit)
+
+
+def get_job_embeddings(job_ids: List[int], model: str) -> Dict[int, Tuple[str, bytes]]:
+    return get_storage().get_job_embeddings(job_ids, model)
+
+
+def save_job_embeddings(rows: List[Tuple[int, str, str, bytes]]):
+    return get_storage().save_job_embeddings(rows)
+
+
+def delete_job_embeddings(keep_model: str) -> int:
+    return get_storage().delete_job_embeddings(keep_model)
+
+
+def ensure_job_title_index():
+    return get_storage().ensure_job_title_index()
+
+
+def get_job_description_texts(titles: List[str]) -> Dict[str, Tuple[str, str]]:
+    return get_storage().get_job_description_texts(titles)
+
+
+def upsert_job_descriptions(rows: List[Tuple[str, str, str]]):
+    return get_storage().upsert_job_descriptions(rows)
+
+
+def create_screening_job(job_description: str, total_files: int, owner: Optional[str] = None,
+                         lease_expires_at: Optional[datetime] = None) -> int:
+    return get_storage().create_screening_job(job_description, total_files, owner, lease_expires_at)
+
+
+def add_screening_job_files(screening_job_id: int, files: List[Tuple[int, str, str]],
+                            owner: Optional[str] = None, lease_expires_at: Optional[datetime] = None) -> List[int]:
+    return get_storage().add_screening_job_files(screening_job_id, files, owner, lease_expires_at)
+
+
+def record_screening_job_results(screening_job_id: int, updates: List[Tuple[int, str, str]]):
+    return get_storage().record_screening_job_results(screening_job_id, updates)
+
+
+def get_screening_job(screening_job_id: int) -> Optional[Dict]:
+    return get_storage().get_screening_job(screening_job_id)
+
+
+def get_screening_job_files(screening_job_id: int) -> List[Dict]:
+    return get_storage().get_screening_job_files(screening_job_id)
+
+
+def renew_job_leases(owner: str, lease_expires_at: datetime):
+    return get_storage().renew_job_leases(owner, lease_expires_at)
+
+
+def claim_unfinished_job_files(owner: str, now: datetime, lease_expires_at: datetime) -> List[Dict]:
+    return get_storage().claim_unfinished_job_files(owner, now, lease_expires_at)
+
 
 def save_chat_message(user_message: str, bot_response: str) -> Optional[int]:
     """Save a chat conversation to database"""
-    connection = get_db_connection()
-    if connection:
-        try:
-            cursor = connection.cursor()
-            query = """
-                INSERT INTO chat_messages (user_message, bot_response)
-                VALUES (%s, %s)
-            """
-            cursor.execute(query, (user_message, bot_response))
-            connection.commit()
-            message_id = cursor.lastrowid
-            print(f"✅ Saved chat message with ID: {message_id}")
-            return message_id
-        except Error as e:
-            print(f"❌ Error saving chat: {e}")
-            return None
-        finally:
-            cursor.close()
-            connection.close()
+    return get_storage().save_chat_message(user_message, bot_response)
+
+
+# ==================== ASYNC API ====================
+# Database calls block, so async handlers run them on a small thread pool
+# sized like the connection pool instead of on the event loop.
+
+
+_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db")
+
+
+async def run_db(function, *args):
+    """Run any of the sync functions above on the database thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, function, *args)
+
+
+async def save_screening_results_async(results: List[Dict]) -> List[Optional[int]]:
+    return await run_db(save_screening_results, results)
+
+
+async def get_all_screenings_async() -> List[Dict]:
+    return await run_db(get_all_screenings)
+
+
+async def get_screening_async(screening_id: int) -> Optional[Dict]:
+    return await run_db(get_screening, screening_id)
+
+
+async def get_screenings_page_async(limit: int, cursor: Optional[str] = None, **filters):
+    return await run_db(functools.partial(get_screenings_page, limit, cursor, **filters))
+
+
+async def get_screenings_since_async(since_id: int, limit: int, **filters):
+    return await run_db(functools.partial(get_screenings_since, since_id, limit, **filters))
+
+
+async def get_history_marker_async() -> Optional[str]:
+    return await run_db(get_history_marker)
+
+
+async def get_job_description_async(job_id: int) -> Optional[Dict]:
+    return await run_db(get_job_description, job_id)
+
+
+async def get_job_descriptions_async(job_ids: Optional[List[int]] = None) -> List[Dict]:
+    return await run_db(get_job_descriptions, job_ids)
+
+
+async def save_chat_message_async(user_message: str, bot_response: str) -> Optional[int]:
+    return await run_db(save_chat_message, user_message, bot_response)
+
 
 # Test function
 if __name__ == "__main__":
     print("Testing database connection...")
-    conn = get_db_connection()
-    if conn:
+    if get_storage().check_connection():
         print("✅ Database connection test successful!")
-        conn.close()
     else:
         print("❌ Database connection test failed!")
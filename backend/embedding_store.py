@@ -0,0 +1,224 @@
+"""
+On-disk embedding store for evaluation and offline runs.
+
+Usage: python embedding_store.py stats|compact [--dir data/embedding_store] [--namespace MODEL]
+"""
+import argparse
+import os
+import re
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cache import hash_text
+from config import EMBEDDING_STORE_DIR, EMBEDDING_NAMESPACE
+from file_lock import exclusive_lock
+
+
+class EmbeddingStore:
+    """
+    Persistent text embeddings keyed by model (namespace) and text hash.
+
+    Layout of the store directory (one directory per namespace):
+    - index.txt          one "text_hash segment row" line per stored embedding
+    - seg-000001.npy ... immutable (n, dim) float32 segments, memory-mapped by readers
+
+    An append writes a whole new segment to a temporary file, renames it into
+    place, then appends its lines to the index, all under an exclusive file
+    lock; readers need no lock because segments never change and only
+    complete index lines are read. Compaction merges every segment into one
+    and swaps in a new index the same way.
+    """
+
+    def __init__(self, directory: str, namespace: str):
+        self.directory = os.path.join(directory, re.sub(r'[^A-Za-z0-9_.-]+', '_', namespace))
+        self.namespace = namespace
+        self.index_path = os.path.join(self.directory, 'index.txt')
+        self.lock_path = os.path.join(self.directory, '.lock')
+
+        self._entries: Dict[str, Tuple[str, int]] = {}
+        self._segments: Dict[str, np.ndarray] = {}
+        self._index_inode = None
+        self._index_offset = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    # ==================== READING ====================
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Stored embedding per key, None where missing"""
+        with self._lock:
+            self._refresh()
+            try:
+                return [self._lookup(key) for key in keys]
+            except FileNotFoundError:
+                # A compaction removed a segment after our index read; start over once
+                self._reset()
+                self._refresh()
+                return [self._lookup(key) for key in keys]
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        segment, row = entry
+        if segment not in self._segments:
+            self._segments[segment] = np.load(os.path.join(self.directory, segment), mmap_mode='r')
+        return self._segments[segment][row]
+
+    def _refresh(self):
+        """Read index lines appended since the last call (everything after a compaction)"""
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._index_inode or stat.st_size < self._index_offset:
+            self._reset()
+            self._index_inode = stat.st_ino
+        if stat.st_size == self._index_offset:
+            return
+
+        with open(self.index_path, 'rb') as f:
+            f.seek(self._index_offset)
+            data = f.read()
+        # A line is only used once its newline is written
+        complete = data[:data.rfind(b'\n') + 1]
+        for line in complete.decode('ascii').splitlines():
+            key, segment, row = line.split()
+            self._entries[key] = (segment, int(row))
+        self._index_offset += len(complete)
+
+    def _reset(self):
+        self._entries = {}
+        self._segments = {}
+        self._index_inode = None
+        self._index_offset = 0
+
+    # ==================== WRITING ====================
+
+    def put_many(self, keys: List[str], embeddings: np.ndarray):
+        """Append embeddings for keys not stored yet (by this or any other process)"""
+        if len(keys) == 0:
+            return
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        with exclusive_lock(self.lock_path):
+            with self._lock:
+                self._refresh()
+                fresh = {}
+                for i, key in enumerate(keys):
+                    if key not in self._entries and key not in fresh:
+                        fresh[key] = i
+            if not fresh:
+                return
+
+            segment = self._write_segment(embeddings[list(fresh.values())])
+            lines = "".join(f"{key} {segment} {row}\n" for row, key in enumerate(fresh))
+            with open(self.index_path, 'a') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _write_segment(self, embeddings: np.ndarray) -> str:
+        """Write a new immutable segment atomically; call with the file lock held"""
+        numbers = [int(name[4:10]) for name in os.listdir(self.directory) if re.fullmatch(r'seg-\d{6}\.npy', name)]
+        segment = f"seg-{max(numbers, default=0) + 1:06d}.npy"
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, embeddings)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, os.path.join(self.directory, segment))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return segment
+
+    def encode(self, texts: List[str], encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Embeddings of texts as one (n, dim) matrix, reading through the store:
+        only texts not stored yet are passed to encode (once per distinct text)
+        """
+        keys = [hash_text(text) for text in texts]
+        stored = self.get_many(keys)
+        missing: Dict[str, int] = {}
+        for i, (key, embedding) in enumerate(zip(keys, stored)):
+            if embedding is None and key not in missing:
+                missing[key] = i
+
+        if missing:
+            fresh = encode([texts[i] for i in missing.values()])
+            self.put_many(list(missing), fresh)
+            by_key = dict(zip(missing, fresh))
+            stored = [by_key[key] if embedding is None else embedding for key, embedding in zip(keys, stored)]
+
+        return np.vstack(stored).astype(np.float32, copy=False)
+
+    # ==================== MAINTENANCE ====================
+
+    def compact(self) -> Tuple[int, int]:
+        """Merge all segments into one; returns (segments before, embeddings kept)"""
+        with exclusive_lock(self.lock_path):
+            with self._lock:
+                self._reset()
+                self._refresh()
+                keys = list(self._entries)
+                old_segments = sorted({segment for segment, _ in self._entries.values()})
+                if len(old_segments) <= 1:
+                    return len(old_segments), len(keys)
+                merged = np.stack([self._lookup(key) for key in keys])
+
+            segment = self._write_segment(merged)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write("".join(f"{key} {segment} {row}\n" for row, key in enumerate(keys)))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.index_path)
+
+            # Readers that still map an old segment keep their open mapping
+            for name in os.listdir(self.directory):
+                if re.fullmatch(r'seg-\d{6}\.npy', name) and name != segment:
+                    os.remove(os.path.join(self.directory, name))
+            with self._lock:
+                self._reset()
+            return len(old_segments), len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refresh()
+            segments = sorted({segment for segment, _ in self._entries.values()})
+        size = sum(
+            os.path.getsize(os.path.join(self.directory, name))
+            for name in os.listdir(self.directory) if name.endswith('.npy')
+        )
+        return {
+            "namespace": self.namespace,
+            "embeddings": len(self._entries),
+            "segments": len(segments),
+            "bytes": size
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or compact the embedding store")
+    parser.add_argument('command', choices=['stats', 'compact'])
+    parser.add_argument('--dir', default=EMBEDDING_STORE_DIR, help="Store directory")
+    parser.add_argument('--namespace', default=EMBEDDING_NAMESPACE, help="Model namespace")
+    args = parser.parse_args()
+
+    store = EmbeddingStore(args.dir, args.namespace)
+    if args.command == 'compact':
+        before, kept = store.compact()
+        print(f"🗜️  Compacted {before} segment(s) into one holding {kept} embeddings")
+    print(f"📦 {store.stats()}")
@@ -1,11 +1,33 @@
+import argparse
 import csv
 import json
-from sentence_transformers import SentenceTransformer, util
+import time
 
-# Load the AI model
-print("🤖 Loading AI model...")
-model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-print("✅ Model loaded!\n")
+import numpy as np
+
+from config import (
+    MODEL_NAME,
+    MODEL_DIR,
+    MODEL_OFFLINE,
+    EMBEDDING_BACKEND,
+    EMBEDDING_NAMESPACE,
+    ONNX_MODEL_DIR,
+    EMBEDDING_STORE_DIR
+)
+from embedding_store import EmbeddingStore
+from model_manager import load_encoder
+
+# The AI model, loaded on first use with the configured backend (EMBEDDING_BACKEND)
+model = None
+
+
+def get_model():
+    global model
+    if model is None:
+        print(f"🤖 Loading AI model ({EMBEDDING_BACKEND} backend)...")
+        model = load_encoder(EMBEDDING_BACKEND, MODEL_NAME, MODEL_DIR, ONNX_MODEL_DIR, MODEL_OFFLINE)
+        print("✅ Model loaded!\n")
+    return model
 
 def create_synthetic_resume(candidate):
     """Create a resume text from candidate data"""
@@ -43,41 +65,45 @@ def calculate_ai_score(resume_text, job_description, experience_years, education
     - Education bonus (15% weight)
     """
     # 1. Semantic similarity (base score)
-    resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-    job_embedding = model.encode(job_description, convert_to_tensor=True)
-    similarity = util.cos_sim(resume_embedding, job_embedding)
-    semantic_score = float(similarity.item()) * 100
-    
-    # 2. Experience bonus
+    embeddings = get_model().encode(
+        [resume_text, job_description],
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+    semantic_score = float(np.dot(embeddings[0], embeddings[1])) * 100
+
+    return combine_scores(semantic_score, experience_bonus(experience_years), education_bonus(education))
+
+def experience_bonus(experience_years):
     try:
         exp = int(experience_years)
         if exp >= 10:
-            exp_bonus = 25
+            return 25
         elif exp >= 7:
-            exp_bonus = 20
+            return 20
         elif exp >= 5:
-            exp_bonus = 15
+            return 15
         elif exp >= 3:
-            exp_bonus = 10
+            return 10
         else:
-            exp_bonus = 5
+            return 5
     except:
-        exp_bonus = 5
-    
-    # 3. Education bonus
+        return 5
+
+def education_bonus(education):
     edu_lower = education.lower()
     if 'phd' in edu_lower or 'ph.d' in edu_lower:
-        edu_bonus = 15
+        return 15
     elif 'master' in edu_lower or 'm.sc' in edu_lower or 'm.tech' in edu_lower or 'mba' in edu_lower:
-        edu_bonus = 12
+        return 12
     elif 'bachelor' in edu_lower or 'b.sc' in edu_lower or 'b.tech' in edu_lower:
-        edu_bonus = 10
+        return 10
     else:
-        edu_bonus = 5
-    
-    # Weighted combination
+        return 5
+
+def combine_scores(semantic_score, exp_bonus, edu_bonus):
+    """Weighted combination"""
     final_score = (semantic_score * 0.60) + (exp_bonus * 1.0) + (edu_bonus * 1.0)
-    
     return round(final_score, 2)
 
 def ai_decision(score):
@@ -88,154 +114,192 @@ def ai_decision(score):
         return "Reject"
 
 
-def evaluate_system():
-    """Test the AI on all 1000 resumes"""
-    csv_file = 'data/AI_Resume_Screening.csv'
-    
-    results = []
-    correct_predictions = 0
-    total_cases = 0
-    
-    # Statistics
-    tp = 0  # True Positive (correctly predicted Hire)
-    tn = 0  # True Negative (correctly predicted Reject)
-    fp = 0  # False Positive (predicted Hire, was Reject)
-    fn = 0  # False Negative (predicted Reject, was Hire)
-    
-    print("📊 Testing AI on 1,000 resumes...\n")
-    print("=" * 70)
-    
+# ==================== VECTORIZED EVALUATION ====================
+
+def load_candidates(csv_file):
+    """Candidates and the recruiter decisions (hidden from the AI) from the Kaggle CSV"""
+    candidates = []
+    hr_decisions = []
     with open(csv_file, 'r', encoding='utf-8') as file:
-        csv_reader = csv.DictReader(file)
-        
-        for i, row in enumerate(csv_reader, 1):
-            candidate = {
+        for row in csv.DictReader(file):
+            candidates.append({
                 'name': row.get('Name', ''),
                 'skills': row.get('Skills', ''),
                 'experience': row.get('Experience (Years)', '0'),
                 'education': row.get('Education', ''),
                 'certifications': row.get('Certifications', ''),
                 'job_role': row.get('Job Role', '')
-            }
-            
-            resume_text = create_synthetic_resume(candidate)
-            job_description = create_job_description(
-                candidate['job_role'], 
-                candidate['skills']
-            )
-            
-            # AI makes its prediction (with enhanced scoring)
-            ai_score = calculate_ai_score(
-                resume_text, 
-                job_description,
-                candidate['experience'],
-                candidate['education']
-            )
-            ai_pred = ai_decision(ai_score)
-            
-            # Get actual HR decision
-            actual_hr_decision = row.get('Recruiter Decision', 'Unknown')
-            
-            # For binary classification (Hire vs Not Hire)
-            ai_hire = (ai_pred == "Hire")
-            hr_hire = (actual_hr_decision == "Hire")
-            
-            # Update confusion matrix
-            if ai_hire and hr_hire:
-                tp += 1
-                is_correct = True
-            elif not ai_hire and not hr_hire:
-                tn += 1
-                is_correct = True
-            elif ai_hire and not hr_hire:
-                fp += 1
-                is_correct = False
-            else:  # not ai_hire and hr_hire
-                fn += 1
-                is_correct = False
-            
-            if is_correct:
-                correct_predictions += 1
-            
-            total_cases += 1
-            
-            results.append({
-                'candidate': candidate['name'],
-                'job_role': candidate['job_role'],
-                'experience': candidate['experience'],
-                'education': candidate['education'],
-                'ai_score': ai_score,
-                'ai_decision': ai_pred,
-                'hr_decision': actual_hr_decision,
-                'correct': is_correct
             })
-            
-            if i % 100 == 0:
-                current_accuracy = (correct_predictions / total_cases) * 100
-                print(f"✓ Processed {i}/1000 resumes... (Accuracy: {current_accuracy:.1f}%)")
-    
-    print("=" * 70)
-    print("\n🎉 Testing Complete!\n")
-    
-    # Calculate metrics
-    accuracy = (correct_predictions / total_cases) * 100
+            hr_decisions.append(row.get('Recruiter Decision', 'Unknown'))
+    return candidates, hr_decisions
+
+def _years(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+def experience_bonuses(experience_years):
+    """experience_bonus() for a whole column (unparseable values get the minimum bonus)"""
+    exp = np.array([_years(value) for value in experience_years])
+    return np.select([exp >= 10, exp >= 7, exp >= 5, exp >= 3], [25, 20, 15, 10], default=5)
+
+def education_bonuses(educations):
+    """education_bonus() for a whole column"""
+    edu = np.char.lower(np.array(educations, dtype=str))
+
+    def contains(*needles):
+        return np.logical_or.reduce([np.char.find(edu, needle) >= 0 for needle in needles])
+
+    return np.select(
+        [contains('phd', 'ph.d'), contains('master', 'm.sc', 'm.tech', 'mba'), contains('bachelor', 'b.sc', 'b.tech')],
+        [15, 12, 10],
+        default=5
+    )
+
+def semantic_similarities(resumes, job_descriptions, batch_size=256, store=None):
+    """
+    Cosine similarity x 100 of every (resume, JD) pair. Identical JD texts are
+    encoded once, and everything goes through the model in large batches.
+    With an EmbeddingStore, only texts it does not hold yet are encoded
+    """
+    unique_jds, jd_index = np.unique(np.array(job_descriptions, dtype=object), return_inverse=True)
+
+    def encode(texts):
+        return get_model().encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+
+    if store is not None:
+        resume_embeddings = store.encode(resumes, encode)
+        jd_embeddings = store.encode(list(unique_jds), encode)
+    else:
+        resume_embeddings = encode(resumes)
+        jd_embeddings = encode(list(unique_jds))
+    return np.einsum('ij,ij->i', resume_embeddings, jd_embeddings[jd_index]) * 100, len(unique_jds)
+
+def confusion_matrix(ai_hire, hr_hire):
+    return {
+        'true_positives': int(np.sum(ai_hire & hr_hire)),
+        'true_negatives': int(np.sum(~ai_hire & ~hr_hire)),
+        'false_positives': int(np.sum(ai_hire & ~hr_hire)),
+        'false_negatives': int(np.sum(~ai_hire & hr_hire))
+    }
+
+def classification_metrics(matrix):
+    """Accuracy, precision, recall and F1 (percentages) from a confusion_matrix()"""
+    tp, tn = matrix['true_positives'], matrix['true_negatives']
+    fp, fn = matrix['false_positives'], matrix['false_negatives']
+    total_cases = tp + tn + fp + fn
+    accuracy = ((tp + tn) / total_cases) * 100 if total_cases else 0
     precision = (tp / (tp + fp)) * 100 if (tp + fp) > 0 else 0
     recall = (tp / (tp + fn)) * 100 if (tp + fn) > 0 else 0
     f1_score = (2 * precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
-    
+    return {'accuracy': accuracy, 'precision': precision, 'recall': recall, 'f1_score': f1_score}
+
+
+def evaluate_system(csv_file='data/AI_Resume_Screening.csv', output='ai_evaluation_results.json',
+                    batch_size=256, samples=10, store_dir=EMBEDDING_STORE_DIR):
+    """Test the AI on every resume of the dataset in one vectorized pass"""
+    candidates, hr_decisions = load_candidates(csv_file)
+    total_cases = len(candidates)
+    started = time.perf_counter()
+
+    print(f"📊 Testing AI on {total_cases:,} resumes...\n")
+    print("=" * 70)
+
+    # Build every resume and JD up front, then score them all at once
+    resumes = [create_synthetic_resume(c) for c in candidates]
+    job_descriptions = [create_job_description(c['job_role'], c['skills']) for c in candidates]
+    store = EmbeddingStore(store_dir, EMBEDDING_NAMESPACE) if store_dir else None
+    semantic, unique_jds = semantic_similarities(resumes, job_descriptions, batch_size, store)
+    print(f"✓ Encoded {total_cases} resumes and {unique_jds} distinct job descriptions "
+          f"({time.perf_counter() - started:.1f}s)")
+
+    exp_bonus = experience_bonuses([c['experience'] for c in candidates])
+    edu_bonus = education_bonuses([c['education'] for c in candidates])
+    ai_scores = np.round((semantic * 0.60) + (exp_bonus * 1.0) + (edu_bonus * 1.0), 2)
+
+    # Binary decision, as ai_decision(): Hire at 55 and above
+    ai_hire = ai_scores >= 55
+    hr_hire = np.array(hr_decisions) == "Hire"
+    correct = ai_hire == hr_hire
+
+    matrix = confusion_matrix(ai_hire, hr_hire)
+    metrics = classification_metrics(matrix)
+    correct_predictions = int(correct.sum())
+
+    results = [
+        {
+            'candidate': candidate['name'],
+            'job_role': candidate['job_role'],
+            'experience': candidate['experience'],
+            'education': candidate['education'],
+            'ai_score': float(score),
+            'ai_decision': "Hire" if hire else "Reject",
+            'hr_decision': hr_decision,
+            'correct': bool(is_correct)
+        }
+        for candidate, score, hire, hr_decision, is_correct
+        in zip(candidates, ai_scores, ai_hire, hr_decisions, correct)
+    ]
+
+    print("=" * 70)
+    print(f"\n🎉 Testing Complete! ({time.perf_counter() - started:.1f}s)\n")
+
     print("=" * 70)
     print("📊 FINAL RESULTS")
     print("=" * 70)
     print(f"Total Resumes Tested:     {total_cases}")
     print(f"Correct Predictions:      {correct_predictions}")
     print(f"Incorrect Predictions:    {total_cases - correct_predictions}")
-    print(f"\n🎯 ACCURACY:  {accuracy:.2f}%")
-    print(f"📈 PRECISION: {precision:.2f}%")
-    print(f"📊 RECALL:    {recall:.2f}%")
-    print(f"⭐ F1-SCORE:  {f1_score:.2f}%")
+    print(f"\n🎯 ACCURACY:  {metrics['accuracy']:.2f}%")
+    print(f"📈 PRECISION: {metrics['precision']:.2f}%")
+    print(f"📊 RECALL:    {metrics['recall']:.2f}%")
+    print(f"⭐ F1-SCORE:  {metrics['f1_score']:.2f}%")
     print("=" * 70)
-    
+
     print("\n📝 Confusion Matrix:")
-    print(f"True Positives (Correctly hired):    {tp}")
-    print(f"True Negatives (Correctly rejected): {tn}")
-    print(f"False Positives (Wrongly hired):     {fp}")
-    print(f"False Negatives (Wrongly rejected):  {fn}")
-    
+    print(f"True Positives (Correctly hired):    {matrix['true_positives']}")
+    print(f"True Negatives (Correctly rejected): {matrix['true_negatives']}")
+    print(f"False Positives (Wrongly hired):     {matrix['false_positives']}")
+    print(f"False Negatives (Wrongly rejected):  {matrix['false_negatives']}")
+
     # Show examples
-    print("\n📝 Sample Results (First 10):")
-    print("-" * 70)
-    for i, result in enumerate(results[:10], 1):
-        status = "✅" if result['correct'] else "❌"
-        print(f"{i}. {result['candidate']} - {result['job_role']}")
-        print(f"   Exp: {result['experience']}y | Edu: {result['education']}")
-        print(f"   AI Score: {result['ai_score']}% | AI: {result['ai_decision']} | HR: {result['hr_decision']} {status}")
-        print()
-    
+    if samples:
+        print(f"\n📝 Sample Results (First {samples}):")
+        print("-" * 70)
+        for i, result in enumerate(results[:samples], 1):
+            status = "✅" if result['correct'] else "❌"
+            print(f"{i}. {result['candidate']} - {result['job_role']}")
+            print(f"   Exp: {result['experience']}y | Edu: {result['education']}")
+            print(f"   AI Score: {result['ai_score']}% | AI: {result['ai_decision']} | HR: {result['hr_decision']} {status}")
+            print()
+
     # Save results
-    with open('ai_evaluation_results.json', 'w') as f:
+    with open(output, 'w') as f:
         json.dump({
             'summary': {
                 'total_cases': total_cases,
                 'correct_predictions': correct_predictions,
-                'accuracy': accuracy,
-                'precision': precision,
-                'recall': recall,
-                'f1_score': f1_score
-            },
-            'confusion_matrix': {
-                'true_positives': tp,
-                'true_negatives': tn,
-                'false_positives': fp,
-                'false_negatives': fn
+                **metrics
             },
+            'confusion_matrix': matrix,
             'detailed_results': results
         }, f, indent=2)
-    
-    print("\n💾 Detailed results saved to: ai_evaluation_results.json")
-    
-    return accuracy, results
+
+    print(f"\n💾 Detailed results saved to: {output}")
+
+    return metrics['accuracy'], results
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the AI screening scores against recruiter decisions")
+    parser.add_argument('--csv', default='data/AI_Resume_Screening.csv', help="Kaggle evaluation dataset")
+    parser.add_argument('--output', default='ai_evaluation_results.json', help="Where to write the results JSON")
+    parser.add_argument('--batch-size', type=int, default=256, help="Texts per model forward pass")
+    parser.add_argument('--samples', type=int, default=10, help="Sample results to print (0 for none)")
+    parser.add_argument('--store-dir', default=EMBEDDING_STORE_DIR,
+                        help="Embedding store reused across runs ('' to always re-encode)")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("🔬 AI RESUME SCREENING SYSTEM - IMPROVED EVALUATION")
     print("=" * 70)
@@ -243,10 +307,7 @@ if __name__ == "__main__":
     print("✓ Multi-factor scoring (semantic + experience + education)")
     print("✓ Adjusted thresholds for realistic predictions")
     print("✓ Detailed metrics (Precision, Recall, F1-Score)\n")
-    
-    input("Press Enter to start the evaluation...")
-    print()
-    
-    accuracy, results = evaluate_system()
-    
+
+    accuracy, results = evaluate_system(args.csv, args.output, args.batch_size, args.samples, args.store_dir)
+
     print("\n🎓 This is my research data!")
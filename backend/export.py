@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List
+
+
+# Rows serialized per chunk handed to the streaming response
+ROWS_PER_CHUNK = 500
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def ndjson_chunks(rows: Iterable[Dict]) -> Iterator[str]:
+    """One JSON object per line, yielded in chunks of ROWS_PER_CHUNK rows"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, default=_json_default) + "\n")
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def csv_chunks(rows: Iterable[Dict], columns: List[str]) -> Iterator[str]:
+    """CSV with a header line, yielded in chunks of ROWS_PER_CHUNK rows"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    pending = 0
+    for row in rows:
+        writer.writerow({
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row.items()
+        })
+        pending += 1
+        if pending >= ROWS_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
@@ -0,0 +1,81 @@
+"""
+Export the sentence-transformers model to ONNX and quantize it to int8
+for the onnx embedding backend (EMBEDDING_BACKEND=onnx).
+
+Usage: python export_onnx.py [--output models/all-MiniLM-L6-v2-onnx]
+"""
+import argparse
+import json
+import os
+
+from config import MODEL_NAME, MODEL_DIR, ONNX_MODEL_DIR
+from onnx_encoder import ENCODER_CONFIG_FILE
+
+
+def export(output_dir: str):
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, 'model_fp32.onnx')
+    int8_path = os.path.join(output_dir, 'model_int8.onnx')
+
+    print(f"🤖 Loading {MODEL_DIR or MODEL_NAME}...")
+    model = SentenceTransformer(MODEL_DIR or MODEL_NAME, device='cpu')
+    tokenizer = model.tokenizer
+
+    class TokenEmbeddings(torch.nn.Module):
+        """The transformer without pooling: token embeddings only"""
+
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.transformer(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids
+            )[0]
+
+    sample = tokenizer(["Resume screening export sample"], return_tensors='pt')
+    print("📦 Exporting to ONNX...")
+    torch.onnx.export(
+        TokenEmbeddings(model[0].auto_model).eval(),
+        (sample['input_ids'], sample['attention_mask'], sample['token_type_ids']),
+        fp32_path,
+        input_names=['input_ids', 'attention_mask', 'token_type_ids'],
+        output_names=['token_embeddings'],
+        dynamic_axes={
+            'input_ids': {0: 'batch', 1: 'sequence'},
+            'attention_mask': {0: 'batch', 1: 'sequence'},
+            'token_type_ids': {0: 'batch', 1: 'sequence'},
+            'token_embeddings': {0: 'batch', 1: 'sequence'}
+        },
+        opset_version=14
+    )
+
+    print("🗜️  Quantizing weights to int8...")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, ENCODER_CONFIG_FILE), 'w') as f:
+        json.dump({
+            'model_name': MODEL_NAME,
+            'model_file': 'model_int8.onnx',
+            'max_seq_length': model.max_seq_length,
+            'pad_token': tokenizer.pad_token,
+            'pad_token_id': tokenizer.pad_token_id
+        }, f, indent=2)
+
+    fp32_mb = os.path.getsize(fp32_path) / 1e6
+    int8_mb = os.path.getsize(int8_path) / 1e6
+    print(f"✅ Saved to {output_dir} (fp32 {fp32_mb:.1f} MB -> int8 {int8_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export and int8-quantize the embedding model for onnxruntime")
+    parser.add_argument('--output', default=ONNX_MODEL_DIR, help="Output directory")
+    args = parser.parse_args()
+    export(args.output)
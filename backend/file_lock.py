@@ -0,0 +1,34 @@
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to an in-process lock only
+    fcntl = None
+
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+@contextmanager
+def exclusive_lock(lock_path: str):
+    """
+    Hold an exclusive lock on lock_path for the duration of the block.
+    Serializes writers across threads and, where fcntl is available, across
+    processes (e.g. several uvicorn workers appending to the same files).
+    """
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(os.path.abspath(lock_path), threading.Lock())
+
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,67 @@
+"""
+Production server: gunicorn master with uvicorn workers.
+
+Usage: cd backend && gunicorn -c gunicorn.conf.py main:app
+
+The app is imported once in the master (preload_app) and, with PRELOAD_MODEL,
+the torch model is loaded there too before any worker exists. Workers are
+forked from that master, so the model weights and the imported libraries are
+shared copy-on-write instead of loaded once per worker as with
+`uvicorn main:app --workers N`. Each worker then sets its own intra-op thread
+count and runs the warm-up encode before accepting requests.
+"""
+import gc
+import os
+
+from config import SERVER_HOST, SERVER_PORT, SERVER_WORKERS, TORCH_THREADS, PRELOAD_MODEL
+
+
+bind = f"{SERVER_HOST}:{SERVER_PORT}"
+workers = SERVER_WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# A worker's first boot includes the warm-up encode
+timeout = 120
+
+
+def worker_threads() -> int:
+    """Intra-op threads per worker: TORCH_THREADS, else the cores split between workers"""
+    return TORCH_THREADS or max(1, (os.cpu_count() or 1) // SERVER_WORKERS)
+
+
+def when_ready(server):
+    """Runs in the master after the app is imported, before the first fork"""
+    import main
+
+    manager = main.model_manager
+    if PRELOAD_MODEL and manager.backend == 'torch':
+        # One thread and no warm-up: no OpenMP thread pool exists yet when the
+        # workers fork (a pool inherited across fork can deadlock). The onnx
+        # backend is small and its session threads cannot be changed after
+        # creation, so each worker loads it itself
+        manager.threads = 1
+        try:
+            manager.load(warm_up=False)
+        except Exception as e:
+            server.log.warning(f"Could not preload AI model, workers will load their own: {e}")
+
+    # The log writer thread does not survive fork; workers start their own
+    main.stop_logging()
+    # Move everything allocated so far out of the collector's reach, so garbage
+    # collection in the workers does not write to (and un-share) those pages
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Runs in every worker right after it is forked"""
+    import main
+    from logging_config import setup_logging
+    from workers import configure_torch_threads
+
+    setup_logging()
+    threads = worker_threads()
+    main.model_manager.threads = threads
+    if main.model_manager.is_ready():
+        configure_torch_threads(threads)
+        main.model_manager.warm_up()
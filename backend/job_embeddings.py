@@ -0,0 +1,117 @@
+"""
+Precomputed embeddings of the stored job descriptions.
+
+Vectors live in the job_embeddings table as float32 bytes, keyed by job id and
+model (EMBEDDING_NAMESPACE), next to the hash of the text they were computed
+from. A vector whose text changed since, or that belongs to another model, is
+simply not used: it is recomputed and replaced on the next sync.
+
+Usage: python job_embeddings.py backfill [--batch-size 256] [--prune]
+"""
+import argparse
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from cache import hash_text, normalize_text
+from config import (
+    MODEL_NAME,
+    MODEL_DIR,
+    MODEL_OFFLINE,
+    EMBEDDING_BACKEND,
+    EMBEDDING_NAMESPACE,
+    ONNX_MODEL_DIR,
+    EMBEDDING_BATCH_SIZE
+)
+from database import get_job_descriptions, get_job_embeddings, save_job_embeddings, delete_job_embeddings
+
+
+def job_text(job: Dict) -> str:
+    """Text a job description is encoded from (the title when it has no description)"""
+    return job["description"] or job["title"]
+
+
+def load_stored(jobs: List[Dict], namespace: str = EMBEDDING_NAMESPACE) -> List[Optional[np.ndarray]]:
+    """Stored vector of every job, None where it is missing or computed from an older text"""
+    stored = get_job_embeddings([job["id"] for job in jobs], namespace)
+    embeddings = []
+    for job in jobs:
+        text_hash, blob = stored.get(job["id"], (None, None))
+        if text_hash != hash_text(job_text(job)):
+            embeddings.append(None)
+        else:
+            embeddings.append(np.frombuffer(blob, dtype=np.float32))
+    return embeddings
+
+
+def sync_job_embeddings(jobs: List[Dict], encode: Callable[[List[str]], np.ndarray],
+                        namespace: str = EMBEDDING_NAMESPACE) -> np.ndarray:
+    """
+    Normalized (n, dim) embeddings of jobs: the stored vectors, with the missing
+    or stale ones encoded in one batch (encode takes texts) and written back
+    """
+    embeddings = load_stored(jobs, namespace)
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        fresh = np.asarray(encode([job_text(jobs[i]) for i in missing]), dtype=np.float32)
+        save_job_embeddings([
+            (jobs[i]["id"], namespace, hash_text(job_text(jobs[i])), embedding.tobytes())
+            for i, embedding in zip(missing, fresh)
+        ])
+        for i, embedding in zip(missing, fresh):
+            embeddings[i] = embedding
+    return np.vstack(embeddings)
+
+
+def backfill(encode: Callable[[List[str]], np.ndarray], batch_size: int = 256,
+             namespace: str = EMBEDDING_NAMESPACE) -> Dict[str, int]:
+    """Walk every job description in id order and store the missing or stale vectors"""
+    counts = {'jobs': 0, 'encoded': 0}
+
+    def counted_encode(texts):
+        counts['encoded'] += len(texts)
+        return encode(texts)
+
+    after_id = 0
+    while True:
+        jobs = get_job_descriptions(after_id=after_id, limit=batch_size)
+        if not jobs:
+            return counts
+        sync_job_embeddings(jobs, counted_encode, namespace)
+        counts['jobs'] += len(jobs)
+        after_id = jobs[-1]["id"]
+        print(f"⏳ {counts['jobs']:,} job descriptions checked, {counts['encoded']:,} encoded")
+
+
+def model_encoder() -> Callable[[List[str]], np.ndarray]:
+    """encode() over the configured model, for scripts running outside the API"""
+    from model_manager import load_encoder
+
+    model = load_encoder(EMBEDDING_BACKEND, MODEL_NAME, MODEL_DIR, ONNX_MODEL_DIR, MODEL_OFFLINE)
+    return lambda texts: model.encode(
+        [normalize_text(text) for text in texts],
+        batch_size=EMBEDDING_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+
+
+def run_backfill(batch_size: int = 256, prune: bool = False):
+    print(f"🤖 Loading AI model ({EMBEDDING_NAMESPACE})...")
+    encode = model_encoder()
+    started = time.perf_counter()
+    counts = backfill(encode, batch_size)
+    print(f"✅ {counts['encoded']:,} of {counts['jobs']:,} job description embeddings computed "
+          f"in {time.perf_counter() - started:.1f}s")
+    if prune:
+        print(f"🧹 Removed {delete_job_embeddings(EMBEDDING_NAMESPACE):,} embeddings of other models")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute job description embeddings")
+    parser.add_argument('command', choices=['backfill'])
+    parser.add_argument('--batch-size', type=int, default=256, help="Job descriptions per encode batch")
+    parser.add_argument('--prune', action='store_true', help="Delete the embeddings of other models afterwards")
+    args = parser.parse_args()
+    run_backfill(args.batch_size, args.prune)
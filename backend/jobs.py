@@ -0,0 +1,237 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import UploadFile
+
+from database import (
+    run_db,
+    create_screening_job,
+    add_screening_job_files,
+    record_screening_job_results,
+    get_screening_job,
+    get_screening_job_files,
+    renew_job_leases,
+    claim_unfinished_job_files
+)
+from metrics import ERRORS
+
+
+logger = logging.getLogger(__name__)
+
+
+# Screens a batch of (file_name, pdf_bytes) against a job description (main.screen_files)
+ScreenFiles = Callable[[List[Tuple[str, bytes]], str], Awaitable[List[dict]]]
+
+
+class ScreeningJobQueue:
+    """
+    Background screening of arbitrarily large resume batches.
+
+    Submitted files are spooled to disk and registered in the database, then
+    split into chunks that a fixed number of worker tasks push through the
+    normal screening pipeline (so each chunk still gets one batched model call).
+    Progress and per-file results are written back after every chunk.
+
+    Several server processes can share the database: each submission and its
+    files are leased to the process that accepted them, which keeps renewing the
+    lease. On startup and every lease_seconds / 3, every process takes over the
+    queued files (and fails the submissions) whose lease has expired, so the work
+    of a process that died is redone once, never by two processes at a time.
+    """
+
+    def __init__(self, screen_files: ScreenFiles, workers: int, chunk_size: int, spool_dir: str,
+                 lease_seconds: int = 300):
+        self.screen_files = screen_files
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.spool_dir = spool_dir
+        self.lease_seconds = lease_seconds
+        self.owner: Optional[str] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # File row ids queued or being screened in this process
+        self._queued_ids = set()
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self):
+        """Start the worker tasks, take over abandoned work and keep this process's leases alive"""
+        # Set here rather than at import: under a forking server each worker gets its own
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue = asyncio.Queue()
+        self._queued_ids = set()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        await self._claim_abandoned()
+        self._tasks.append(asyncio.create_task(self._maintain_leases()))
+
+    def _lease_expiry(self, now: datetime) -> datetime:
+        return now + timedelta(seconds=self.lease_seconds)
+
+    async def _claim_abandoned(self):
+        """Queue the files this process holds or just took over that are not queued yet"""
+        now = _utcnow()
+        claimed = await run_db(claim_unfinished_job_files, self.owner, now, self._lease_expiry(now))
+        jobs: Dict[int, List[Dict]] = {}
+        for file_row in claimed:
+            if file_row["id"] not in self._queued_ids:
+                jobs.setdefault(file_row["screening_job_id"], []).append(file_row)
+        for screening_job_id, file_rows in jobs.items():
+            self._enqueue(screening_job_id, file_rows[0]["job_description"], file_rows)
+        if jobs:
+            logger.info("Resumed screening jobs", extra={
+                "jobs": len(jobs), "queued_files": sum(len(file_rows) for file_rows in jobs.values())
+            })
+
+    async def _maintain_leases(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await run_db(renew_job_leases, self.owner, self._lease_expiry(_utcnow()))
+                await self._claim_abandoned()
+            except Exception:
+                logger.exception("Could not renew screening job leases")
+                ERRORS.inc(stage="job_lease")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ==================== SUBMISSION ====================
+
+    async def submit(self, files: List[UploadFile], job_description: str) -> Dict:
+        """Spool the uploads, register the job and queue it; returns immediately"""
+        screening_job_id = await run_db(
+            create_screening_job, job_description, len(files), self.owner, self._lease_expiry(_utcnow())
+        )
+        job_dir = os.path.join(self.spool_dir, str(screening_job_id))
+        os.makedirs(job_dir, exist_ok=True)
+
+        spooled = []
+        for position, uploaded_file in enumerate(files):
+            spool_path = os.path.join(job_dir, f"{position}.pdf")
+            await _run_blocking(_copy_upload, uploaded_file, spool_path)
+            spooled.append((position, uploaded_file.filename, spool_path))
+
+        file_ids = await run_db(
+            add_screening_job_files, screening_job_id, spooled, self.owner, self._lease_expiry(_utcnow())
+        )
+        self._enqueue(screening_job_id, job_description, [
+            {"id": file_id, "position": position, "file_name": file_name, "spool_path": spool_path}
+            for file_id, (position, file_name, spool_path) in zip(file_ids, spooled)
+        ])
+
+        logger.info("Screening job queued", extra={"screening_job_id": screening_job_id, "files": len(files)})
+        return {"job_id": screening_job_id, "status": "queued", "total_files": len(files)}
+
+    def _enqueue(self, screening_job_id: int, job_description: str, file_rows: List[Dict]):
+        self._queued_ids.update(file_row["id"] for file_row in file_rows)
+        for start in range(0, len(file_rows), self.chunk_size):
+            self._queue.put_nowait((screening_job_id, job_description, file_rows[start:start + self.chunk_size]))
+
+    # ==================== PROCESSING ====================
+
+    async def _worker(self):
+        while True:
+            screening_job_id, job_description, file_rows = await self._queue.get()
+            try:
+                await self._process_chunk(screening_job_id, job_description, file_rows)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Files stay queued (and leased to this process) in the database and
+                # are picked up again by the next lease round
+                logger.exception("Screening job chunk failed", extra={"screening_job_id": screening_job_id})
+                ERRORS.inc(stage="job_chunk")
+            finally:
+                self._queued_ids.difference_update(file_row["id"] for file_row in file_rows)
+                self._queue.task_done()
+
+    async def _process_chunk(self, screening_job_id: int, job_description: str, file_rows: List[Dict]):
+        uploads = []
+        for file_row in file_rows:
+            try:
+                file_content = await _run_blocking(_read_file, file_row["spool_path"])
+            except OSError:
+                # Unreadable spool file: screen_files reports it as a PDF error
+                file_content = b""
+            uploads.append((file_row["file_name"], file_content))
+
+        results = await self.screen_files(uploads, job_description)
+
+        updates = [
+            (file_row["id"], "error" if result.get("recommendation") == "ERROR" else "done", json.dumps(result))
+            for file_row, result in zip(file_rows, results)
+        ]
+        await run_db(record_screening_job_results, screening_job_id, updates)
+
+        for file_row in file_rows:
+            _remove_quietly(file_row["spool_path"])
+        job = await run_db(get_screening_job, screening_job_id)
+        if job and job["status"] == "completed":
+            shutil.rmtree(os.path.join(self.spool_dir, str(screening_job_id)), ignore_errors=True)
+            logger.info("Screening job completed", extra={
+                "screening_job_id": screening_job_id, "failed_files": job['failed_files']
+            })
+
+    # ==================== STATUS ====================
+
+    async def status(self, screening_job_id: int, include_results: bool = True) -> Optional[Dict]:
+        """Progress of a job plus the results of every file finished so far"""
+        job = await run_db(get_screening_job, screening_job_id)
+        if job is None:
+            return None
+
+        status = {
+            "job_id": job["id"],
+            "status": job["status"],
+            "total_files": job["total_files"],
+            "processed_files": job["processed_files"],
+            "failed_files": job["failed_files"],
+            "progress": round(job["processed_files"] / job["total_files"], 4) if job["total_files"] else 1.0,
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"]
+        }
+        if include_results:
+            file_rows = await run_db(get_screening_job_files, screening_job_id)
+            status["results"] = [
+                {"position": file_row["position"], **json.loads(file_row["result"])}
+                for file_row in file_rows if file_row["result"] is not None
+            ]
+        return status
+
+
+def _utcnow() -> datetime:
+    """Naive UTC time for lease columns, comparable whatever the database's time zone"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def _run_blocking(function, *args):
+    """Spool file I/O goes to the default executor, not the database pool"""
+    return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+def _copy_upload(uploaded_file: UploadFile, spool_path: str):
+    uploaded_file.file.seek(0)
+    with open(spool_path, 'wb') as f:
+        shutil.copyfileobj(uploaded_file.file, f)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,46 +1,37 @@
+"""
+Load the job roles of the Kaggle dataset into the job_descriptions table.
+
+The CSV is streamed row by row; the first row of each job role defines its
+description. Roles are written in batches of upserts against a unique index
+on title, so the loader can be re-run (or run twice at once) without creating
+duplicates, and a reload only writes roles that are new or whose text changed.
+Memory holds the titles seen so far plus one batch, whatever the CSV size.
+Afterwards the embeddings of new or changed roles are precomputed (see job_embeddings.py).
+
+Usage: python load_dataset.py [--csv data/AI_Resume_Screening.csv] [--batch-size 500] [--skip-embeddings]
+"""
+import argparse
 import csv
-import mysql.connector
-from mysql.connector import Error
+import os
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-def get_db_connection():
-    """Create database connection"""
-    try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            database='resume_screening_system',
-            user='root',
-            password='root'
-        )
-        return connection
-    except Error as e:
-        print(f"❌ Error: {e}")
-        return None
-
-def load_csv_to_database():
-    """Load the Kaggle CSV into MySQL"""
-    connection = get_db_connection()
-    if not connection:
-        return
-    
-    cursor = connection.cursor()
-    
-    # Read CSV file
-    csv_file = 'data/AI_Resume_Screening.csv'
-    
-    print("📂 Reading CSV file...")
-    with open(csv_file, 'r', encoding='utf-8') as file:
-        csv_reader = csv.DictReader(file)
-        
-        inserted_count = 0
-        for row in csv_reader:
-            try:
-                job_title = row.get('Job Role', 'Unknown Position')
-                skills = row.get('Skills', '')
-                experience = row.get('Experience (Years)', '0')
-                education = row.get('Education', '')
-                
-                # Create job description text
-                job_description = f"""
+from database import (
+    get_storage,
+    ensure_job_title_index,
+    get_job_description_texts,
+    upsert_job_descriptions
+)
+
+
+# Rows between progress lines while no batch is being written
+PROGRESS_EVERY_ROWS = 100_000
+
+
+def build_job_description(job_title: str, skills: str, experience: str, education: str) -> str:
+    """Job description text for a role, from its first row in the CSV"""
+    return f"""
 We are looking for a {job_title} with the following qualifications:
 
 Required Skills: {skills}
@@ -48,36 +39,105 @@ Experience: {experience} years
 Education: {education} or equivalent
 
 Responsibilities include working with modern technologies and contributing to our team's success.
-                """.strip()
-                
-                # Check if this job already exists
-                cursor.execute("""
-                    SELECT id FROM job_descriptions 
-                    WHERE title = %s LIMIT 1
-                """, (job_title,))
-                
-                result = cursor.fetchone()
-                
-                if not result:
-                    # Insert new job description
-                    cursor.execute("""
-                        INSERT INTO job_descriptions (title, description, required_skills)
-                        VALUES (%s, %s, %s)
-                    """, (job_title, job_description, skills))
-                    inserted_count += 1
-                
-            except Error as e:
-                print(f"⚠️  Error inserting row: {e}")
-                continue
-        
-        connection.commit()
-        print(f"✅ Successfully inserted {inserted_count} job descriptions!")
-    
-    cursor.close()
-    connection.close()
-    print("✅ Database updated successfully!")
+    """.strip()
+
+
+def _read_lines(csv_file: str, progress: Dict[str, int]) -> Iterator[str]:
+    """Decoded lines of the file, counting the bytes read for progress reporting"""
+    with open(csv_file, 'rb') as f:
+        for number, line in enumerate(f):
+            progress['bytes'] += len(line)
+            yield line.decode('utf-8-sig' if number == 0 else 'utf-8')
+
+
+def iter_roles(csv_file: str, progress: Dict[str, int],
+               on_progress: Optional[Callable[[], None]] = None) -> Iterator[Tuple[str, str, str]]:
+    """(title, description, required_skills) for the first row of every job role"""
+    seen = set()
+    for row in csv.DictReader(_read_lines(csv_file, progress)):
+        progress['rows'] += 1
+        if on_progress and progress['rows'] % PROGRESS_EVERY_ROWS == 0:
+            on_progress()
+        job_title = row.get('Job Role') or 'Unknown Position'
+        if job_title in seen:
+            continue
+        seen.add(job_title)
+        skills = row.get('Skills', '')
+        yield job_title, build_job_description(
+            job_title, skills, row.get('Experience (Years)', '0'), row.get('Education', '')
+        ), skills
+
+
+def write_batch(batch: List[Tuple[str, str, str]], stats: Dict[str, int]):
+    """Upsert the roles of a batch that are new or differ from the stored text"""
+    stored = get_job_description_texts([title for title, _, _ in batch])
+    changed = []
+    for title, description, skills in batch:
+        current = stored.get(title)
+        if current == (description, skills):
+            stats['unchanged'] += 1
+            continue
+        stats['inserted' if current is None else 'updated'] += 1
+        changed.append((title, description, skills))
+    upsert_job_descriptions(changed)
+
+
+def load_csv_to_database(csv_file: str = 'data/AI_Resume_Screening.csv', batch_size: int = 500) -> Dict[str, int]:
+    """Stream the CSV into job_descriptions; returns row and role counts"""
+    storage = get_storage()
+    try:
+        ensure_job_title_index()
+    except storage.errors as e:
+        raise SystemExit(
+            f"❌ Could not create the unique index on job_descriptions.title "
+            f"(are there duplicate titles already?): {e}"
+        )
+
+    total_bytes = os.path.getsize(csv_file) or 1
+    progress = {'bytes': 0, 'rows': 0}
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    started = time.perf_counter()
+
+    def report():
+        print(f"⏳ {progress['bytes'] / total_bytes:>4.0%} | {progress['rows']:,} rows | "
+              f"{sum(stats.values()):,} roles ({stats['inserted']} new, {stats['updated']} updated, "
+              f"{stats['unchanged']} unchanged)")
+
+    print(f"📂 Reading {csv_file}...")
+    batch = []
+    for role in iter_roles(csv_file, progress, report):
+        batch.append(role)
+        if len(batch) >= batch_size:
+            write_batch(batch, stats)
+            batch = []
+    if batch:
+        write_batch(batch, stats)
+    report()
+
+    print(f"✅ Loaded {progress['rows']:,} rows in {time.perf_counter() - started:.1f}s: "
+          f"{stats['inserted']} job descriptions inserted, {stats['updated']} updated, "
+          f"{stats['unchanged']} already up to date")
+    return {'rows': progress['rows'], **stats}
+
 
 if __name__ == "__main__":
-    print("🚀 Loading Kaggle dataset into MySQL...")
-    load_csv_to_database()
-    print("🎉 Done!")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Load the Kaggle job roles into job_descriptions")
+    parser.add_argument('--csv', default='data/AI_Resume_Screening.csv', help="Dataset CSV")
+    parser.add_argument('--batch-size', type=int, default=500, help="Roles per upsert batch")
+    parser.add_argument('--skip-embeddings', action='store_true',
+                        help="Do not precompute job description embeddings (run job_embeddings.py backfill later)")
+    args = parser.parse_args()
+    if not os.path.exists(args.csv):
+        sys.exit(f"❌ {args.csv} not found")
+
+    print("🚀 Loading Kaggle dataset into the database...")
+    load_csv_to_database(args.csv, args.batch_size)
+    if not args.skip_embeddings:
+        from job_embeddings import run_backfill
+
+        try:
+            run_backfill()
+        except Exception as e:
+            print(f"⚠️  Could not precompute job description embeddings: {e}")
+            print("   Run `python job_embeddings.py backfill` once the model is available")
+    print("🎉 Done!")
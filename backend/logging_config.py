@@ -0,0 +1,84 @@
+"""
+Leveled, structured logging for the API that never blocks a request on stdout.
+
+Every module logs through logging.getLogger(__name__). setup_logging() puts a
+QueueHandler on the root logger, so a log call only enqueues the record; a
+QueueListener thread formats it and does the actual write. Fields passed as
+extra={...} become keys of the JSON line (or key=value pairs in text format).
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import LOG_LEVEL, LOG_FORMAT
+
+
+# Attributes every LogRecord has; anything else on a record came in through extra={...}
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in _STANDARD_ATTRIBUTES}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and the extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **_extra_fields(record)
+        }
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable line with the extra fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = " ".join(f"{key}={value}" for key, value in _extra_fields(record).items())
+        return f"{line} {fields}" if fields else line
+
+
+def setup_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT):
+    """Route the root logger through a queue to a stderr writer thread (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if log_format == 'json' else TextFormatter())
+
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    # QueueHandler.prepare() renders the message and any traceback before enqueueing
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level.upper())
+    # The multipart parser logs every form part at DEBUG; keep it out of per-resume debugging
+    logging.getLogger('multipart').setLevel(max(root.level, logging.INFO))
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush the queued records and stop the writer thread; later records are written directly"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        logging.getLogger().handlers = list(_listener.handlers)
+        _listener = None
@@ -1,20 +1,91 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional, List
-import PyPDF2
-import io
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from typing import Optional, List, Tuple
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import time
 from datetime import datetime
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+
+from config import (
+    MODEL_NAME,
+    MODEL_DIR,
+    MODEL_OFFLINE,
+    PDF_BACKEND,
+    PDF_MAX_PAGES,
+    PDF_MAX_CHARS,
+    EMBEDDING_BACKEND,
+    EMBEDDING_NAMESPACE,
+    ONNX_MODEL_DIR,
+    EMBEDDING_BATCH_SIZE,
+    RESUME_ENCODING,
+    CHUNK_OVERLAP,
+    CHUNK_AGGREGATION,
+    CHUNK_TOP_K,
+    CACHE_MAX_ENTRIES,
+    CACHE_DIR,
+    CANDIDATE_INDEX_DIR,
+    CANDIDATE_INDEX_DTYPE,
+    JOB_WORKERS,
+    JOB_CHUNK_SIZE,
+    JOB_SPOOL_DIR,
+    JOB_LEASE_SECONDS,
+    SKILLS_FILE,
+    SKILLS_CSV,
+    SCORING_CONFIG_FILE,
+    SERVER_HOST,
+    SERVER_PORT,
+    INFERENCE_BATCHING,
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_MAX_WAIT_MS
+)
+from batching import BatchingEncoder
+from cache import ContentCache, hash_bytes, hash_text, normalize_text
+from chunking import (
+    chunk_texts,
+    encode_bucketed,
+    aggregate_similarities,
+    aggregate_similarity_columns,
+    document_embedding
+)
+from candidate_index import CandidateIndex, RECOMMENDATIONS
+from export import ndjson_chunks, csv_chunks
+from pdf_extract import extract_pdf_text
+import workers
+from workers import run_extraction, run_inference
+from jobs import ScreeningJobQueue
+from skills import build_skill_matcher
+from calibrate import load_scoring_config
+from model_manager import ModelManager
+from job_embeddings import job_text, sync_job_embeddings
+import metrics
+from metrics import STAGE_SECONDS, SIMPLE_MATCH_FALLBACKS, ERRORS, RESUMES_SCREENED
+from logging_config import setup_logging, stop_logging
 
 
 # Import our database functions
 from database import (
-    save_screening_result, 
-    get_all_screenings,
-    get_job_description
+    Storage,
+    save_screening_results_async,
+    get_screening_async,
+    get_screenings_page_async,
+    get_screenings_since_async,
+    get_history_marker_async,
+    get_job_descriptions_async,
+    get_job_description_async,
+    iter_screenings
 )
 
 
+# Leveled, structured logging through a queue: a log call never waits on stdout
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Resume Screening System",
@@ -33,14 +104,60 @@ app.add_middleware(
 )
 
 
-# Load AI model at startup 
-print(" Loading AI model for semantic matching...")
-try:
-    model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-    print("✅ AI model loaded successfully!")
-except Exception as e:
-    print(f"⚠️  Warning: Could not load AI model: {e}")
-    model = None
+# AI model: loaded in the background at startup (see start_model_loading), so
+# importing this module stays cheap and never pulls in torch
+model_manager = ModelManager(
+    MODEL_NAME,
+    model_dir=MODEL_DIR,
+    offline=MODEL_OFFLINE,
+    warmup_batch_size=EMBEDDING_BATCH_SIZE,
+    backend=EMBEDDING_BACKEND,
+    onnx_model_dir=ONNX_MODEL_DIR
+)
+
+# Encode calls of concurrent requests share forward passes (see batching.py)
+batching_encoder = BatchingEncoder(
+    lambda: model_manager.model, INFERENCE_MAX_BATCH_SIZE, INFERENCE_MAX_WAIT_MS
+) if INFERENCE_BATCHING else None
+
+
+# Skill taxonomy compiled once into a single-pass matcher
+skill_matcher = build_skill_matcher(SKILLS_FILE, SKILLS_CSV)
+logger.info("Skill matcher ready", extra={"skills": len(skill_matcher)})
+
+
+# PASS/REVIEW thresholds: calibrated by calibrate.py when its config exists, else 80/60
+recommendation_thresholds = load_scoring_config(SCORING_CONFIG_FILE)['recommendation']
+logger.info("Recommendation thresholds loaded", extra={
+    "pass_threshold": recommendation_thresholds['pass'],
+    "review_threshold": recommendation_thresholds['review']
+})
+
+
+# Content-addressed caches: extracted text by PDF hash, embeddings by PDF / JD hash.
+# Text is scoped to the PDF backend and limits, embeddings to the model (and quantized
+# backend), so changing either invalidates them. Resume embeddings are keyed by PDF
+# hash but computed from the extracted text, so they are scoped to both.
+TEXT_NAMESPACE = f"{PDF_BACKEND}-pages{PDF_MAX_PAGES}-chars{PDF_MAX_CHARS}"
+text_cache = ContentCache(
+    'extracted_text', 'text', CACHE_MAX_ENTRIES, CACHE_DIR, namespace=TEXT_NAMESPACE
+)
+resume_embedding_cache = ContentCache(
+    'resume_embeddings', 'embedding', CACHE_MAX_ENTRIES, CACHE_DIR,
+    namespace=f"{EMBEDDING_NAMESPACE}-{TEXT_NAMESPACE}"
+)
+job_embedding_cache = ContentCache(
+    'job_embeddings', 'embedding', CACHE_MAX_ENTRIES, CACHE_DIR, namespace=EMBEDDING_NAMESPACE
+)
+# Chunked encoding: the (chunks, dim) matrix per resume, scoped to the window overlap too
+resume_chunk_cache = ContentCache(
+    'resume_chunk_embeddings', 'embedding', CACHE_MAX_ENTRIES, CACHE_DIR,
+    namespace=f"{EMBEDDING_NAMESPACE}-overlap{CHUNK_OVERLAP}-{TEXT_NAMESPACE}"
+)
+
+# Embeddings of every screened resume, for top-K retrieval against new job descriptions.
+# Keyed by model only: the int8 export stays in the same vector space as the torch model
+candidate_index = CandidateIndex(CANDIDATE_INDEX_DIR, MODEL_NAME, CANDIDATE_INDEX_DTYPE)
 
 
 # ==================== UTILITY FUNCTIONS ====================
@@ -49,13 +166,116 @@ except Exception as e:
 def extract_text_from_pdf(file_content: bytes) -> str:
     """Extract text from PDF file"""
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
+        return extract_pdf_text(file_content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def extract_text_from_pdf_cached(file_content: bytes):
+    """
+    Extract text from a PDF in the worker pool, reusing the result for byte-identical uploads.
+    Returns (content_hash, text) so callers can key the resume embedding on it too
+    """
+    content_hash = hash_bytes(file_content)
+    text = text_cache.get(content_hash)
+    if text is None:
+        with STAGE_SECONDS.time(stage="pdf_extraction"):
+            text = await run_extraction(file_content)
+        text_cache.put(content_hash, text)
+    return content_hash, text
+
+
+def get_model():
+    """The loaded embedding model (behind the batcher when enabled); raises while it is still loading"""
+    model = model_manager.model
+    if model is None:
+        raise RuntimeError("AI model not available")
+    return batching_encoder or model
+
+
+def encode_job_description(job_description: str) -> np.ndarray:
+    """Normalized embedding of a job description, cached by its normalized text"""
+    return encode_job_descriptions([job_description])[0]
+
+
+def encode_job_descriptions(job_descriptions: List[str]) -> np.ndarray:
+    """
+    Normalized embeddings of several job descriptions as one (n, dim) matrix,
+    cached by normalized text; the uncached ones go through a single batched encode
+    """
+    keys = [hash_text(job_description) for job_description in job_descriptions]
+    embeddings = [job_embedding_cache.get(key) for key in keys]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    
+    if missing:
+        fresh = get_model().encode(
+            [normalize_text(job_descriptions[i]) for i in missing],
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        for i, embedding in zip(missing, fresh):
+            embeddings[i] = embedding
+            job_embedding_cache.put(keys[i], embedding)
+    
+    return np.vstack(embeddings)
+
+
+def encode_resumes(resume_texts: List[str], cache_keys: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Normalized embeddings of several resumes as one (n, dim) matrix.
+    Cached resumes are reused; the rest go through a single batched encode.
+    cache_keys default to the text hashes; uploads pass the PDF content hashes
+    """
+    if cache_keys is None:
+        cache_keys = [hash_text(text) for text in resume_texts]
+    
+    embeddings = [resume_embedding_cache.get(key) for key in cache_keys]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    
+    if missing:
+        fresh = get_model().encode(
+            [resume_texts[i] for i in missing],
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        for i, embedding in zip(missing, fresh):
+            embeddings[i] = embedding
+            resume_embedding_cache.put(cache_keys[i], embedding)
+    
+    return np.vstack(embeddings)
+
+
+def encode_resume_chunks(resume_texts: List[str], cache_keys: Optional[List[str]] = None) -> List[np.ndarray]:
+    """
+    Normalized (chunks, dim) embeddings of every resume, covering the whole text.
+    The windows of all uncached resumes are encoded together, bucketed by length
+    """
+    if cache_keys is None:
+        cache_keys = [hash_text(text) for text in resume_texts]
+
+    embeddings = [resume_chunk_cache.get(key) for key in cache_keys]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+    if missing:
+        model = get_model()
+        chunks, token_counts, owner = chunk_texts(model, [resume_texts[i] for i in missing], CHUNK_OVERLAP)
+        chunk_embeddings = encode_bucketed(model, chunks, token_counts, EMBEDDING_BATCH_SIZE)
+        owner = np.asarray(owner)
+        for position, i in enumerate(missing):
+            embeddings[i] = chunk_embeddings[owner == position]
+            resume_chunk_cache.put(cache_keys[i], embeddings[i])
+
+    return embeddings
+
+
+def stored_job_embeddings(jobs: List[dict]) -> np.ndarray:
+    """
+    (n, dim) vectors of stored job descriptions from the job_embeddings table;
+    missing or outdated ones are encoded in one batch and stored for next time
+    """
+    return sync_job_embeddings(jobs, encode_job_descriptions, EMBEDDING_NAMESPACE)
 
 
 def calculate_ai_match_score(resume_text: str, job_description: str) -> float:
@@ -63,28 +283,76 @@ def calculate_ai_match_score(resume_text: str, job_description: str) -> float:
     AI-powered semantic matching using sentence transformers
     Returns a score between 0 and 100
     """
-    if model is None:
-        # Fallback to simple matching if model not loaded
-        print("⚠️  AI model not available, using simple matching")
-        return calculate_simple_match_score(resume_text, job_description)
+    return calculate_ai_match_scores([resume_text], job_description)[0]
+
+
+def calculate_ai_match_scores(
+    resume_texts: List[str],
+    job_description: str,
+    cache_keys: Optional[List[str]] = None
+) -> List[float]:
+    """
+    Batched AI semantic matching for several resumes against one job description.
+    Returns one score between 0 and 100 per resume, in input order
+    """
+    scores, _ = score_resumes(resume_texts, job_description, cache_keys)
+    return scores
+
+
+def score_resumes(
+    resume_texts: List[str],
+    job_description: str,
+    cache_keys: Optional[List[str]] = None,
+    job: Optional[dict] = None
+) -> Tuple[List[float], Optional[np.ndarray]]:
+    """
+    The job description is encoded once (or its precomputed vector used when it
+    is a stored job), all resumes go through a single batched encode and the
+    cosine similarities are computed as one matrix-vector product.
+    Returns (scores, resume_embeddings); embeddings are None when the keyword
+    fallback was used
+    """
+    if not resume_texts:
+        return [], None
+    
+    if not model_manager.is_ready():
+        # Fallback to simple matching while the model is not loaded
+        logger.warning("AI model not available, using simple matching", extra={"resumes": len(resume_texts)})
+        SIMPLE_MATCH_FALLBACKS.inc(reason="model_not_ready")
+        return calculate_simple_match_scores(resume_texts, job_description), None
     
     try:
-        # Get embeddings 
-        resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-        job_embedding = model.encode(job_description, convert_to_tensor=True)
-        
-        # Calculate cosine similarity 
-        similarity = util.cos_sim(resume_embedding, job_embedding)
+        with STAGE_SECONDS.time(stage="encode"):
+            # Get embeddings (unit length, so the dot product is the cosine similarity)
+            if job is not None:
+                job_embedding = stored_job_embeddings([job])[0]
+            else:
+                job_embedding = encode_job_description(job_description)
+            if RESUME_ENCODING == 'chunked':
+                # Best-matching part(s) of each resume; the mean chunk vector stands in for the resume
+                chunk_embeddings = encode_resume_chunks(resume_texts, cache_keys)
+                similarities = [
+                    aggregate_similarities(chunks @ job_embedding, CHUNK_AGGREGATION, CHUNK_TOP_K)
+                    for chunks in chunk_embeddings
+                ]
+                resume_embeddings = np.vstack([document_embedding(chunks) for chunks in chunk_embeddings])
+            else:
+                resume_embeddings = encode_resumes(resume_texts, cache_keys)
+
+                # Cosine similarity of every resume against the job description
+                similarities = resume_embeddings @ job_embedding
         
-        # Convert to percentage score (0-100)
-        score = float(similarity.item()) * 100
+        # Convert to percentage scores (0-100)
+        scores = [round(float(similarity) * 100, 2) for similarity in similarities]
         
-        print(f"🤖 AI Match Score: {score:.2f}%")
-        return round(score, 2)
-    except Exception as e:
-        print(f"⚠️  AI matching error: {e}")
+        logger.debug("AI match scores", extra={"resumes": len(scores), "scores": scores})
+        return scores, resume_embeddings
+    except Exception:
+        logger.exception("AI matching error, using simple matching")
+        SIMPLE_MATCH_FALLBACKS.inc(reason="model_error")
+        ERRORS.inc(stage="encode")
         # Fallback to simple keyword matching
-        return calculate_simple_match_score(resume_text, job_description)
+        return calculate_simple_match_scores(resume_texts, job_description), None
 
 
 def calculate_simple_match_score(resume_text: str, job_description: str) -> float:
@@ -92,64 +360,441 @@ def calculate_simple_match_score(resume_text: str, job_description: str) -> floa
     Simple keyword matching algorithm (fallback method)
     Returns a score between 0 and 100
     """
-    # Convert to lowercase for comparison
-    resume_lower = resume_text.lower()
-    jd_lower = job_description.lower()
-    
-    # Common tech skills to look for
-    skills = [
-        'python', 'java', 'javascript', 'react', 'sql', 'mysql',
-        'fastapi', 'docker', 'aws', 'git', 'html', 'css',
-        'machine learning', 'ai', 'data analysis', 'frontend',
-        'backend', 'full stack', 'api', 'database', 'tensorflow',
-        'pytorch', 'nlp', 'deep learning', 'cybersecurity', 'networking',
-        'linux', 'c++', 'c#', 'php', 'node', 'angular', 'vue'
-    ]
-    
-    # Count how many skills from JD are in resume
-    jd_skills = [skill for skill in skills if skill in jd_lower]
-    matched_skills = [skill for skill in jd_skills if skill in resume_lower]
-    
-    # Calculate score
-    if len(jd_skills) == 0:
-        return 50.0  # No skills to match, return neutral score
+    score = skill_matcher.match(resume_text, job_description).score
+    logger.debug("Simple match score", extra={"score": score})
+    return score
+
+
+def calculate_simple_match_scores(resume_texts: List[str], job_description: str) -> List[float]:
+    """Keyword fallback for a batch: the job description is scanned once"""
+    jd_skills = skill_matcher.find(job_description)
+    scores = [skill_matcher.match(text, jd_skills=jd_skills).score for text in resume_texts]
+    logger.debug("Simple match scores", extra={"resumes": len(scores), "scores": scores})
+    return scores
+
+
+def score_matrix(
+    resume_texts: List[str],
+    jobs: List[dict],
+    cache_keys: Optional[List[str]] = None
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Scores (0-100) of every resume against every stored job description as a
+    (resumes, jobs) matrix: the precomputed job vectors, one batched encode of
+    the resumes and one matrix multiply. Returns (scores, resume_embeddings);
+    embeddings are None when the keyword fallback was used
+    """
+    job_descriptions = [job_text(job) for job in jobs]
+    if not model_manager.is_ready():
+        logger.warning("AI model not available, using simple matching", extra={"resumes": len(resume_texts)})
+        SIMPLE_MATCH_FALLBACKS.inc(reason="model_not_ready")
+        return simple_match_matrix(resume_texts, job_descriptions), None
     
-    score = (len(matched_skills) / len(jd_skills)) * 100
-    print(f"📊 Simple Match Score: {score:.2f}%")
-    return round(score, 2)
+    try:
+        with STAGE_SECONDS.time(stage="encode"):
+            job_embeddings = stored_job_embeddings(jobs)
+            if RESUME_ENCODING == 'chunked':
+                chunk_embeddings = encode_resume_chunks(resume_texts, cache_keys)
+                similarities = np.vstack([
+                    aggregate_similarity_columns(chunks @ job_embeddings.T, CHUNK_AGGREGATION, CHUNK_TOP_K)
+                    for chunks in chunk_embeddings
+                ])
+                resume_embeddings = np.vstack([document_embedding(chunks) for chunks in chunk_embeddings])
+            else:
+                resume_embeddings = encode_resumes(resume_texts, cache_keys)
+                similarities = resume_embeddings @ job_embeddings.T
+        return np.round(np.asarray(similarities, dtype=np.float64) * 100, 2), resume_embeddings
+    except Exception:
+        logger.exception("AI matching error, using simple matching")
+        SIMPLE_MATCH_FALLBACKS.inc(reason="model_error")
+        ERRORS.inc(stage="encode")
+        return simple_match_matrix(resume_texts, job_descriptions), None
+
+
+def simple_match_matrix(resume_texts: List[str], job_descriptions: List[str]) -> np.ndarray:
+    """Keyword fallback for score_matrix: every text is scanned once"""
+    jd_skills = [skill_matcher.find(job_description) for job_description in job_descriptions]
+    scores = np.empty((len(resume_texts), len(job_descriptions)))
+    for row, text in enumerate(resume_texts):
+        resume_skills = skill_matcher.find(text)
+        scores[row] = [
+            skill_matcher.match(text, jd_skills=skills, resume_skills=resume_skills).score for skills in jd_skills
+        ]
+    return scores
 
 
 def get_matched_and_missing_skills(resume_text: str, job_description: str):
     """Find which skills matched and which are missing"""
-    resume_lower = resume_text.lower()
-    jd_lower = job_description.lower()
-    
-    skills = [
-        'python', 'java', 'javascript', 'react', 'sql', 'mysql',
-        'fastapi', 'docker', 'aws', 'git', 'html', 'css',
-        'machine learning', 'ai', 'data analysis', 'frontend',
-        'backend', 'full stack', 'api', 'database', 'tensorflow',
-        'pytorch', 'nlp', 'deep learning', 'cybersecurity', 'networking',
-        'linux', 'c++', 'c#', 'php', 'node', 'angular', 'vue'
-    ]
-    
-    jd_skills = [skill for skill in skills if skill in jd_lower]
-    matched = [skill for skill in jd_skills if skill in resume_lower]
-    missing = [skill for skill in jd_skills if skill not in resume_lower]
-    
-    return matched, missing
+    match = skill_matcher.match(resume_text, job_description)
+    return match.matched, match.missing
+
+
+async def read_uploads(files: List[UploadFile]) -> List[Tuple[str, bytes]]:
+    """(file_name, pdf_bytes) of every uploaded file"""
+    with STAGE_SECONDS.time(stage="upload_read"):
+        return [(uploaded_file.filename, await uploaded_file.read()) for uploaded_file in files]
+
+
+def build_error_result(file_name: str, error: str) -> dict:
+    """Result entry for a file that could not be screened"""
+    return {
+        "file_name": file_name,
+        "candidate_name": "Error",
+        "match_score": 0,
+        "matched_skills": [],
+        "missing_skills": [],
+        "recommendation": "ERROR",
+        "error": error,
+        "ai_powered": False
+    }
 
 
 def get_recommendation(score: float) -> str:
     """Determine recommendation based on score"""
-    if score >= 80:
+    if score >= recommendation_thresholds['pass']:
         return "PASS"
-    elif score >= 60:
+    elif score >= recommendation_thresholds['review']:
         return "REVIEW"
     else:
         return "FAIL"
 
 
+# ==================== SCREENING PIPELINE ====================
+
+
+async def extract_files(files: List[Tuple[str, bytes]]) -> Tuple[list, list]:
+    """
+    Extract the text of every (file_name, pdf_bytes) in parallel in the worker pool.
+    Returns (results, pending): results holds an error entry at the position of
+    every file that failed (None elsewhere), pending the
+    (position, file_name, content_hash, resume_text) of the others
+    """
+    results = [None] * len(files)
+    readable = []  # (position, file_name, file_content)
+    for position, (file_name, file_content) in enumerate(files):
+        # Validate file type
+        if not file_name.endswith('.pdf'):
+            results[position] = build_error_result(file_name, "Only PDF files are supported")
+            logger.info("Skipped file: not a PDF", extra={"file_name": file_name})
+            ERRORS.inc(stage="invalid_file")
+            continue
+        
+        readable.append((position, file_name, file_content))
+    
+    extractions = await asyncio.gather(
+        *(extract_text_from_pdf_cached(file_content) for _, _, file_content in readable),
+        return_exceptions=True
+    )
+    
+    pending = []  # (position, file_name, content_hash, resume_text)
+    for (position, file_name, _), extraction in zip(readable, extractions):
+        if isinstance(extraction, Exception):
+            logger.warning("PDF extraction failed", extra={"file_name": file_name, "error": str(extraction)})
+            ERRORS.inc(stage="pdf_extraction")
+            results[position] = build_error_result(file_name, str(extraction))
+            continue
+        
+        content_hash, resume_text = extraction
+        if not resume_text.strip():
+            results[position] = build_error_result(file_name, "Could not extract text from PDF")
+            logger.info("No text extracted", extra={"file_name": file_name})
+            ERRORS.inc(stage="empty_text")
+            continue
+        
+        logger.debug("Extracted text", extra={"file_name": file_name, "chars": len(resume_text)})
+        pending.append((position, file_name, content_hash, resume_text))
+    
+    return results, pending
+
+
+async def screen_files(files: List[Tuple[str, bytes]], job_description: str,
+                       job: Optional[dict] = None) -> List[dict]:
+    """
+    Screen a batch of (file_name, pdf_bytes) against one job description:
+    parallel text extraction, one batched model call, one bulk database write
+    and one candidate index append. Returns one result entry per file, in order.
+    Pass job (a job_descriptions row) to score against its stored vector and
+    save the results under its id
+    """
+    # Step 1: extract all texts in parallel in the worker pool; results keep the
+    # upload order and failed files already have their error entry
+    results, pending = await extract_files(files)
+    return await score_extracted(results, pending, job_description, job)
+
+
+async def score_extracted(results: list, pending: list, job_description: str,
+                          job: Optional[dict] = None) -> List[dict]:
+    """
+    Steps 2-4 of screen_files for the (position, file_name, content_hash, resume_text)
+    entries of pending: one batched model call, one bulk database write and one
+    candidate index append. Fills in results at those positions and returns it
+    """
+    # Step 2: score all extracted resumes in one batched model call, on the inference executor
+    match_scores, resume_embeddings = await run_inference(
+        score_resumes,
+        [resume_text for _, _, _, resume_text in pending],
+        job_description,
+        [content_hash for _, _, content_hash, _ in pending],
+        job
+    )
+    
+    # Saved resumes (row in resume_embeddings, id, score, recommendation) for the candidate index
+    indexed = []
+    
+    # Step 3: skills, recommendation and candidate name per resume
+    skill_match_started = time.perf_counter()
+    jd_skills = skill_matcher.find(job_description)
+    scored = []  # (row, position, result)
+    for row, ((position, file_name, _, resume_text), match_score) in enumerate(zip(pending, match_scores)):
+        try:
+            # Get matched and missing skills (the JD was scanned once for the whole batch)
+            skill_match = skill_matcher.match(resume_text, jd_skills=jd_skills)
+            matched_skills, missing_skills = skill_match.matched, skill_match.missing
+            
+            # Get recommendation
+            recommendation = get_recommendation(match_score)
+            
+            # Extract candidate name 
+            candidate_name = resume_text.split('\n')[0][:100].strip() if resume_text else "Unknown"
+            
+            scored.append((row, position, {
+                "candidate_name": candidate_name,
+                "file_name": file_name,
+                "match_score": match_score,
+                "matched_skills": matched_skills,
+                "missing_skills": missing_skills,
+                "recommendation": recommendation,
+                "ai_powered": resume_embeddings is not None
+            }))
+            
+            RESUMES_SCREENED.inc(recommendation=recommendation)
+            logger.debug("Screened resume", extra={
+                "file_name": file_name, "match_score": match_score, "recommendation": recommendation
+            })
+            
+        except Exception as e:
+            logger.exception("Error processing resume", extra={"file_name": file_name})
+            ERRORS.inc(stage="skill_match")
+            results[position] = build_error_result(file_name, str(e))
+    STAGE_SECONDS.observe(time.perf_counter() - skill_match_started, stage="skill_match")
+    
+    # Save the whole batch to the database in one transaction, off the event loop
+    db_write_started = time.perf_counter()
+    result_ids = await save_screening_results_async([{
+        "job_id": job["id"] if job is not None else 1,
+        "candidate_name": result["candidate_name"],
+        "file_name": result["file_name"],
+        "match_score": result["match_score"],
+        "matched_skills": ", ".join(result["matched_skills"]) if result["matched_skills"] else "None",
+        "missing_skills": ", ".join(result["missing_skills"]) if result["missing_skills"] else "None",
+        "recommendation": result["recommendation"]
+    } for _, _, result in scored])
+    STAGE_SECONDS.observe(time.perf_counter() - db_write_started, stage="db_write")
+    
+    for (row, position, result), result_id in zip(scored, result_ids):
+        results[position] = {"id": result_id, **result}
+        if result_id is not None:
+            indexed.append((row, result_id, result["match_score"], result["recommendation"]))
+    
+    # Step 4: keep the embeddings so later job descriptions can search these candidates
+    if resume_embeddings is not None and indexed:
+        try:
+            with STAGE_SECONDS.time(stage="index_append"):
+                candidate_index.append(
+                    ids=[result_id for _, result_id, _, _ in indexed],
+                    embeddings=resume_embeddings[[row for row, _, _, _ in indexed]],
+                    match_scores=[match_score for _, _, match_score, _ in indexed],
+                    recommendations=[recommendation for _, _, _, recommendation in indexed]
+                )
+        except Exception:
+            logger.exception("Could not update candidate index")
+            ERRORS.inc(stage="index_append")
+    
+    return results
+
+
+async def match_files(files: List[Tuple[str, bytes]], jobs: List[dict], top_k: int) -> Tuple[list, list]:
+    """
+    Score a batch of (file_name, pdf_bytes) against several stored job descriptions
+    with one batched encode per side and one matrix multiply. Each resume's top_k
+    roles are saved against their job ids in one bulk write. Returns
+    (results, matrix): one entry per file in order, and each file's row of scores
+    (one per job, in the order of jobs; None for files that failed)
+    """
+    results, pending = await extract_files(files)
+    matrix = [None] * len(files)
+    if not pending:
+        return results, matrix
+    
+    job_texts = [job_text(job) for job in jobs]
+    scores, resume_embeddings = await run_inference(
+        score_matrix,
+        [resume_text for _, _, _, resume_text in pending],
+        jobs,
+        [content_hash for _, _, content_hash, _ in pending]
+    )
+    # Best roles first; the stable sort keeps the lower job id first on ties
+    best = np.argsort(-scores, axis=1, kind='stable')[:, :top_k]
+    
+    # Skills of a job description are only looked up once it is someone's best role
+    skill_match_started = time.perf_counter()
+    jd_skills = {}
+    scored = []  # (row, position, result)
+    for row, (position, file_name, _, resume_text) in enumerate(pending):
+        try:
+            resume_skills = skill_matcher.find(resume_text)
+            best_roles = []
+            for column in best[row]:
+                if column not in jd_skills:
+                    jd_skills[column] = skill_matcher.find(job_texts[column])
+                skill_match = skill_matcher.match(resume_text, jd_skills=jd_skills[column], resume_skills=resume_skills)
+                match_score = float(scores[row, column])
+                best_roles.append({
+                    "job_id": jobs[column]["id"],
+                    "title": jobs[column]["title"],
+                    "match_score": match_score,
+                    "matched_skills": skill_match.matched,
+                    "missing_skills": skill_match.missing,
+                    "recommendation": get_recommendation(match_score)
+                })
+            
+            scored.append((row, position, {
+                "candidate_name": resume_text.split('\n')[0][:100].strip() or "Unknown",
+                "file_name": file_name,
+                "best_roles": best_roles,
+                "ai_powered": resume_embeddings is not None
+            }))
+            matrix[position] = scores[row].tolist()
+            RESUMES_SCREENED.inc(recommendation=best_roles[0]["recommendation"])
+        except Exception as e:
+            logger.exception("Error processing resume", extra={"file_name": file_name})
+            ERRORS.inc(stage="skill_match")
+            results[position] = build_error_result(file_name, str(e))
+    STAGE_SECONDS.observe(time.perf_counter() - skill_match_started, stage="skill_match")
+    
+    # Every (resume, best role) pair in one transaction
+    db_write_started = time.perf_counter()
+    result_ids = await save_screening_results_async([{
+        "job_id": role["job_id"],
+        "candidate_name": result["candidate_name"],
+        "file_name": result["file_name"],
+        "match_score": role["match_score"],
+        "matched_skills": ", ".join(role["matched_skills"]) if role["matched_skills"] else "None",
+        "missing_skills": ", ".join(role["missing_skills"]) if role["missing_skills"] else "None",
+        "recommendation": role["recommendation"]
+    } for _, _, result in scored for role in result["best_roles"]])
+    STAGE_SECONDS.observe(time.perf_counter() - db_write_started, stage="db_write")
+    
+    # Each resume is indexed once, under the saved result of its best role
+    indexed = []  # (row, result id, score, recommendation)
+    saved = iter(result_ids)
+    for row, position, result in scored:
+        for role in result["best_roles"]:
+            role["id"] = next(saved)
+        results[position] = result
+        best_role = result["best_roles"][0]
+        if best_role["id"] is not None:
+            indexed.append((row, best_role["id"], best_role["match_score"], best_role["recommendation"]))
+    
+    if resume_embeddings is not None and indexed:
+        try:
+            with STAGE_SECONDS.time(stage="index_append"):
+                candidate_index.append(
+                    ids=[result_id for _, result_id, _, _ in indexed],
+                    embeddings=resume_embeddings[[row for row, _, _, _ in indexed]],
+                    match_scores=[match_score for _, _, match_score, _ in indexed],
+                    recommendations=[recommendation for _, _, _, recommendation in indexed]
+                )
+        except Exception:
+            logger.exception("Could not update candidate index")
+            ERRORS.inc(stage="index_append")
+    
+    return results, matrix
+
+
+async def screen_files_as_completed(files: List[Tuple[str, bytes]], job_description: str,
+                                   job: Optional[dict] = None):
+    """
+    Screen a batch like screen_files, yielding (position, result) as soon as each
+    resume is scored. Every file is extracted on its own; the files whose
+    extraction finished together are scored as one group (one model call, one
+    bulk write) while the others are still extracting, so the first result is
+    ready after roughly the cost of one file. Encodes of groups scored at the
+    same time are merged by the inference batcher
+    """
+    extractions = {
+        asyncio.create_task(extract_files([upload])): position for position, upload in enumerate(files)
+    }
+    scorings = {}  # task -> entries of its group
+    results = [None] * len(files)
+
+    async def score_group(group: list):
+        try:
+            await score_extracted(results, group, job_description, job)
+        except Exception as e:
+            logger.exception("Error scoring resumes", extra={"files": len(group)})
+            ERRORS.inc(stage="pipeline")
+            for position, file_name, _, _ in group:
+                results[position] = build_error_result(file_name, str(e))
+
+    try:
+        while extractions or scorings:
+            done, _ = await asyncio.wait(set(extractions) | set(scorings), return_when=asyncio.FIRST_COMPLETED)
+            group = []  # (position, file_name, content_hash, resume_text)
+            for task in done:
+                if task in scorings:
+                    for position, *_ in scorings.pop(task):
+                        yield position, results[position]
+                    continue
+                position = extractions.pop(task)
+                try:
+                    (error,), readable = task.result()
+                except Exception as e:
+                    logger.exception("Error processing resume", extra={"file_name": files[position][0]})
+                    ERRORS.inc(stage="pipeline")
+                    error, readable = build_error_result(files[position][0], str(e)), []
+                if error is not None:
+                    results[position] = error
+                    yield position, error
+                group += [(position, *entry[1:]) for entry in readable]
+            if group:
+                group.sort()
+                scorings[asyncio.create_task(score_group(group))] = group
+    finally:
+        # Client went away: stop whatever has not finished yet
+        for task in [*extractions, *scorings]:
+            task.cancel()
+
+
+# ==================== LIFECYCLE ====================
+
+
+# Background queue for large batches, feeding chunks through screen_files
+job_queue = ScreeningJobQueue(screen_files, JOB_WORKERS, JOB_CHUNK_SIZE, JOB_SPOOL_DIR, JOB_LEASE_SECONDS)
+
+
+@app.on_event("startup")
+def start_model_loading():
+    """Load the AI model in the background; /ready reports when it is done"""
+    model_manager.start()
+
+
+@app.on_event("startup")
+async def start_job_queue():
+    """Start the screening job workers and resume unfinished jobs"""
+    await job_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    """Stop the job workers, then the extraction and inference pools, then flush the logs"""
+    await job_queue.stop()
+    workers.shutdown()
+    if batching_encoder is not None:
+        batching_encoder.stop()
+    stop_logging()
+
+
 # ==================== API ENDPOINTS ====================
 
 
@@ -159,21 +804,57 @@ async def root():
     return {
         "message": "Resume Screening System API",
         "status": "running",
-        "ai_model_loaded": model is not None,
+        "ai_model_loaded": model_manager.is_ready(),
+        "cache": {
+            "extracted_text": text_cache.stats(),
+            "resume_embeddings": resume_embedding_cache.stats(),
+            "job_embeddings": job_embedding_cache.stats(),
+            "resume_chunk_embeddings": resume_chunk_cache.stats()
+        },
         "timestamp": datetime.now().isoformat()
     }
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness check - 200 once the AI model is loaded and warmed up, 503 before"""
+    status = model_manager.status()
+    if not model_manager.is_ready():
+        return JSONResponse(status_code=503, content={"ready": False, "model": status})
+    return {"ready": True, "model": status}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Stage latencies, fallbacks, cache lookups and errors of this process, in Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+async def resolve_job_description(job_description: Optional[str],
+                                  job_id: Optional[int]) -> Tuple[str, Optional[dict]]:
+    """(text to match against, stored job_descriptions row or None) of an upload's form fields"""
+    if job_id is not None:
+        job = await get_job_description_async(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job description not found")
+        return job_text(job), job
+    if not job_description:
+        raise HTTPException(status_code=400, detail="Provide a job_description or a job_id")
+    return job_description, None
+
+
 @app.post("/api/v1/screening/upload")
 async def upload_resume(
     files: List[UploadFile] = File(...),
-    job_description: str = Form(...)
+    job_description: Optional[str] = Form(None),
+    job_id: Optional[int] = Form(None)
 ):
     """
     Upload and screen one or multiple resumes against a job description
     
     - **files**: One or more PDF resume files (max 10)
     - **job_description**: The job description text to match against
+    - **job_id**: Or a stored `job_descriptions` id, scored with its precomputed embedding
     """
     
     # Validate file count
@@ -183,104 +864,13 @@ async def upload_resume(
     if len(files) == 0:
         raise HTTPException(status_code=400, detail="No files uploaded")
     
-    print(f"\n📦 Batch processing {len(files)} resume(s)...")
+    job_description, job = await resolve_job_description(job_description, job_id)
     
-    # Process all resumes
-    results = []
+    # Read every file, then run the screening pipeline on the batch
+    uploads = await read_uploads(files)
+    results = await screen_files(uploads, job_description, job)
     
-    for uploaded_file in files:
-        # Validate file type
-        if not uploaded_file.filename.endswith('.pdf'):
-            results.append({
-                "file_name": uploaded_file.filename,
-                "candidate_name": "Error",
-                "match_score": 0,
-                "matched_skills": [],
-                "missing_skills": [],
-                "recommendation": "ERROR",
-                "error": "Only PDF files are supported",
-                "ai_powered": False
-            })
-            print(f"❌ Skipped {uploaded_file.filename}: Not a PDF")
-            continue
-        
-        try:
-            # Read file content
-            file_content = await uploaded_file.read()
-            
-            # Extract text from PDF
-            resume_text = extract_text_from_pdf(file_content)
-            
-            if not resume_text.strip():
-                results.append({
-                    "file_name": uploaded_file.filename,
-                    "candidate_name": "Error",
-                    "match_score": 0,
-                    "matched_skills": [],
-                    "missing_skills": [],
-                    "recommendation": "ERROR",
-                    "error": "Could not extract text from PDF",
-                    "ai_powered": False
-                })
-                print(f"❌ Failed {uploaded_file.filename}: No text extracted")
-                continue
-            
-            print(f"📄 Processing: {uploaded_file.filename}")
-            
-            # Calculate match score using AI
-            match_score = calculate_ai_match_score(resume_text, job_description)
-            
-            # Get matched and missing skills
-            matched_skills, missing_skills = get_matched_and_missing_skills(
-                resume_text, 
-                job_description
-            )
-            
-            # Get recommendation
-            recommendation = get_recommendation(match_score)
-            
-            # Extract candidate name 
-            candidate_name = resume_text.split('\n')[0][:100].strip() if resume_text else "Unknown"
-            
-            # Save to database
-            result_id = save_screening_result(
-                job_id=1,
-                candidate_name=candidate_name,
-                file_name=uploaded_file.filename,
-                match_score=match_score,
-                matched_skills=", ".join(matched_skills) if matched_skills else "None",
-                missing_skills=", ".join(missing_skills) if missing_skills else "None",
-                recommendation=recommendation
-            )
-            
-            # Add to results
-            results.append({
-                "id": result_id,
-                "candidate_name": candidate_name,
-                "file_name": uploaded_file.filename,
-                "match_score": match_score,
-                "matched_skills": matched_skills,
-                "missing_skills": missing_skills,
-                "recommendation": recommendation,
-                "ai_powered": model is not None
-            })
-            
-            print(f"✅ {uploaded_file.filename}: {match_score}% - {recommendation}")
-            
-        except Exception as e:
-            print(f"❌ Error processing {uploaded_file.filename}: {str(e)}")
-            results.append({
-                "file_name": uploaded_file.filename,
-                "candidate_name": "Error",
-                "match_score": 0,
-                "matched_skills": [],
-                "missing_skills": [],
-                "recommendation": "ERROR",
-                "error": str(e),
-                "ai_powered": False
-            })
-    
-    print(f"✅ Batch processing complete! {len(results)} resume(s) processed.\n")
+    logger.info("Batch processed", extra={"files": len(results)})
     
     # Return batch results
     return {
@@ -290,21 +880,290 @@ async def upload_resume(
     }
 
 
+@app.post("/api/v1/screening/upload/stream")
+async def upload_resume_stream(
+    files: List[UploadFile] = File(...),
+    job_description: Optional[str] = Form(None),
+    job_id: Optional[int] = Form(None),
+    stream_format: str = Query("ndjson", alias="format")
+):
+    """
+    Streaming variant of `/api/v1/screening/upload`: each result is sent the moment
+    that resume is scored, followed by a summary record
+    
+    - **files**: One or more PDF resume files (max 10)
+    - **job_description**: The job description text to match against
+    - **job_id**: Or a stored `job_descriptions` id, scored with its precomputed embedding
+    - **format**: `ndjson` (one result per line, then `{"summary": {...}}`) or
+      `sse` (`result` events, then a `summary` event)
+    """
+    if stream_format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be ndjson or sse")
+    
+    # Validate file count
+    if len(files) > 10:
+        raise HTTPException(status_code=400, detail="Maximum 10 files allowed at once")
+    
+    if len(files) == 0:
+        raise HTTPException(status_code=400, detail="No files uploaded")
+    
+    job_description, job = await resolve_job_description(job_description, job_id)
+    uploads = await read_uploads(files)
+    
+    def encode(event: str, payload: dict) -> str:
+        data = json.dumps(payload, default=str)
+        if stream_format == "sse":
+            return f"event: {event}\ndata: {data}\n\n"
+        return data + "\n"
+    
+    async def stream():
+        processed = 0
+        async for _, result in screen_files_as_completed(uploads, job_description, job):
+            processed += 1
+            yield encode("result", result)
+        summary = {
+            "total_processed": processed,
+            "message": f"Successfully processed {processed} resume(s)!"
+        }
+        logger.info("Streaming batch processed", extra={"files": processed})
+        yield encode("summary", summary if stream_format == "sse" else {"summary": summary})
+    
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+@app.post("/api/v1/screening/match-matrix")
+async def match_matrix(
+    files: List[UploadFile] = File(...),
+    job_ids: List[int] = Form(None),
+    top_k: int = Form(3)
+):
+    """
+    Score resumes against many stored job descriptions at once and find each
+    resume's best-fitting roles
+    
+    - **files**: One or more PDF resume files (max 10)
+    - **job_ids**: `job_descriptions` ids to match against (repeat the field); all of them when omitted
+    - **top_k**: Best roles returned, and saved to the screening history, per resume
+    
+    Returns the jobs, the score matrix (one row per file, one column per job;
+    null for files that failed) and each resume's best roles with their saved ids
+    """
+    if len(files) > 10:
+        raise HTTPException(status_code=400, detail="Maximum 10 files allowed at once")
+    
+    if len(files) == 0:
+        raise HTTPException(status_code=400, detail="No files uploaded")
+    
+    if top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1")
+    
+    jobs = await get_job_descriptions_async(sorted(set(job_ids)) if job_ids else None)
+    if job_ids:
+        missing = sorted(set(job_ids) - {job["id"] for job in jobs})
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Job descriptions not found: {missing}")
+    if not jobs:
+        raise HTTPException(status_code=404, detail="No job descriptions found, run load_dataset.py first")
+    
+    uploads = await read_uploads(files)
+    results, matrix = await match_files(uploads, jobs, top_k)
+    logger.info("Match matrix computed", extra={"files": len(results), "jobs": len(jobs)})
+    
+    return {
+        "total_processed": len(results),
+        "jobs": [{"id": job["id"], "title": job["title"]} for job in jobs],
+        "matrix": matrix,
+        "results": results
+    }
+
+
+@app.post("/api/v1/screening/jobs")
+async def submit_screening_job(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(...)
+):
+    """
+    Queue any number of resumes for background screening against a job description
+    
+    - **files**: PDF resume files (no limit)
+    - **job_description**: The job description text to match against
+    
+    Returns a job id right away; poll `GET /api/v1/screening/jobs/{job_id}` for progress
+    """
+    if len(files) == 0:
+        raise HTTPException(status_code=400, detail="No files uploaded")
+    
+    return await job_queue.submit(files, job_description)
+
+
+@app.get("/api/v1/screening/jobs/{job_id}")
+async def get_screening_job_status(job_id: int, include_results: bool = True):
+    """Progress of a screening job and the results of the files finished so far"""
+    status = await job_queue.status(job_id, include_results)
+    
+    if status is None:
+        raise HTTPException(status_code=404, detail="Screening job not found")
+    
+    return status
+
+
+@app.post("/api/v1/candidates/search")
+async def search_candidates(
+    job_description: str = Form(...),
+    top_k: int = Form(10),
+    recommendation: Optional[str] = Form(None),
+    min_score: Optional[float] = Form(None),
+    max_score: Optional[float] = Form(None)
+):
+    """
+    Find the best-fitting candidates among every resume screened so far
+    
+    - **job_description**: The new job description to match against
+    - **top_k**: Number of candidates to return (max 100)
+    - **recommendation**: Only candidates originally rated PASS, REVIEW or FAIL
+    - **min_score** / **max_score**: Range of the original match score
+    """
+    if not model_manager.is_ready():
+        raise HTTPException(status_code=503, detail="AI model not available")
+    
+    if not 1 <= top_k <= 100:
+        raise HTTPException(status_code=400, detail="top_k must be between 1 and 100")
+    
+    if recommendation is not None and recommendation not in RECOMMENDATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"recommendation must be one of {', '.join(RECOMMENDATIONS)}"
+        )
+    
+    job_embedding = await run_inference(encode_job_description, job_description)
+    candidates = await asyncio.get_running_loop().run_in_executor(
+        None,
+        functools.partial(
+            candidate_index.search,
+            job_embedding,
+            top_k=top_k,
+            recommendation=recommendation,
+            min_score=min_score,
+            max_score=max_score
+        )
+    )
+    
+    return {
+        "total_indexed": len(candidate_index),
+        "results": candidates
+    }
+
+
 @app.get("/api/v1/screening/history")
-async def get_screening_history():
-    """Get all past screening results"""
-    screenings = get_all_screenings()
+async def get_screening_history(
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    recommendation: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    job_id: Optional[int] = None,
+    include_description: bool = False,
+    since_id: Optional[int] = Query(None, ge=0),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get past screening results, newest first, one page at a time
+    
+    - **limit**: Results per page (max 500)
+    - **cursor**: `next_cursor` from the previous page
+    - **since_id**: Instead of a page, only results with a larger id, oldest first
+      (poll with the `last_id` of the previous response)
+    - **recommendation**: Only PASS, REVIEW, FAIL or ERROR results
+    - **min_score** / **max_score**: Match score range
+    - **job_id**: Only results for this job description
+    - **include_description**: Also return the full job description text
+    
+    Responses carry an `ETag`; send it back as `If-None-Match` to get an empty
+    304 while no screening result was added and no job description changed
+    (one small marker query, no page query)
+    """
+    if since_id is not None and cursor is not None:
+        raise HTTPException(status_code=400, detail="Use either cursor or since_id, not both")
+    
+    filters = {
+        "recommendation": recommendation,
+        "min_score": min_score,
+        "max_score": max_score,
+        "job_id": job_id,
+        "include_description": include_description
+    }
+    # Read the marker before the page: a result added in between only makes the
+    # next poll fetch again, it can never hide a change
+    marker = await get_history_marker_async()
+    response.headers["Cache-Control"] = "no-cache"
+    # Database unreachable: answer with the (empty) page below, but never with an
+    # ETag a client could later get a 304 for
+    if marker is not None:
+        query = json.dumps([limit, cursor, since_id, filters], sort_keys=True)
+        # Hashed with the query: the marker holds a timestamp, whose spaces an ETag may not contain
+        tag = hashlib.sha1(f"{marker}|{query}".encode("utf-8")).hexdigest()[:24]
+        etag = f'W/"{tag}"'
+        if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+        response.headers["ETag"] = etag
+    
+    if since_id is not None:
+        screenings, has_more = await get_screenings_since_async(since_id, limit, **filters)
+        return {
+            "count": len(screenings),
+            "screenings": screenings,
+            "last_id": screenings[-1]["id"] if screenings else since_id,
+            "has_more": has_more
+        }
+    
+    try:
+        screenings, next_cursor = await get_screenings_page_async(limit, cursor, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     return {
-        "total": len(screenings),
-        "screenings": screenings
+        "count": len(screenings),
+        "screenings": screenings,
+        "next_cursor": next_cursor
     }
 
 
+@app.get("/api/v1/screening/export")
+async def export_screenings(
+    export_format: str = Query("ndjson", alias="format"),
+    since: Optional[datetime] = None,
+    include_description: bool = False
+):
+    """
+    Stream the full screening history for reporting, oldest first
+    
+    - **format**: `ndjson` (one JSON object per line) or `csv`
+    - **since**: Only results screened at or after this ISO timestamp (incremental pulls)
+    - **include_description**: Also export the full job description text
+    """
+    if export_format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be ndjson or csv")
+    
+    # A plain generator: Starlette pulls it from a worker thread, so the
+    # blocking cursor reads stay off the event loop and memory stays flat
+    rows = iter_screenings(since, include_description)
+    
+    if export_format == "csv":
+        columns = Storage.EXPORT_COLUMNS + (["job_description"] if include_description else [])
+        return StreamingResponse(
+            csv_chunks(rows, columns),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=screening_history.csv"}
+        )
+    return StreamingResponse(ndjson_chunks(rows), media_type="application/x-ndjson")
+
+
 @app.get("/api/v1/screening/{screening_id}")
 async def get_screening_by_id(screening_id: int):
     """Get a specific screening result by ID"""
-    screenings = get_all_screenings()
-    screening = next((s for s in screenings if s['id'] == screening_id), None)
+    screening = await get_screening_async(screening_id)
     
     if not screening:
         raise HTTPException(status_code=404, detail="Screening result not found")
@@ -316,8 +1175,10 @@ async def get_screening_by_id(screening_id: int):
 
 
 if __name__ == "__main__":
+    # Single process for development; production runs `gunicorn -c gunicorn.conf.py main:app`,
+    # auto-reload is `uvicorn main:app --reload`
     import uvicorn
     print("🚀 Starting Resume Screening System API...")
-    print("📝 API Documentation: http://127.0.0.1:8000/docs")
-    print("🔗 API Root: http://127.0.0.1:8000")
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    print(f"📝 API Documentation: http://127.0.0.1:{SERVER_PORT}/docs")
+    print(f"🔗 API Root: http://127.0.0.1:{SERVER_PORT}")
+    uvicorn.run(app, host=SERVER_HOST, port=SERVER_PORT)
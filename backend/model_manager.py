@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from config import TORCH_THREADS
+from workers import configure_torch_threads
+
+
+logger = logging.getLogger(__name__)
+
+
+def load_encoder(backend: str, model_name: str, model_dir: Optional[str] = None,
+                 onnx_model_dir: Optional[str] = None, offline: bool = False,
+                 threads: Optional[int] = TORCH_THREADS):
+    """
+    The embedding model for a backend: 'torch' (a SentenceTransformer) or
+    'onnx' (an OnnxSentenceEncoder over the int8 export). Both expose the same
+    encode() used by the API and the evaluation scripts
+    """
+    if backend == 'onnx':
+        from onnx_encoder import OnnxSentenceEncoder
+
+        return OnnxSentenceEncoder(onnx_model_dir, intra_op_threads=threads)
+    if backend != 'torch':
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    if offline:
+        # Never reach out to the Hugging Face hub; the model must be on disk
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+    from sentence_transformers import SentenceTransformer
+
+    configure_torch_threads(threads)
+    return SentenceTransformer(model_dir or model_name)
+
+
+class ModelManager:
+    """
+    Owns the embedding model's lifecycle.
+
+    Nothing heavy happens at import: torch and sentence-transformers (or
+    onnxruntime for the onnx backend) are only imported when loading starts, normally from a background thread at app
+    startup so the server binds its port straight away. A failed load is
+    retried with exponential backoff instead of leaving the API on keyword
+    matching for good. After loading, a warm-up encode of a full batch of
+    maximum-length texts allocates the buffers before the first real request.
+    """
+
+    def __init__(self, model_name: str, model_dir: Optional[str] = None, offline: bool = False,
+                 warmup_batch_size: int = 32, retry_initial: float = 5.0, retry_max: float = 300.0,
+                 backend: str = 'torch', onnx_model_dir: Optional[str] = None,
+                 threads: Optional[int] = TORCH_THREADS):
+        self.model_name = model_name
+        self.model_dir = model_dir
+        self.backend = backend
+        self.onnx_model_dir = onnx_model_dir
+        self.offline = offline
+        # Intra-op threads of the model; a forking server sets them per worker
+        self.threads = threads
+        self.warmup_batch_size = warmup_batch_size
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+
+        self.state = "not_started"  # not_started -> loading -> ready, or failed (retrying)
+        self.attempts = 0
+        self.last_error = None
+        self.ready_at = None
+
+        self._model = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def model(self):
+        """The loaded model, or None while it is not ready"""
+        return self._model
+
+    def is_ready(self) -> bool:
+        return self._model is not None
+
+    def start(self):
+        """Load in a background thread, retrying until it succeeds (no-op if already started)"""
+        with self._lock:
+            if self._model is not None or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._load_with_retry, name="model-loader", daemon=True)
+            self._thread.start()
+
+    def load(self, warm_up: bool = True):
+        """
+        Load synchronously (scripts, or a parent process preloading before it
+        forks, which skips the warm-up and leaves it to each worker)
+        """
+        if self._model is None:
+            self.state = "loading"
+            self.attempts += 1
+            started = time.perf_counter()
+            try:
+                model = self._load_model()
+                if warm_up:
+                    self._warm_up(model)
+            except Exception as e:
+                self.state = "failed"
+                self.last_error = str(e)
+                raise
+            self._model = model
+            self.state = "ready"
+            self.last_error = None
+            self.ready_at = datetime.now()
+            logger.info("AI model loaded", extra={"backend": self.backend, "seconds": round(time.perf_counter() - started, 1)})
+        return self._model
+
+    def _load_with_retry(self):
+        delay = self.retry_initial
+        while self._model is None:
+            try:
+                self.load()
+            except Exception as e:
+                logger.warning("Could not load AI model, using simple matching meanwhile", extra={
+                    "attempt": self.attempts, "error": str(e), "retry_in_seconds": delay
+                })
+                time.sleep(delay)
+                delay = min(delay * 2, self.retry_max)
+
+    def _load_model(self):
+        logger.info("Loading AI model for semantic matching", extra={"backend": self.backend, "model": self.model_name})
+        return load_encoder(
+            self.backend, self.model_name, self.model_dir, self.onnx_model_dir, self.offline, self.threads
+        )
+
+    def warm_up(self):
+        """Run the warm-up encode on the loaded model (no-op while it is not loaded)"""
+        if self._model is not None:
+            started = time.perf_counter()
+            self._warm_up(self._model)
+            logger.info("AI model warmed up", extra={"seconds": round(time.perf_counter() - started, 1)})
+
+    def _warm_up(self, model):
+        # One full-size batch at the maximum sequence length
+        text = "warm up " * 512
+        model.encode([text] * self.warmup_batch_size, batch_size=self.warmup_batch_size, convert_to_numpy=True)
+
+    def status(self) -> dict:
+        return {
+            "model_name": self.model_name,
+            "model_dir": self.onnx_model_dir if self.backend == 'onnx' else self.model_dir,
+            "backend": self.backend,
+            "state": self.state,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "ready_at": self.ready_at.isoformat() if self.ready_at else None
+        }
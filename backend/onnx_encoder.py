@@ -0,0 +1,91 @@
+import json
+import os
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+
+# Written by export_onnx.py next to the model and tokenizer
+ENCODER_CONFIG_FILE = 'encoder_config.json'
+
+
+class OnnxSentenceEncoder:
+    """
+    Sentence encoder running an exported (int8-quantized) ONNX copy of the
+    sentence-transformers model on onnxruntime's CPU provider.
+
+    Implements the part of SentenceTransformer.encode the API and evaluation use,
+    with the same mean pooling and max sequence length, but without importing
+    torch, which keeps start-up fast and resident memory small.
+    """
+
+    def __init__(self, model_dir: str, intra_op_threads: Optional[int] = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, ENCODER_CONFIG_FILE), 'r') as f:
+            config = json.load(f)
+        self.model_name = config['model_name']
+        self.max_seq_length = config['max_seq_length']
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=config['pad_token_id'], pad_token=config['pad_token'])
+        # Second copy without truncation, to measure and split texts longer than the model's limit
+        self._offsets_tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, config['model_file']),
+            options,
+            providers=['CPUExecutionProvider']
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False,
+               **kwargs) -> np.ndarray:
+        """Embeddings as a numpy array: (dim,) for one string, (n, dim) for a list"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        # Longest first, like sentence-transformers, so each batch pads to similar lengths
+        order = np.argsort([-len(sentence) for sentence in sentences], kind='stable')
+        embeddings = None
+        for start in range(0, len(sentences), batch_size):
+            batch = order[start:start + batch_size]
+            pooled = self._encode_batch([sentences[i] for i in batch])
+            if embeddings is None:
+                embeddings = np.empty((len(sentences), pooled.shape[1]), dtype=np.float32)
+            embeddings[batch] = pooled
+
+        if embeddings is None:
+            return np.empty((0, 0), dtype=np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.clip(norms, 1e-12, None)
+        return embeddings[0] if single else embeddings
+
+    def token_offsets(self, text: str) -> List[Tuple[int, int]]:
+        """(start, end) character span of every word piece, untruncated and without special tokens"""
+        return self._offsets_tokenizer.encode(text, add_special_tokens=False).offsets
+
+    def _encode_batch(self, sentences: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(sentences)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+            'attention_mask': attention_mask
+        }
+        if 'token_type_ids' in self.input_names:
+            feeds['token_type_ids'] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real (non-padding) tokens
+        mask = attention_mask[:, :, None].astype(np.float32)
+        return (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
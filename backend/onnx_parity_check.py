@@ -0,0 +1,134 @@
+"""
+Parity check between the torch and the int8 ONNX embedding backends on the
+Kaggle evaluation set (data/AI_Resume_Screening.csv).
+
+Scores every row with both backends using the evaluation's scoring
+(evaluate_ai_accuracy) and reports the semantic score drift, flipped
+Hire/Reject decisions, accuracy/F1 for each backend, encode time and the
+resident memory added by loading each model.
+
+Usage: python onnx_parity_check.py [--output onnx_parity_results.json]
+"""
+import argparse
+import json
+import os
+import resource
+import time
+
+import numpy as np
+
+from config import MODEL_NAME, MODEL_DIR, MODEL_OFFLINE, ONNX_MODEL_DIR, EMBEDDING_BATCH_SIZE
+from model_manager import load_encoder
+from evaluate_ai_accuracy import (
+    load_candidates,
+    create_synthetic_resume,
+    create_job_description,
+    experience_bonuses,
+    education_bonuses,
+    confusion_matrix,
+    classification_metrics
+)
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process (Linux /proc, else the peak from getrusage)"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def semantic_scores(model, resumes, job_descriptions):
+    """Cosine similarity x 100 per (resume, JD) pair, plus the encode time"""
+    started = time.perf_counter()
+    resume_embeddings = model.encode(
+        resumes, batch_size=EMBEDDING_BATCH_SIZE, convert_to_numpy=True, normalize_embeddings=True
+    )
+    job_embeddings = model.encode(
+        job_descriptions, batch_size=EMBEDDING_BATCH_SIZE, convert_to_numpy=True, normalize_embeddings=True
+    )
+    elapsed = time.perf_counter() - started
+    return np.sum(resume_embeddings * job_embeddings, axis=1) * 100, elapsed
+
+
+def run(csv_file, output):
+    candidates, hr_decisions = load_candidates(csv_file)
+    resumes = [create_synthetic_resume(c) for c in candidates]
+    job_descriptions = [create_job_description(c['job_role'], c['skills']) for c in candidates]
+    bonuses = experience_bonuses([c['experience'] for c in candidates]) + \
+        education_bonuses([c['education'] for c in candidates])
+    hr_hire = np.array(hr_decisions) == 'Hire'
+
+    print(f"📊 Parity check on {len(candidates)} resumes\n")
+    report = {'rows': len(candidates), 'backends': {}}
+    semantic = {}
+
+    # ONNX first: its memory figure is then not inflated by an already-imported torch
+    for backend in ('onnx', 'torch'):
+        rss_before = current_rss_mb()
+        started = time.perf_counter()
+        model = load_encoder(backend, MODEL_NAME, MODEL_DIR, ONNX_MODEL_DIR, MODEL_OFFLINE)
+        load_seconds = time.perf_counter() - started
+        rss_loaded = current_rss_mb()
+
+        semantic[backend], encode_seconds = semantic_scores(model, resumes, job_descriptions)
+        final_scores = np.round(semantic[backend] * 0.60 + bonuses, 2)
+        ai_hire = final_scores >= 55
+
+        report['backends'][backend] = {
+            'load_seconds': round(load_seconds, 2),
+            'encode_seconds': round(encode_seconds, 2),
+            'ms_per_resume': round(encode_seconds / len(candidates) * 1000, 3),
+            'rss_added_by_model_mb': round(rss_loaded - rss_before, 1),
+            'rss_after_encode_mb': round(current_rss_mb(), 1),
+            'metrics': classification_metrics(confusion_matrix(ai_hire, hr_hire)),
+            'hire_decisions': ai_hire
+        }
+        print(f"✅ {backend}: {encode_seconds:.2f}s encode, +{rss_loaded - rss_before:.0f} MB RSS for the model")
+        del model
+
+    drift = np.abs(semantic['onnx'] - semantic['torch'])
+    flips = int(np.sum(report['backends']['onnx']['hire_decisions'] != report['backends']['torch']['hire_decisions']))
+    for backend in report['backends'].values():
+        del backend['hire_decisions']
+    report['semantic_score_drift'] = {
+        'mean_abs': round(float(drift.mean()), 4),
+        'p95_abs': round(float(np.percentile(drift, 95)), 4),
+        'max_abs': round(float(drift.max()), 4),
+        'final_score_max_abs': round(float(drift.max()) * 0.60, 4)
+    }
+    report['decision_flips'] = flips
+    report['metric_change'] = {
+        metric: round(report['backends']['onnx']['metrics'][metric] - report['backends']['torch']['metrics'][metric], 4)
+        for metric in ('accuracy', 'precision', 'recall', 'f1_score')
+    }
+
+    print("\n" + "=" * 70)
+    print(f"Semantic score drift: mean {report['semantic_score_drift']['mean_abs']:.3f}, "
+          f"p95 {report['semantic_score_drift']['p95_abs']:.3f}, max {report['semantic_score_drift']['max_abs']:.3f} points")
+    print(f"Decision flips:       {flips}/{len(candidates)}")
+    for backend, result in report['backends'].items():
+        m = result['metrics']
+        print(f"{backend:>6}: accuracy {m['accuracy']:.2f}% | F1 {m['f1_score']:.2f}% | "
+              f"{result['ms_per_resume']:.2f} ms/resume | +{result['rss_added_by_model_mb']:.0f} MB")
+    print(f"Change (onnx - torch): accuracy {report['metric_change']['accuracy']:+.2f} | "
+          f"F1 {report['metric_change']['f1_score']:+.2f}")
+    print("=" * 70)
+
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Report saved to: {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the torch and int8 ONNX embedding backends")
+    parser.add_argument('--csv', default='data/AI_Resume_Screening.csv', help="Evaluation dataset")
+    parser.add_argument('--output', default='onnx_parity_results.json', help="JSON report path")
+    args = parser.parse_args()
+    if not os.path.isdir(ONNX_MODEL_DIR):
+        raise SystemExit(f"❌ {ONNX_MODEL_DIR} not found, run export_onnx.py first")
+    run(args.csv, args.output)
@@ -0,0 +1,155 @@
+import io
+from typing import List, NamedTuple, Optional
+
+import PyPDF2
+
+from config import PDF_BACKEND, PDF_MAX_BYTES, PDF_MAX_PAGES, PDF_MAX_CHARS
+
+
+# Kept free of FastAPI and model imports: it runs inside the extraction
+# worker processes, which should start fast and stay small.
+
+
+# ==================== BACKENDS ====================
+# A backend opens PDF bytes and exposes page_count, page_text(index) and close().
+# pypdfium2 and pdfminer.six are optional and only imported when selected.
+
+
+class PyPDF2Document:
+    """Pure Python, always available"""
+
+    def __init__(self, file_content: bytes):
+        self._reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+        self.page_count = len(self._reader.pages)
+
+    def page_text(self, index: int) -> str:
+        # extract_text() returns None for some pages (e.g. image-only scans)
+        return self._reader.pages[index].extract_text() or ""
+
+    def close(self):
+        pass
+
+
+class PdfiumDocument:
+    """PDFium through pypdfium2: native code, much faster than the pure Python parsers"""
+
+    def __init__(self, file_content: bytes):
+        import pypdfium2
+
+        self._pdf = pypdfium2.PdfDocument(file_content)
+        self.page_count = len(self._pdf)
+
+    def page_text(self, index: int) -> str:
+        page = self._pdf[index]
+        text_page = page.get_textpage()
+        try:
+            return text_page.get_text_range() or ""
+        finally:
+            text_page.close()
+            page.close()
+
+    def close(self):
+        self._pdf.close()
+
+
+class PdfminerDocument:
+    """pdfminer.six: pure Python, slower than PyPDF2 but better at multi-column layouts"""
+
+    def __init__(self, file_content: bytes):
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+
+        document = PDFDocument(PDFParser(io.BytesIO(file_content)))
+        self._pages = list(PDFPage.create_pages(document))
+        self._resources = PDFResourceManager()
+        self._laparams = LAParams()
+        self.page_count = len(self._pages)
+
+    def page_text(self, index: int) -> str:
+        from pdfminer.converter import TextConverter
+        from pdfminer.pdfinterp import PDFPageInterpreter
+
+        output = io.StringIO()
+        device = TextConverter(self._resources, output, laparams=self._laparams)
+        try:
+            PDFPageInterpreter(self._resources, device).process_page(self._pages[index])
+        finally:
+            device.close()
+        return output.getvalue()
+
+    def close(self):
+        pass
+
+
+BACKENDS = {
+    'pypdf2': PyPDF2Document,
+    'pdfium': PdfiumDocument,
+    'pdfminer': PdfminerDocument,
+}
+
+
+# ==================== EXTRACTION ====================
+
+
+class PageTexts(NamedTuple):
+    pages: List[str]  # text of the extracted pages, in order
+    page_count: int   # pages in the whole document
+
+
+def open_pdf(file_content: bytes, backend: Optional[str] = None):
+    """Open PDF bytes with a backend (PDF_BACKEND by default), enforcing PDF_MAX_BYTES"""
+    backend = backend or PDF_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {backend}")
+    if PDF_MAX_BYTES and len(file_content) > PDF_MAX_BYTES:
+        raise ValueError(f"PDF too large ({len(file_content)} bytes, limit {PDF_MAX_BYTES})")
+    try:
+        return BACKENDS[backend](file_content)
+    except ImportError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error reading PDF: {str(e)}")
+
+
+def extract_pdf_pages(file_content: bytes, start: int = 0, stop: Optional[int] = None,
+                      backend: Optional[str] = None) -> PageTexts:
+    """
+    Text of pages [start, stop), capped at PDF_MAX_PAGES and stopping early once
+    PDF_MAX_CHARS characters are gathered. Used directly by workers for page
+    ranges of large documents; raises ValueError if the PDF cannot be read
+    """
+    document = open_pdf(file_content, backend)
+    try:
+        last = document.page_count
+        if PDF_MAX_PAGES:
+            last = min(last, PDF_MAX_PAGES)
+        if stop is not None:
+            last = min(last, stop)
+
+        pages = []
+        chars = 0
+        for index in range(start, last):
+            pages.append(document.page_text(index))
+            chars += len(pages[-1])
+            if PDF_MAX_CHARS and chars >= PDF_MAX_CHARS:
+                break
+        return PageTexts(pages, document.page_count)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error reading PDF: {str(e)}")
+    finally:
+        document.close()
+
+
+def join_pages(pages: List[str]) -> str:
+    """Page texts as one document, keeping words on either side of a page break apart"""
+    return "\n".join(pages)
+
+
+def extract_pdf_text(file_content: bytes, backend: Optional[str] = None) -> str:
+    """Extract text from PDF bytes; raises ValueError if the PDF cannot be read"""
+    return join_pages(extract_pdf_pages(file_content, backend=backend).pages)
@@ -0,0 +1,198 @@
+import csv
+import json
+import os
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+
+# Built-in taxonomy: canonical skill -> aliases that also count as that skill
+DEFAULT_SKILLS = {
+    'python': [],
+    'java': [],
+    'javascript': ['js'],
+    'react': ['react.js', 'reactjs'],
+    'sql': [],
+    'mysql': [],
+    'fastapi': [],
+    'docker': [],
+    'aws': ['amazon web services'],
+    'git': [],
+    'html': [],
+    'css': [],
+    'machine learning': [],
+    'ai': ['artificial intelligence'],
+    'data analysis': [],
+    'frontend': ['front-end', 'front end'],
+    'backend': ['back-end', 'back end'],
+    'full stack': ['full-stack', 'fullstack'],
+    'api': ['apis'],
+    'database': ['databases'],
+    'tensorflow': [],
+    'pytorch': [],
+    'nlp': ['natural language processing'],
+    'deep learning': [],
+    'cybersecurity': ['cyber security'],
+    'networking': [],
+    'linux': [],
+    'c++': ['cpp'],
+    'c#': ['csharp'],
+    'php': [],
+    'node': ['node.js', 'nodejs'],
+    'angular': ['angularjs'],
+    'vue': ['vue.js', 'vuejs'],
+}
+
+
+class SkillMatch(NamedTuple):
+    matched: List[str]
+    missing: List[str]
+    score: float
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and collapse whitespace (PDF text breaks multi-word skills across lines)"""
+    return " ".join(text.lower().split())
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class SkillMatcher:
+    """
+    Finds every taxonomy skill in a text in one pass.
+
+    All aliases are compiled once into an Aho-Corasick automaton, so a scan
+    costs one walk over the text no matter how many skills the taxonomy has.
+    A hit only counts on word boundaries: "ai" does not match inside
+    "maintain", nor "java" inside "javascript".
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        # Canonical skills in taxonomy order, so results are stable
+        self.skills = [_normalize(skill) for skill in taxonomy]
+        self._order = {skill: i for i, skill in enumerate(self.skills)}
+
+        # Trie: per state, its transitions, failure link and (length, skill) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[tuple]] = [[]]
+
+        for skill, aliases in taxonomy.items():
+            canonical = _normalize(skill)
+            for alias in {canonical, *(_normalize(a) for a in aliases)}:
+                if alias:
+                    self._add(alias, canonical)
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _add(self, alias: str, canonical: str):
+        state = 0
+        for char in alias:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._outputs[state].append((len(alias), canonical))
+
+    def _build_failure_links(self):
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, child in self._goto[state].items():
+                pending.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def find(self, text: str) -> Set[str]:
+        """Canonical skills mentioned in text"""
+        text = _normalize(text)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = set()
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, canonical in outputs[state]:
+                start = end - length
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+                    continue
+                found.add(canonical)
+        return found
+
+    def match(self, resume_text: str, job_description: Optional[str] = None,
+              jd_skills: Optional[Set[str]] = None, resume_skills: Optional[Set[str]] = None) -> SkillMatch:
+        """
+        Matched and missing JD skills plus the keyword score (0-100, 50 when the
+        JD names no known skill). Pass jd_skills from find() to reuse one JD scan
+        across a batch of resumes, and resume_skills to reuse one resume scan
+        across several job descriptions
+        """
+        if jd_skills is None:
+            jd_skills = self.find(job_description or "")
+        ordered = sorted(jd_skills, key=self._order.__getitem__)
+        if resume_skills is None:
+            resume_skills = self.find(resume_text)
+        matched = [skill for skill in ordered if skill in resume_skills]
+        missing = [skill for skill in ordered if skill not in resume_skills]
+        if not ordered:
+            return SkillMatch(matched, missing, 50.0)
+        return SkillMatch(matched, missing, round(len(matched) / len(ordered) * 100, 2))
+
+
+# ==================== TAXONOMY LOADING ====================
+
+
+def load_taxonomy_file(path: str) -> Dict[str, List[str]]:
+    """
+    Skill taxonomy from a JSON file: either {"skill": ["alias", ...], ...}
+    or a plain list of skills
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return {skill: [] for skill in data}
+    return {skill: list(aliases or []) for skill, aliases in data.items()}
+
+
+def load_taxonomy_csv(path: str, column: str = 'Skills') -> Dict[str, List[str]]:
+    """Every distinct comma-separated entry of a CSV column (the Kaggle dataset's Skills)"""
+    taxonomy = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            for skill in (row.get(column) or '').split(','):
+                skill = _normalize(skill)
+                if skill and skill not in taxonomy:
+                    taxonomy[skill] = []
+    return taxonomy
+
+
+def build_skill_matcher(skills_file: Optional[str] = None, skills_csv: Optional[str] = None) -> SkillMatcher:
+    """
+    Built-in taxonomy, extended with the skills of a CSV column and/or a JSON
+    taxonomy file when given and present
+    """
+    taxonomy = {skill: list(aliases) for skill, aliases in DEFAULT_SKILLS.items()}
+    sources = []
+    if skills_csv and os.path.exists(skills_csv):
+        sources.append(load_taxonomy_csv(skills_csv))
+    if skills_file:
+        sources.append(load_taxonomy_file(skills_file))
+    for source in sources:
+        for skill, aliases in source.items():
+            skill = _normalize(skill)
+            taxonomy.setdefault(skill, [])
+            taxonomy[skill].extend(a for a in aliases if a not in taxonomy[skill])
+    return SkillMatcher(taxonomy)
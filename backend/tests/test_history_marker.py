@@ -0,0 +1,51 @@
+"""
+Change marker behind the screening history ETag.
+
+Usage: cd backend && python -m unittest discover tests
+"""
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SQLiteStorage  # noqa: E402
+
+
+class SQLiteHistoryMarkerTests(unittest.TestCase):
+    def setUp(self):
+        self.storage = SQLiteStorage(1, ':memory:')
+        self.storage.ensure_job_title_index()
+        self.storage.upsert_job_descriptions([("Python developer", "Builds APIs", "python, sql")])
+
+    def save_result(self):
+        self.storage.save_screening_results([{
+            "job_id": 1, "candidate_name": "Ada", "file_name": "ada.pdf", "match_score": 80.0,
+            "matched_skills": "python", "missing_skills": "", "recommendation": "PASS"
+        }])
+
+    def test_unchanged_history_keeps_its_marker(self):
+        self.assertEqual(self.storage.get_history_marker(), self.storage.get_history_marker())
+
+    def test_new_result_changes_the_marker(self):
+        before = self.storage.get_history_marker()
+        self.save_result()
+        self.assertNotEqual(self.storage.get_history_marker(), before)
+
+    def test_updated_job_description_changes_the_marker(self):
+        self.save_result()
+        before = self.storage.get_history_marker()
+        # updated_at has millisecond resolution on SQLite
+        time.sleep(0.002)
+        self.storage.upsert_job_descriptions([("Python developer", "Builds and runs APIs", "python, sql")])
+        self.assertNotEqual(self.storage.get_history_marker(), before)
+
+    def test_new_job_description_changes_the_marker(self):
+        before = self.storage.get_history_marker()
+        self.storage.upsert_job_descriptions([("Data analyst", "Reports", "sql")])
+        self.assertNotEqual(self.storage.get_history_marker(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Status transitions and leases of background screening jobs.
+
+Runs against SQLite; set TEST_MYSQL=1 (plus the MYSQL_* settings) to also run
+against a MySQL server, whose single-table UPDATE applies its assignments left
+to right. Usage: cd backend && python -m unittest discover tests
+"""
+import os
+import re
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Storage, SQLiteStorage  # noqa: E402
+
+
+class ScreeningJobStatusTests:
+    """Shared cases; subclasses provide make_storage()"""
+
+    def setUp(self):
+        self.storage = self.make_storage()
+
+    def make_job(self, total_files: int):
+        job_id = self.storage.create_screening_job("Python developer", total_files)
+        file_ids = self.storage.add_screening_job_files(
+            job_id, [(i, f"resume_{i}.pdf", f"/spool/{job_id}/{i}") for i in range(total_files)]
+        )
+        return job_id, file_ids
+
+    def test_job_runs_until_its_last_chunk(self):
+        job_id, file_ids = self.make_job(4)
+        self.storage.record_screening_job_results(job_id, [(file_id, 'done', '{}') for file_id in file_ids[:2]])
+        job = self.storage.get_screening_job(job_id)
+        self.assertEqual(job["status"], 'running')
+        self.assertEqual(job["processed_files"], 2)
+
+        self.storage.record_screening_job_results(
+            job_id, [(file_ids[2], 'done', '{}'), (file_ids[3], 'error', '{}')]
+        )
+        job = self.storage.get_screening_job(job_id)
+        self.assertEqual(job["status"], 'completed')
+        self.assertEqual((job["processed_files"], job["failed_files"]), (4, 1))
+
+    def test_file_ids_follow_insert_order(self):
+        job_id, file_ids = self.make_job(5)
+        rows = self.storage.get_screening_job_files(job_id)
+        self.assertEqual([(row["id"], row["position"]) for row in rows], list(zip(file_ids, range(5))))
+
+    def test_single_file_chunks(self):
+        job_id, file_ids = self.make_job(3)
+        statuses = []
+        for file_id in file_ids:
+            self.storage.record_screening_job_results(job_id, [(file_id, 'done', '{}')])
+            statuses.append(self.storage.get_screening_job(job_id)["status"])
+        self.assertEqual(statuses, ['running', 'running', 'completed'])
+
+
+class ScreeningJobLeaseTests:
+    """Several server processes sharing one database; subclasses provide make_storage()"""
+
+    NOW = datetime(2026, 1, 1, 12, 0, 0)
+    LEASE = timedelta(minutes=5)
+
+    def setUp(self):
+        self.storage = self.make_storage()
+
+    def submit(self, owner: str, files: int = 2, now: datetime = NOW):
+        job_id = self.storage.create_screening_job("Python developer", files, owner, now + self.LEASE)
+        self.storage.add_screening_job_files(
+            job_id, [(i, f"resume_{i}.pdf", f"/spool/{job_id}/{i}") for i in range(files)], owner, now + self.LEASE
+        )
+        return job_id
+
+    def claim(self, owner: str, now: datetime):
+        return [row["id"] for row in self.storage.claim_unfinished_job_files(owner, now, now + self.LEASE)]
+
+    def test_live_owner_keeps_its_files_and_submissions(self):
+        self.submit("worker-a")
+        submitting = self.storage.create_screening_job("Data analyst", 3, "worker-a", self.NOW + self.LEASE)
+
+        self.assertEqual(self.claim("worker-b", self.NOW + timedelta(minutes=1)), [])
+        self.assertEqual(self.storage.get_screening_job(submitting)["status"], 'submitting')
+
+    def test_renewed_lease_is_not_taken_over(self):
+        self.submit("worker-a")
+        self.storage.renew_job_leases("worker-a", self.NOW + timedelta(minutes=4) + self.LEASE)
+        self.assertEqual(self.claim("worker-b", self.NOW + timedelta(minutes=6)), [])
+
+    def test_expired_work_is_taken_over_once(self):
+        job_id = self.submit("worker-a")
+        submitting = self.storage.create_screening_job("Data analyst", 3, "worker-a", self.NOW + self.LEASE)
+        later = self.NOW + timedelta(minutes=6)
+
+        taken = self.claim("worker-b", later)
+        self.assertEqual(len(taken), 2)
+        self.assertEqual(self.storage.get_screening_job(submitting)["status"], 'failed')
+        # worker-b now holds the lease: a third process gets nothing
+        self.assertEqual(self.claim("worker-c", later), [])
+        # and worker-b claiming again returns the same files, no extra rows
+        self.assertEqual(self.claim("worker-b", later), taken)
+        self.assertEqual(self.storage.get_screening_job(job_id)["status"], 'queued')
+
+    def test_finished_files_are_not_claimed(self):
+        job_id = self.submit("worker-a")
+        file_ids = [row["id"] for row in self.storage.get_screening_job_files(job_id)]
+        self.storage.record_screening_job_results(job_id, [(file_ids[0], 'done', '{}')])
+        self.assertEqual(self.claim("worker-b", self.NOW + timedelta(minutes=6)), file_ids[1:])
+
+
+class SQLiteScreeningJobStatusTests(ScreeningJobStatusTests, unittest.TestCase):
+    def make_storage(self):
+        return SQLiteStorage(1, ':memory:')
+
+
+class SQLiteScreeningJobLeaseTests(ScreeningJobLeaseTests, unittest.TestCase):
+    def make_storage(self):
+        return SQLiteStorage(1, ':memory:')
+
+
+def make_mysql_storage():
+    from config import MYSQL_HOST, MYSQL_DATABASE, MYSQL_USER, MYSQL_PASSWORD
+    from database import MySQLStorage
+
+    return MySQLStorage(1, host=MYSQL_HOST, database=MYSQL_DATABASE, user=MYSQL_USER, password=MYSQL_PASSWORD)
+
+
+@unittest.skipUnless(os.getenv('TEST_MYSQL') == '1', "set TEST_MYSQL=1 to run against MySQL")
+class MySQLScreeningJobStatusTests(ScreeningJobStatusTests, unittest.TestCase):
+    def make_storage(self):
+        return make_mysql_storage()
+
+
+class RecordJobProgressQueryTests(unittest.TestCase):
+    def test_status_is_assigned_before_the_counters(self):
+        # Under MySQL's left-to-right SET, a status computed after processed_files
+        # would see the incremented count and complete the job one chunk early
+        assignments = re.findall(r"(\w+)\s*=", Storage.RECORD_JOB_PROGRESS.split("WHERE")[0])
+        self.assertLess(assignments.index('status'), assignments.index('processed_files'))
+        self.assertLess(assignments.index('status'), assignments.index('failed_files'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Memory of a server process tree: the master and its workers (Linux only).
+
+RSS counts shared pages in every process that maps them, so summing the RSS
+of forked workers overstates their footprint. PSS splits each shared page
+between the processes sharing it, so the PSS total is what the tree really
+costs; Private is what each worker adds on its own.
+
+Usage: python worker_memory.py <master pid>
+  e.g. python worker_memory.py $(pgrep -of "gunicorn -c gunicorn.conf.py")
+"""
+import argparse
+import os
+import sys
+from typing import Dict, List
+
+
+FIELDS = {'Rss': 'rss', 'Pss': 'pss', 'Shared_Clean': 'shared', 'Shared_Dirty': 'shared',
+          'Private_Clean': 'private', 'Private_Dirty': 'private'}
+
+
+def read_memory(pid: int) -> Dict[str, int]:
+    """RSS, PSS, shared and private memory of a process in kB, from /proc/<pid>/smaps_rollup"""
+    memory = dict.fromkeys(FIELDS.values(), 0)
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if name in FIELDS:
+                memory[FIELDS[name]] += int(value.split()[0])
+    return memory
+
+
+def children(pid: int) -> List[int]:
+    """Direct children of a process (server workers, but also their extraction processes)"""
+    found = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # pid (comm) state ppid ...; comm may contain spaces
+                ppid = int(f.read().rpartition(')')[2].split()[1])
+        except OSError:
+            continue
+        if ppid == pid:
+            found.append(int(entry))
+    return sorted(found)
+
+
+def process_tree(pid: int) -> List[int]:
+    tree = [pid]
+    for child in children(pid):
+        tree += process_tree(child)
+    return tree
+
+
+def report(pid: int):
+    print(f"{'pid':>8} {'ppid':>8} {'RSS MB':>10} {'PSS MB':>10} {'shared MB':>10} {'private MB':>11}  command")
+    totals = dict.fromkeys(FIELDS.values(), 0)
+    for process in process_tree(pid):
+        try:
+            memory = read_memory(process)
+            with open(f"/proc/{process}/cmdline", 'rb') as f:
+                command = f.read().replace(b'\0', b' ').decode(errors='replace').strip()
+            with open(f"/proc/{process}/stat") as f:
+                ppid = int(f.read().rpartition(')')[2].split()[1])
+        except OSError:
+            continue
+        for key in totals:
+            totals[key] += memory[key]
+        print(f"{process:>8} {ppid:>8} {memory['rss'] / 1024:>10.1f} {memory['pss'] / 1024:>10.1f} "
+              f"{memory['shared'] / 1024:>10.1f} {memory['private'] / 1024:>11.1f}  {command[:60]}")
+    print(f"{'total':>17} {totals['rss'] / 1024:>10.1f} {totals['pss'] / 1024:>10.1f} "
+          f"{totals['shared'] / 1024:>10.1f} {totals['private'] / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RSS/PSS of a server master and its workers")
+    parser.add_argument('pid', type=int, help="Master process id")
+    args = parser.parse_args()
+    if not os.path.exists(f"/proc/{args.pid}/smaps_rollup"):
+        sys.exit(f"❌ No /proc/{args.pid}/smaps_rollup (Linux 4.14+ only, or no such process)")
+    report(args.pid)
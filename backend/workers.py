@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from config import (
+    EXTRACTION_WORKERS,
+    INFERENCE_WORKERS,
+    TORCH_THREADS,
+    PDF_MAX_PAGES,
+    PDF_MAX_CHARS,
+    PDF_PAGES_PER_TASK
+)
+from pdf_extract import extract_pdf_pages, join_pages
+
+
+logger = logging.getLogger(__name__)
+
+
+# CPU-bound work is kept off the event loop:
+# - PDF extraction runs in a process pool, so several files (and the page ranges of
+#   long files) parse in parallel across cores
+# - model inference runs in a dedicated thread pool (torch releases the GIL); with
+#   INFERENCE_BATCHING its threads mostly wait while batching.py merges their encodes
+# Both pools are created on first use, inside the serving process.
+
+
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+_inference_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    global _extraction_pool
+    if _extraction_pool is None:
+        # spawn: workers start clean instead of inheriting a forked copy of the
+        # model and the torch thread pool
+        _extraction_pool = ProcessPoolExecutor(
+            max_workers=EXTRACTION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _extraction_pool
+
+
+def get_inference_executor() -> ThreadPoolExecutor:
+    global _inference_executor
+    if _inference_executor is None:
+        _inference_executor = ThreadPoolExecutor(
+            max_workers=INFERENCE_WORKERS,
+            thread_name_prefix="inference"
+        )
+    return _inference_executor
+
+
+async def run_extraction(file_content: bytes) -> str:
+    """
+    Extract text from one PDF in the process pool.
+
+    The first PDF_PAGES_PER_TASK pages come from a single task, which is all a
+    typical resume needs. Longer documents are split into page ranges extracted
+    in parallel, in waves sized from the text gathered so far, so reading stops
+    soon after PDF_MAX_CHARS is reached
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_extraction_pool()
+    per_task = PDF_PAGES_PER_TASK or None
+
+    first = await loop.run_in_executor(pool, extract_pdf_pages, file_content, 0, per_task)
+    pages = list(first.pages)
+    chars = sum(len(page) for page in pages)
+    last = min(first.page_count, PDF_MAX_PAGES) if PDF_MAX_PAGES else first.page_count
+    next_page = len(pages)
+
+    while per_task and next_page < last and not (PDF_MAX_CHARS and chars >= PDF_MAX_CHARS):
+        if PDF_MAX_CHARS and chars:
+            # Pages still needed at the average text density seen so far
+            needed = math.ceil((PDF_MAX_CHARS - chars) / (chars / next_page))
+        else:
+            needed = last - next_page
+        wave_end = min(last, next_page + max(needed, per_task))
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(pool, extract_pdf_pages, file_content, start, min(start + per_task, wave_end))
+            for start in range(next_page, wave_end, per_task)
+        ))
+        for part in parts:
+            if PDF_MAX_CHARS and chars >= PDF_MAX_CHARS:
+                break
+            pages.extend(part.pages)
+            chars += sum(len(page) for page in part.pages)
+        next_page = wave_end
+
+    return join_pages(pages)
+
+
+async def run_inference(function, *args):
+    """Run a model call on the inference executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_inference_executor(), function, *args)
+
+
+def configure_torch_threads(threads: Optional[int] = TORCH_THREADS):
+    """Apply TORCH_THREADS (or threads) so inference does not oversubscribe the cores used by extraction"""
+    if threads:
+        import torch
+
+        torch.set_num_threads(threads)
+        logger.info("Torch intra-op threads set", extra={"threads": threads})
+
+
+def shutdown():
+    """Stop both pools (called on application shutdown)"""
+    global _extraction_pool, _inference_executor
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown(wait=False, cancel_futures=True)
+        _extraction_pool = None
+    if _inference_executor is not None:
+        _inference_executor.shutdown(wait=False, cancel_futures=True)
+        _inference_executor = None
@@ -1,5 +1,4 @@
 import React, { useState } from 'react';
-import axios from 'axios';
 import './UploadForm.css';
 
 function UploadForm({ onResultReceived }) {
@@ -79,18 +78,55 @@ function UploadForm({ onResultReceived }) {
       
       formData.append('job_description', jobDescription);
 
-      const response = await axios.post(
-        'http://127.0.0.1:8000/api/v1/screening/upload',
-        formData,
+      // Streaming endpoint: one NDJSON line per resume as soon as it is scored,
+      // then a {"summary": ...} line, so results show up while the rest are processed
+      const response = await fetch(
+        'http://127.0.0.1:8000/api/v1/screening/upload/stream?format=ndjson',
         {
-          headers: {
-            'Content-Type': 'multipart/form-data',
-          },
+          method: 'POST',
+          body: formData,
         }
       );
 
-      console.log('Response:', response.data);
-      onResultReceived(response.data);
+      if (!response.ok) {
+        const body = await response.json().catch(() => ({}));
+        throw new Error(body.detail || 'Error uploading resumes');
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      const results = [];
+      let buffer = '';
+
+      const handleLine = (line) => {
+        if (!line.trim()) {
+          return;
+        }
+        const record = JSON.parse(line);
+        if (record.summary) {
+          console.log('Response:', record.summary);
+          onResultReceived({ ...record.summary, results: [...results] });
+        } else {
+          results.push(record);
+          onResultReceived({
+            total_processed: results.length,
+            results: [...results],
+            message: `Processed ${results.length} of ${files.length} resume(s)...`,
+          });
+        }
+      };
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) {
+          break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.forEach(handleLine);
+      }
+      handleLine(buffer);
       
       // Clear form
       setFiles([]);
@@ -98,7 +134,7 @@ function UploadForm({ onResultReceived }) {
       
     } catch (err) {
       console.error('Error:', err);
-      setError(err.response?.data?.detail || 'Error uploading resumes');
+      setError(err.message || 'Error uploading resumes');
     } finally {
       setLoading(false);
     }